@@ -5,24 +5,32 @@
 # Perbaikan Utama: Arsitektur Modular, UI/UX Canggih, Topic Modeling, Relationship Extraction, Event Markers
 # =================================================================
 
+import os
+import uuid
 import streamlit as st
 import pandas as pd
 import sentencepiece # Penting untuk model Hugging Face
 from datetime import datetime
 
 # Import komponen dari folder models
-from models.loader import load_sentiment_model, load_summarizer_model, load_ner_model, load_topic_model
+from models.loader import lazy_model, warm_up_models, model_status, get_model_fingerprint, create_topic_model
 
 # Import utilitas dari folder utils
-from utils.news_fetcher import fetch_news
-from utils.text_processor import clean_text_for_analysis
-from utils.analysis_engine import analyze_news_data
+from utils.analysis_engine import new_analysis_state
+from utils.pipeline import run_report_pipeline, PIPELINE_STAGES
+from utils.job_runner import get_job_runner, JOB_CANCELLED
+from utils.summaries import summarize_articles
+from utils.profiling import RunProfiler
 
 # Import komponen dashboard dari folder dashboard_sections
 from dashboard_sections.header import render_header
-from dashboard_sections.search_input import render_search_input
+from dashboard_sections.search_input import render_search_input, set_search_inputs
 from dashboard_sections.aggregate_dashboard import render_aggregate_dashboard
 from dashboard_sections.article_details import render_article_details
+from dashboard_sections.model_status import render_model_status
+from dashboard_sections.job_progress import render_job_progress
+from dashboard_sections.stored_reports import render_stored_reports
+from dashboard_sections.performance import render_profile_switch, render_performance_panel
 
 # --- Konfigurasi Aplikasi Streamlit ---
 st.set_page_config(
@@ -36,77 +44,177 @@ st.set_page_config(
 with open("assets/custom.css") as f:
     st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
 
-# --- LOADING MODEL AI (Dilakukan sekali saat aplikasi pertama kali diakses) ---
-with st.spinner("Menginisialisasi Sistem Intelijen AI Tingkat Lanjut (Ini mungkin butuh waktu pertama kali)..."):
-    sentiment_analyzer = load_sentiment_model()
-    summarizer = load_summarizer_model()
-    ner_analyzer = load_ner_model()
-    topic_model = load_topic_model()
-st.success("Sistem Intelijen AI v6.0 siap beroperasi! Mari berburu insight.")
-st.markdown("---")
+# --- LOADING MODEL AI (Lazy: setiap model dimuat saat pertama kali dibutuhkan) ---
+# Sentimen & NER dipanaskan di background agar siap saat laporan pertama dibuat;
+# Peringkas dan embedding model BERTopic baru dimuat ketika benar-benar dipakai
+# (peringkas oleh job ringkasan batch setelah laporan selesai);
+# instance BERTopic dibuat baru per laporan (create_topic_model) agar aman untuk banyak sesi.
+if os.getenv("NEWS_INTEL_WARMUP", "1") != "0":
+    warm_up_models(["sentiment", "ner"], background=True)
+sentiment_analyzer = lazy_model("sentiment")
+summarizer = lazy_model("summarizer")
+ner_analyzer = lazy_model("ner")
+render_model_status(model_status())
 
 # --- STATE MANAGEMENT (Penting untuk mempertahankan data antar interaksi) ---
 if 'news_items' not in st.session_state:
     st.session_state.news_items = []
 if 'processed_data' not in st.session_state:
     st.session_state.processed_data = None
+if 'analysis_state' not in st.session_state:
+    # State analisis inkremental: artikel yang sudah dianalisis (per URL) tidak diinferensi ulang
+    st.session_state.analysis_state = new_analysis_state()
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+if 'active_job_id' not in st.session_state:
+    st.session_state.active_job_id = None
+if 'summary_job_id' not in st.session_state:
+    st.session_state.summary_job_id = None
+if 'job_message' not in st.session_state:
+    st.session_state.job_message = None
 if 'last_query' not in st.session_state:
     st.session_state.last_query = ""
 if 'last_period' not in st.session_state:
     st.session_state.last_period = ""
 if 'last_num_articles' not in st.session_state:
     st.session_state.last_num_articles = 0
+if 'last_source' not in st.session_state:
+    st.session_state.last_source = ""
 
 # --- RENDER HEADER APLIKASI ---
 render_header()
 
+# --- LAPORAN TERSIMPAN (hasil worker headless, dibuka tanpa menjalankan model) ---
+stored_report = render_stored_reports()
+if stored_report:
+    set_search_inputs(stored_report['topic_query'], stored_report['period'], len(stored_report['news_items']))
+profile_mode = render_profile_switch()
+
 # --- RENDER BAGIAN PENCARIAN ---
-query, period_code, num_articles, generate_button_pressed = render_search_input()
+query, period_code, num_articles, generate_button_pressed, source = render_search_input()
 
 # --- LOGIKA GENERASI LAPORAN INTELIJEN ---
-if generate_button_pressed or (
+# Laporan dibuat oleh job runner di thread latar belakang; halaman hanya mem-polling progresnya.
+def _report_job(job, query, period_code, num_articles, analysis_state, source, profile):
+    return run_report_pipeline(
+        query, period_code, num_articles,
+        sentiment_analyzer, ner_analyzer, create_topic_model,
+        get_model_fingerprint(),
+        state=analysis_state,
+        progress=job.update_progress,
+        on_partial=job.set_partial,
+        source=source,
+        profile=profile,
+    )
+
+def _summary_job(job, news_items):
+    return summarize_articles(
+        news_items, summarizer,
+        progress=lambda done, total: job.update_progress('summary', done, total),
+    )
+
+if stored_report:
+    st.session_state.active_job_id = None # Hasil job yang masih berjalan tidak lagi ditampilkan
+    st.session_state.news_items = stored_report['news_items']
+    st.session_state.processed_data = stored_report['processed_data']
+    # Parameter pencarian disamakan agar laporan tidak langsung dibuat ulang
+    st.session_state.last_query = query
+    st.session_state.last_period = period_code
+    st.session_state.last_num_articles = num_articles
+    st.session_state.last_source = source
+    created = datetime.fromtimestamp(stored_report['created_at']).strftime('%d/%m/%Y %H:%M')
+    st.session_state.job_message = ("success", f"Laporan tersimpan '{stored_report['topic_query']}' dibuka (dianalisis {created}).")
+    # Ringkasan yang belum ada (mis. worker dijalankan tanpa ringkasan) dilengkapi di latar belakang
+    st.session_state.summary_job_id = get_job_runner().submit(
+        _summary_job, st.session_state.news_items,
+        name="Ringkasan artikel", group=st.session_state.session_id, kind="summary", supersede=True,
+    )
+elif generate_button_pressed or (
     query != st.session_state.last_query or
     period_code != st.session_state.last_period or
-    num_articles != st.session_state.last_num_articles
+    num_articles != st.session_state.last_num_articles or
+    source != st.session_state.last_source
 ):
     if query:
-        st.session_state.news_items = []
-        st.session_state.processed_data = None
-
-        with st.spinner(f"Melakukan Operasi Intelijen: Mengumpulkan {num_articles} berita terkait '{query}' dan menganalisis secara mendalam..."):
-            raw_news_items = fetch_news(query, period=period_code, max_results=num_articles)
-
-            if not raw_news_items:
-                st.error("Intelijen tidak menemukan berita relevan. Coba ganti kata kunci atau rentang waktu Anda.")
-                st.session_state.last_query = ""
-                st.stop()
-
-            # Bersihkan dan tambahkan clean_text ke setiap artikel
-            for article in raw_news_items:
-                article['clean_text'] = clean_text_for_analysis(article.get('title', ''), article.get('description', ''))
-
-            # Lakukan analisis mendalam
-            st.session_state.news_items = raw_news_items
-            st.session_state.processed_data = analyze_news_data(
-                st.session_state.news_items,
-                sentiment_analyzer,
-                ner_analyzer,
-                topic_model
-            )
-        st.success("Laporan Intelijen Selesai! Insight strategis siap disajikan.")
+        st.session_state.active_job_id = get_job_runner().submit(
+            _report_job, query, period_code, num_articles, st.session_state.analysis_state, source, profile_mode,
+            name=f"Laporan '{query}'",
+            group=st.session_state.session_id, # Job satu sesi dijalankan berurutan
+            kind="report", supersede=True, # Laporan lama yang belum mulai tidak perlu dijalankan lagi
+        )
 
         # Update last search parameters
         st.session_state.last_query = query
         st.session_state.last_period = period_code
         st.session_state.last_num_articles = num_articles
+        st.session_state.last_source = source
     else:
         st.warning("Masukkan Topik Intelijen untuk memulai operasi analisis.")
 
+@st.fragment(run_every="1s")
+def _poll_active_job():
+    """Mem-polling job aktif; saat selesai, hasil dipindah ke session state dan halaman dirender ulang."""
+    job = get_job_runner().get(st.session_state.active_job_id)
+    if job is None:
+        st.session_state.active_job_id = None
+        return
+    if job.finished:
+        st.session_state.active_job_id = None
+        if job.status == JOB_CANCELLED:
+            st.rerun()
+        if job.error:
+            st.session_state.job_message = ("error", f"Operasi intelijen gagal: {job.error}")
+        elif not job.result['news_items']:
+            st.session_state.news_items = []
+            st.session_state.processed_data = None
+            st.session_state.last_query = ""
+            st.session_state.job_message = ("error", "Intelijen tidak menemukan berita relevan. Coba ganti kata kunci atau rentang waktu Anda.")
+        else:
+            st.session_state.news_items = job.result['news_items']
+            st.session_state.processed_data = job.result['processed_data']
+            st.session_state.job_message = ("success", "Laporan Intelijen Selesai! Insight strategis siap disajikan.")
+            # Ringkasan dibuat batch di latar belakang, tidak lagi di dalam setiap expander
+            st.session_state.summary_job_id = get_job_runner().submit(
+                _summary_job, st.session_state.news_items,
+                name="Ringkasan artikel", group=st.session_state.session_id, kind="summary", supersede=True,
+            )
+        st.rerun()
+    render_job_progress(job.snapshot(), PIPELINE_STAGES)
+
+@st.fragment(run_every="2s")
+def _poll_summary_job():
+    """Menampilkan progres ringkasan; halaman dirender ulang sekali saat semua ringkasan siap."""
+    job = get_job_runner().get(st.session_state.summary_job_id)
+    if job is None or job.finished:
+        st.session_state.summary_job_id = None
+        if job is not None and job.error:
+            st.session_state.job_message = ("error", f"Ringkasan artikel gagal dibuat: {job.error}")
+        st.rerun()
+    info = job.snapshot()['stages'].get('summary')
+    if info and info['total']:
+        st.progress(info['done'] / info['total'], text=f"📜 Menyiapkan ringkasan artikel: {info['done']}/{info['total']}")
+    else:
+        st.caption("📜 Menyiapkan ringkasan artikel...")
+
+if st.session_state.active_job_id:
+    _poll_active_job()
+elif st.session_state.summary_job_id:
+    _poll_summary_job()
+
+if st.session_state.job_message:
+    level, message = st.session_state.job_message
+    st.session_state.job_message = None
+    (st.success if level == "success" else st.error)(message)
+
 # --- TAMPILKAN DASHBOARD DAN DETAIL ---
 if st.session_state.processed_data:
-    render_aggregate_dashboard(st.session_state.processed_data)
-    render_article_details(st.session_state.news_items, summarizer)
-elif not generate_button_pressed and not st.session_state.news_items:
+    # Waktu render per tab hanya ditampilkan di panel performa, tidak ditulis ke log metrik
+    with RunProfiler("render", sample_memory=False, log=False) as render_profiler:
+        render_aggregate_dashboard(st.session_state.processed_data, profiler=render_profiler)
+        with render_profiler.stage("article_details", items=len(st.session_state.news_items)):
+            render_article_details(st.session_state.news_items)
+    render_performance_panel(st.session_state.processed_data.get('metrics'), render_profiler.summary())
+elif not st.session_state.active_job_id and not st.session_state.news_items:
     st.info("Dashboard Intelijen Anda menunggu perintah. Masukkan topik di atas dan klik 'Hasilkan Laporan Intelijen & Analisis' untuk memulai misi.")
 
 
@@ -0,0 +1,73 @@
+# benchmarks/corpus.py
+"""
+Korpus berita sintetis berformat GNews (title, description, published date, url, publisher)
+dengan kosakata mirip berita berbahasa Indonesia. Deterministik untuk `seed` yang sama,
+sehingga hasil benchmark antar-commit dapat dibandingkan.
+"""
+import random
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+PERSONS = [
+    "Joko Widodo", "Prabowo Subianto", "Sri Mulyani", "Basuki Hadimuljono", "Erick Thohir",
+    "Anies Baswedan", "Ganjar Pranowo", "Gibran Rakabuming", "Retno Marsudi", "Bahlil Lahadalia",
+    "Budi Gunadi", "Nadiem Makarim", "Airlangga Hartarto", "Luhut Pandjaitan", "Puan Maharani",
+]
+ORGANIZATIONS = [
+    "Kementerian Keuangan", "Bank Indonesia", "Otorita IKN", "KPK", "DPR", "Pertamina",
+    "Badan Pengelola Keuangan Haji", "Kementerian PUPR", "OJK", "BPS", "PLN", "Polri",
+]
+PLACES = [
+    "Jakarta", "Samarinda", "Balikpapan", "Surabaya", "Bandung", "Medan", "Makassar",
+    "Kalimantan Timur", "Jawa Barat", "Nusantara", "Yogyakarta", "Denpasar",
+]
+PUBLISHERS = ["Kompas.com", "Detikcom", "CNN Indonesia", "Tempo.co", "Antara News", "CNBC Indonesia", "Liputan6.com"]
+VERBS = ["meresmikan", "mengkritik", "membahas", "menolak", "mendukung", "meninjau", "mengumumkan", "menyoroti"]
+OBJECTS = [
+    "proyek jalan tol", "anggaran pendidikan", "harga beras", "pembangunan ibu kota", "subsidi energi",
+    "dana haji", "banjir bandang", "suku bunga acuan", "program makan bergizi", "kebijakan impor",
+]
+TONES = [
+    "yang dinilai berhasil meningkatkan kesejahteraan warga", "di tengah kritik keras dari masyarakat",
+    "meski menghadapi kendala pasokan material", "dengan capaian yang melampaui target",
+    "setelah terjadi keterlambatan berbulan-bulan", "yang memicu kekhawatiran pelaku usaha",
+]
+FILLERS = [
+    "Menurut keterangan resmi, langkah tersebut akan dievaluasi secara berkala.",
+    "Sejumlah pengamat menilai kebijakan ini perlu diawasi agar tepat sasaran.",
+    "Warga setempat berharap pemerintah segera memberikan kepastian.",
+    "Data terbaru menunjukkan tren yang cukup stabil dalam tiga bulan terakhir.",
+    "Pihak terkait belum memberikan tanggapan hingga berita ini diturunkan.",
+]
+
+BASE_DATE = datetime(2025, 6, 1, tzinfo=timezone.utc)
+LONG_ARTICLE_RATE = 0.05 # sebagian artikel panjang agar jalur pemotongan jendela (utils/chunking.py) ikut teruji
+
+
+def _sentence(rng):
+    subject = rng.choice(PERSONS + ORGANIZATIONS)
+    other = rng.choice(PERSONS + ORGANIZATIONS)
+    return f"{subject} {rng.choice(VERBS)} {rng.choice(OBJECTS)} di {rng.choice(PLACES)} bersama {other} {rng.choice(TONES)}."
+
+
+def synthetic_news_items(n, seed=0, days=30):
+    """`n` artikel sintetis berformat hasil utils/news_fetcher.parse_feed."""
+    rng = random.Random(seed)
+    items = []
+    for i in range(n):
+        publisher = rng.choice(PUBLISHERS)
+        title = f"{rng.choice(PERSONS + ORGANIZATIONS)} {rng.choice(VERBS)} {rng.choice(OBJECTS)} di {rng.choice(PLACES)}"
+        n_sentences = rng.randint(30, 60) if rng.random() < LONG_ARTICLE_RATE else rng.randint(1, 4)
+        sentences = [_sentence(rng) if rng.random() < 0.7 else rng.choice(FILLERS) for _ in range(n_sentences)]
+        # Deskripsi GNews berupa HTML (tautan + nama media), dibersihkan oleh clean_text_for_analysis
+        description = f'<a href="https://news.google.com/articles/{seed}-{i}">{" ".join(sentences)}</a>&nbsp;&nbsp;<font color="#6f6f6f">{publisher}</font>'
+        published = BASE_DATE - timedelta(days=rng.randrange(days), seconds=rng.randrange(86400))
+        slug = publisher.lower().replace(" ", "").replace(".", "")
+        items.append({
+            'title': f"{title} - {publisher}",
+            'description': description,
+            'published date': format_datetime(published, usegmt=True),
+            'url': f"https://{slug}.example/berita/{seed}/{i}",
+            'publisher': {'href': f"https://{slug}.example", 'title': publisher},
+        })
+    return items
@@ -0,0 +1,218 @@
+# benchmarks/run.py
+"""
+Benchmark offline jalur analisis pada korpus sintetis (benchmarks/corpus.py) berskala
+10/100/1k/10k artikel, dengan model pengganti deterministik (benchmarks/stubs.py) atau
+model asli yang sudah ada di cache lokal Hugging Face (--real-models). Tidak ada akses jaringan:
+hub Hugging Face dipaksa offline dan database memakai file sementara.
+
+Kasus: clean (clean_text_for_analysis), analyze (analyze_news_data lengkap), visualize_ner,
+aggregate (build_processed_data tanpa topic modeling: frame, matriks, word cloud, graf), dan
+relations (cooccurrence_counts). Setiap kasus melaporkan waktu (median dari --repeat),
+throughput (artikel/detik), dan puncak alokasi Python (tracemalloc, satu eksekusi terpisah).
+
+Hasil dibandingkan dengan baseline tersimpan; waktu atau memori yang melewati toleransi
+dianggap regresi (exit code 1). Baseline berisi waktu mesin tempat ia direkam, jadi rekam
+ulang (--update-baseline) di mesin yang dipakai untuk membandingkan.
+
+Contoh:
+    python -m benchmarks.run
+    python -m benchmarks.run --scales 10 100 1000 --repeat 5
+    python -m benchmarks.run --update-baseline
+    python -m benchmarks.run --real-models --scales 10 100
+"""
+import os
+import sys
+import copy
+import json
+import time
+import argparse
+import platform
+import tempfile
+import statistics
+import tracemalloc
+
+DEFAULT_SCALES = (10, 100, 1000, 10000)
+CASES = ("clean", "analyze", "visualize_ner", "aggregate", "relations")
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+TIME_TOLERANCE = 0.25 # waktu boleh naik 25% dari baseline
+MEMORY_TOLERANCE = 0.20
+MIN_TIME_DELTA = 0.01 # selisih di bawah ini (detik / MB) dianggap derau pengukuran
+MIN_MEMORY_DELTA = 1.0
+
+
+def _isolate_environment(db_path=None):
+    # Harus dipanggil sebelum modul utils/* diimpor (path DB dibaca saat import)
+    os.environ["HF_HUB_OFFLINE"] = "1"
+    os.environ["TRANSFORMERS_OFFLINE"] = "1"
+    os.environ["NEWS_INTEL_DB_PATH"] = db_path or os.path.join(tempfile.mkdtemp(prefix="news_intel_bench_"), "bench.db")
+
+
+def _load_models(real_models):
+    """Mengembalikan (sentimen, NER, pembuat model topik). Embedding BERTopic ikut diganti bila stub."""
+    from models import loader
+    if real_models:
+        return loader.get_model("sentiment"), loader.get_model("ner"), loader.create_topic_model
+    from benchmarks.stubs import StubSentimentPipeline, StubNerPipeline, StubEmbeddingModel, StubTopicModel
+    # Registry model dipakai apa adanya; hanya builder embedding yang diarahkan ke stub
+    loader.MODEL_BUILDERS["embedding"] = StubEmbeddingModel
+    return StubSentimentPipeline(), StubNerPipeline(), StubTopicModel
+
+
+def _measure(fn, repeat, memory):
+    """Menjalankan `fn()` `repeat` kali (waktu) plus sekali di bawah tracemalloc (memori)."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    peak_mb = None
+    if memory:
+        tracemalloc.start()
+        fn()
+        peak_mb = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2)
+        tracemalloc.stop()
+    return {'seconds': round(statistics.median(timings), 5), 'min_seconds': round(min(timings), 5), 'peak_mb': peak_mb}
+
+
+def run_scale(n, models, repeat=3, memory=True, cases=CASES, seed=0):
+    """Menjalankan kasus benchmark untuk korpus `n` artikel. Mengembalikan dict kasus -> metrik."""
+    from benchmarks.corpus import synthetic_news_items
+    from utils.text_processor import clean_text_for_analysis, article_body, visualize_ner
+    from utils.analysis_engine import analyze_news_data, build_processed_data, new_analysis_state
+    from utils.article_frames import cooccurrence_counts
+
+    sentiment, ner, topic_model_factory = models
+    raw_items = synthetic_news_items(n, seed=seed)
+    cleaned = copy.deepcopy(raw_items)
+    for article in cleaned:
+        article['clean_text'] = clean_text_for_analysis(article.get('title', ''), article_body(article))
+
+    # Satu analisis penuh (di luar pengukuran) sebagai bahan kasus turunan & pemanasan cache embedding
+    state = new_analysis_state()
+    analyzed = copy.deepcopy(cleaned)
+    processed = analyze_news_data(analyzed, sentiment, ner, topic_model_factory, state=state)
+
+    def clean():
+        for article in raw_items:
+            clean_text_for_analysis(article.get('title', ''), article_body(article))
+
+    def analyze():
+        # Salinan dibuat di dalam fungsi agar tiap eksekusi menginferensi ulang dari state kosong
+        analyze_news_data(copy.deepcopy(cleaned), sentiment, ner, topic_model_factory, state=new_analysis_state())
+
+    def visualize():
+        for article in analyzed:
+            visualize_ner(article['clean_text'], article['entities'])
+
+    def aggregate():
+        build_processed_data(state, analyzed, include_topics=False)
+
+    def relations():
+        cooccurrence_counts(processed['mentions_df'])
+
+    functions = {'clean': clean, 'analyze': analyze, 'visualize_ner': visualize,
+                 'aggregate': aggregate, 'relations': relations}
+    results = {}
+    for case in cases:
+        metrics = _measure(functions[case], repeat, memory)
+        metrics['items_per_s'] = round(n / metrics['seconds'], 1) if metrics['seconds'] else None
+        results[case] = metrics
+    return results
+
+
+def machine_info():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def compare_with_baseline(results, baseline, time_tolerance=TIME_TOLERANCE, memory_tolerance=MEMORY_TOLERANCE):
+    """List regresi (str) dari `results` terhadap `baseline` (struktur sama: skala -> kasus -> metrik)."""
+    regressions = []
+    for scale, cases in results.items():
+        for case, metrics in cases.items():
+            reference = baseline.get(scale, {}).get(case)
+            if not reference:
+                continue
+            seconds, base_seconds = metrics['seconds'], reference['seconds']
+            if seconds > base_seconds * (1 + time_tolerance) and seconds - base_seconds > MIN_TIME_DELTA:
+                regressions.append(f"{case}@{scale}: waktu {seconds:.4f} dtk vs baseline {base_seconds:.4f} dtk "
+                                   f"(+{(seconds / base_seconds - 1) * 100:.0f}%)")
+            peak, base_peak = metrics.get('peak_mb'), reference.get('peak_mb')
+            if peak is not None and base_peak is not None and peak > base_peak * (1 + memory_tolerance) \
+                    and peak - base_peak > MIN_MEMORY_DELTA:
+                regressions.append(f"{case}@{scale}: memori {peak:.1f} MB vs baseline {base_peak:.1f} MB")
+    return regressions
+
+
+def _print_results(results, baseline):
+    print(f"{'skala':>6} {'kasus':<14} {'median (dtk)':>12} {'artikel/dtk':>12} {'puncak MB':>10} {'vs baseline':>12}")
+    for scale, cases in results.items():
+        for case, m in cases.items():
+            reference = baseline.get(scale, {}).get(case)
+            delta = f"{(m['seconds'] / reference['seconds'] - 1) * 100:+.0f}%" if reference and reference['seconds'] else "-"
+            peak = f"{m['peak_mb']:.1f}" if m['peak_mb'] is not None else "-"
+            print(f"{scale:>6} {case:<14} {m['seconds']:>12.4f} {m['items_per_s'] or 0:>12,.0f} {peak:>10} {delta:>12}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark offline pipeline analisis berita.")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES))
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=list(CASES))
+    parser.add_argument("--repeat", type=int, default=3, help="Jumlah pengulangan per kasus (diambil median).")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="Lewati pengukuran memori (tracemalloc).")
+    parser.add_argument("--real-models", action="store_true", help="Pakai model asli dari cache lokal (tanpa unduhan).")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="Simpan hasil sebagai baseline baru.")
+    parser.add_argument("--time-tolerance", type=float, default=TIME_TOLERANCE)
+    parser.add_argument("--memory-tolerance", type=float, default=MEMORY_TOLERANCE)
+    parser.add_argument("--output", help="Simpan hasil lengkap ke file JSON.")
+    args = parser.parse_args(argv)
+
+    _isolate_environment()
+    models = _load_models(args.real_models)
+    model_key = "real" if args.real_models else "stub"
+
+    stored = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            stored = json.load(f)
+    baseline = stored.get(model_key, {})
+    if baseline and stored.get('machine') != machine_info():
+        print("[PERINGATAN] Baseline direkam di mesin lain; perbandingan waktu kurang bermakna.")
+
+    results = {}
+    for n in args.scales:
+        results[str(n)] = run_scale(n, models, repeat=args.repeat, memory=not args.no_memory,
+                                    cases=args.cases, seed=args.seed)
+    _print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({'machine': machine_info(), model_key: results}, f, indent=2)
+
+    if args.update_baseline:
+        stored['machine'] = machine_info()
+        stored.setdefault(model_key, {}).update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(stored, f, indent=2)
+            f.write("\n")
+        print(f"Baseline diperbarui: {args.baseline}")
+        return 0
+
+    regressions = compare_with_baseline(results, baseline, args.time_tolerance, args.memory_tolerance)
+    for message in regressions:
+        print(f"[REGRESI] {message}")
+    if not baseline:
+        print("Belum ada baseline untuk dibandingkan (jalankan dengan --update-baseline).")
+    elif not regressions:
+        print("BENCHMARK OK: tidak ada regresi terhadap baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+# benchmarks/stubs.py
+"""
+Model pengganti deterministik untuk benchmark tanpa jaringan & tanpa unduhan model.
+
+API-nya meniru yang dipakai repo: pipeline transformers (sentimen & NER grouped entities),
+SentenceTransformer.encode, dan BERTopic (fit_transform / get_topic_info / get_topic).
+Biaya komputasinya kecil dan stabil, sehingga benchmark mengukur kode repo
+(pembersihan, agregasi, frame, graf), bukan model.
+"""
+import re
+import zlib
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.corpus import PERSONS, ORGANIZATIONS, PLACES, OBJECTS
+
+POSITIVE_WORDS = ("berhasil", "meningkatkan", "melampaui", "mendukung", "meresmikan", "stabil")
+NEGATIVE_WORDS = ("kritik", "menolak", "kendala", "keterlambatan", "kekhawatiran", "banjir", "mengkritik")
+EMBEDDING_DIM = 64
+
+
+def _stable_fraction(text):
+    # Skor "keyakinan" deterministik 0.5-1.0 (hash() Python berubah per proses)
+    return 0.5 + (zlib.crc32(text.encode("utf-8")) % 1000) / 2000
+
+
+class StubSentimentPipeline:
+    """Sentimen dari hitungan kata positif/negatif; dipanggil seperti pipeline transformers."""
+
+    def _classify(self, text):
+        lowered = text.lower()
+        balance = sum(lowered.count(w) for w in POSITIVE_WORDS) - sum(lowered.count(w) for w in NEGATIVE_WORDS)
+        label = "positif" if balance > 0 else "negatif" if balance < 0 else "netral"
+        return {'label': label, 'score': _stable_fraction(text)}
+
+    def __call__(self, texts, batch_size=None, **kwargs):
+        if isinstance(texts, str):
+            return [self._classify(texts)]
+        return [self._classify(text) for text in texts]
+
+
+class StubNerPipeline:
+    """NER berbasis gazetteer korpus sintetis, keluaran setara `grouped_entities=True`."""
+
+    def __init__(self):
+        groups = {**{p: "LOC" for p in PLACES}, **{o: "ORG" for o in ORGANIZATIONS}, **{p: "PER" for p in PERSONS}}
+        self._groups = groups
+        self._pattern = re.compile("|".join(re.escape(name) for name in sorted(groups, key=len, reverse=True)))
+
+    def _extract(self, text):
+        return [
+            {'entity_group': self._groups[m.group()], 'score': _stable_fraction(m.group()),
+             'word': m.group(), 'start': m.start(), 'end': m.end()}
+            for m in self._pattern.finditer(text)
+        ]
+
+    def __call__(self, texts, batch_size=None, **kwargs):
+        if isinstance(texts, str):
+            return self._extract(texts)
+        return [self._extract(text) for text in texts]
+
+
+class StubEmbeddingModel:
+    """Embedding bag-of-words ter-hash (dimensi EMBEDDING_DIM), setara SentenceTransformer.encode."""
+
+    def encode(self, documents, batch_size=32, convert_to_numpy=True, show_progress_bar=False, **kwargs):
+        vectors = np.zeros((len(documents), EMBEDDING_DIM), dtype=np.float32)
+        for row, doc in enumerate(documents):
+            for word in doc.lower().split():
+                vectors[row, zlib.crc32(word.encode("utf-8")) % EMBEDDING_DIM] += 1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1.0, norms)
+
+
+class StubTopicModel:
+    """Topik = frasa objek pertama yang muncul di dokumen (-1 bila tidak ada), ber-API BERTopic."""
+
+    def fit_transform(self, documents, embeddings=None):
+        self._topics = []
+        words_by_topic = {}
+        for doc in documents:
+            lowered = doc.lower()
+            topic = next((i for i, phrase in enumerate(OBJECTS) if phrase in lowered), -1)
+            self._topics.append(topic)
+            words_by_topic.setdefault(topic, Counter()).update(w for w in lowered.split() if len(w) > 3)
+        self._words = words_by_topic
+        return list(self._topics), None
+
+    def get_topic_info(self):
+        counts = Counter(self._topics)
+        topic_ids = sorted(counts)
+        return pd.DataFrame({
+            'Topic': topic_ids,
+            'Count': [counts[t] for t in topic_ids],
+            'Name': [f"{t}_{OBJECTS[t].replace(' ', '_')}" if t != -1 else "-1_lainnya" for t in topic_ids],
+        })
+
+    def get_topic(self, topic_id):
+        words = self._words.get(topic_id)
+        if not words:
+            return False
+        total = sum(words.values())
+        return [(word, count / total) for word, count in words.most_common(10)]
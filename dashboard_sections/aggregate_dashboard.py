@@ -9,17 +9,18 @@ Renders the aggregate news‑intelligence dashboard with multiple tabs:
 
 Updates:
 - Replace `st.agraph` → `agraph` (from streamlit_agraph).
-- Add explicit `import pandas as pd` (used for relation table).
+- Relation table is precomputed as `relation_df` (utils/article_frames.py).
+- Optional `profiler` (utils/profiling.py) times each tab.
 """
 
 import streamlit as st
 import plotly.express as px
 import matplotlib.pyplot as plt
-import pandas as pd  # NEW: required for relation_df
 from streamlit_agraph import agraph, Node, Edge, Config  # graph visualisation
+from utils.profiling import NULL_PROFILER
 
 
-def render_aggregate_dashboard(processed_data):
+def render_aggregate_dashboard(processed_data, profiler=NULL_PROFILER):
     """Render the aggregate dashboard section."""
     st.markdown(
         "<h2 style='text-align: center; color: #4CAF50;'>\U0001F4CA Dashboard Intelijen Agregat</h2>",
@@ -27,6 +28,17 @@ def render_aggregate_dashboard(processed_data):
     )
     st.markdown("---")
 
+    # Peringatan dari pipeline analisis (mis. topic modeling gagal)
+    for warning_message in processed_data.get("warnings", []):
+        st.warning(warning_message)
+
+    # Salinan sindikasi dihitung sekali agar tidak mendominasi matriks entitas & tren
+    if processed_data.get("duplicates_collapsed"):
+        st.caption(
+            f"\U0001F4D1 {processed_data['duplicates_collapsed']} artikel salinan dari media lain digabung "
+            "ke berita aslinya dan dihitung satu kali dalam agregat."
+        )
+
     # Tabs for better organisation
     tab1, tab2, tab3, tab4, tab5 = st.tabs(
         [
@@ -41,7 +53,7 @@ def render_aggregate_dashboard(processed_data):
     # ------------------------------------------------------------------
     # Tab 1 – Sentiment Trend & Composition
     # ------------------------------------------------------------------
-    with tab1:
+    with tab1, profiler.stage("tab_sentiment"):
         st.subheader("\U0001F4C8 Tren Sentimen & Komposisi")
         col_s1, col_s2 = st.columns([2, 1])
 
@@ -93,6 +105,11 @@ def render_aggregate_dashboard(processed_data):
                     )
 
                 st.plotly_chart(fig_trend, use_container_width=True)
+                if processed_data.get("trend_days"):
+                    st.caption(
+                        f"Tren mencakup {processed_data['trend_days']} hari berita tersimpan untuk topik ini "
+                        "(rollup harian arsip), bukan hanya artikel laporan ini."
+                    )
             else:
                 st.info("Tidak ada data untuk menampilkan tren sentimen.")
 
@@ -126,7 +143,7 @@ def render_aggregate_dashboard(processed_data):
     # ------------------------------------------------------------------
     # Tab 2 – Entity Matrix (frequency vs sentiment)
     # ------------------------------------------------------------------
-    with tab2:
+    with tab2, profiler.stage("tab_matrix"):
         st.subheader("\U0001F4A1 Matriks Frekuensi vs. Sentimen Entitas")
         st.info(
             "Menganalisis posisi aktor dan institusi dalam pemberitaan. "
@@ -184,7 +201,7 @@ def render_aggregate_dashboard(processed_data):
     # ------------------------------------------------------------------
     # Tab 3 – Topic Analysis
     # ------------------------------------------------------------------
-    with tab3:
+    with tab3, profiler.stage("tab_topics"):
         st.subheader("\U0001F4DA Analisis Topik Otomatis")
         st.info("Sistem secara otomatis mengidentifikasi tema-tema utama yang muncul dari berita.")
         if (
@@ -231,7 +248,7 @@ def render_aggregate_dashboard(processed_data):
     # ------------------------------------------------------------------
     # Tab 4 – Word Cloud
     # ------------------------------------------------------------------
-    with tab4:
+    with tab4, profiler.stage("tab_wordcloud"):
         st.subheader("\u2601\ufe0f Word Cloud Topik Utama")
         st.info(
             "Representasi visual kata-kata yang paling sering muncul dalam berita terkait topik Anda."
@@ -247,7 +264,7 @@ def render_aggregate_dashboard(processed_data):
     # ------------------------------------------------------------------
     # Tab 5 – Entity Relationship Graph
     # ------------------------------------------------------------------
-    with tab5:
+    with tab5, profiler.stage("tab_graph"):
         st.subheader("\U0001F517 Jaringan Relasi Entitas")
         st.info("Melihat bagaimana entitas (Orang, Organisasi, Lokasi) saling terhubung dalam berita.")
 
@@ -298,19 +315,9 @@ def render_aggregate_dashboard(processed_data):
             # Relation table
             st.markdown("---")
             st.subheader("Tabel Relasi Ditemukan")
-            if (
-                "relation_counts" in processed_data
-                and processed_data["relation_counts"]
-            ):
-                relation_df = pd.DataFrame(
-                    processed_data["relation_counts"].items(),
-                    columns=["Entitas_Pair", "Frekuensi"],
-                )
-                relation_df["Entitas_1"] = relation_df["Entitas_Pair"].apply(lambda x: x[0])
-                relation_df["Entitas_2"] = relation_df["Entitas_Pair"].apply(lambda x: x[1])
-                relation_df = relation_df[["Entitas_1", "Entitas_2", "Frekuensi"]].sort_values(
-                    by="Frekuensi", ascending=False
-                )
+            relation_df = processed_data.get("relation_df")
+            if relation_df is not None and not relation_df.empty:
+                # Sudah terurut berdasarkan frekuensi di utils/article_frames.py
                 st.dataframe(relation_df, use_container_width=True)
             else:
                 st.info("Tidak ada relasi entitas signifikan yang ditemukan (atau frekuensi di bawah threshold).")
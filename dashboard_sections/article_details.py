@@ -1,11 +1,163 @@
 # dashboard_sections/article_details.py
+import math
 import streamlit as st
+import pandas as pd
 from utils.text_processor import visualize_ner # Import dari utils
+from utils.analysis_engine import signed_sentiment_score
+from utils.vector_index import similar_articles
 import html
 
-def render_article_details(news_items, summarizer):
+PAGE_SIZE_OPTIONS = [10, 20, 50]
+
+# Label urutan -> (kolom indeks, ascending); None = urutan asli laporan
+SORT_OPTIONS = {
+    "Urutan Laporan": None, # Untuk sumber arsip: urutan relevansi (BM25 / kemiripan semantik)
+    "Terbaru": ('published', False),
+    "Terlama": ('published', True),
+    "Paling Positif": ('signed_score', False),
+    "Paling Negatif": ('signed_score', True),
+    "Keyakinan Model Tertinggi": ('score', False),
+    "Paling Banyak Diberitakan": ('cluster_size', False), # jumlah media yang memuat berita yang sama
+}
+
+def _entity_words(article):
+    """Entitas yang ditampilkan di filter (filter panjang/angka sama seperti matriks entitas)."""
+    words = set()
+    for e in article.get('entities') or []:
+        word = e['word'].strip()
+        if len(word) > 2 and not any(c.isdigit() for c in word):
+            words.add(word)
+    return frozenset(words)
+
+def build_article_index(news_items):
+    """
+    Indeks kolom prahitung untuk filter & urutan di tampilan detail (satu baris per artikel,
+    kolom `pos` = posisi artikel di `news_items`).
+    """
+    rows = []
+    for pos, article in enumerate(news_items):
+        sentiment = article.get('sentiment') or {'label': 'netral', 'score': 0.0}
+        publisher = article.get('publisher') or {}
+        rows.append({
+            'pos': pos,
+            'label': sentiment['label'].lower(),
+            'score': float(sentiment['score']),
+            'signed_score': float(signed_sentiment_score(sentiment)),
+            'topic': article.get('topic_name', "Lain-lain"),
+            'publisher': (publisher.get('title') if isinstance(publisher, dict) else publisher) or "N/A",
+            'published': article.get('published date'),
+            'entities': _entity_words(article),
+            'cluster_size': article.get('cluster_size', 1),
+            'is_duplicate': bool(article.get('duplicate_of')),
+        })
+    index_df = pd.DataFrame(rows)
+    index_df['published'] = pd.to_datetime(index_df['published'], utc=True, errors='coerce')
+    return index_df
+
+def _cached_article_index(news_items):
+    # Indeks dibangun sekali per laporan (news_items yang sama), bukan pada setiap rerun
+    cached = st.session_state.get('article_index_cache')
+    if cached is None or cached[0] is not news_items or cached[1] != len(news_items):
+        cached = (news_items, len(news_items), build_article_index(news_items))
+        st.session_state.article_index_cache = cached
+        # Pilihan filter laporan sebelumnya belum tentu ada di laporan baru
+        for key in ("detail_topics", "detail_publishers", "detail_entities", "detail_page"):
+            st.session_state.pop(key, None)
+    return cached[2]
+
+def _ner_html(article):
+    """HTML sorotan NER, dibuat sekali per artikel lalu disimpan di artikel itu sendiri."""
+    cache_key = (article['clean_text'], len(article['entities']))
+    if article.get('ner_html_key') != cache_key:
+        # Pastikan teks yang divisualisasikan adalah teks asli dari artikel
+        # dan bersihkan sedikit jika ada karakter aneh dari GNews
+        display_text = html.escape(article['clean_text']) # Escape HTML entities to prevent injection
+        article['ner_html'] = visualize_ner(display_text, article['entities'])
+        article['ner_html_key'] = cache_key
+    return article['ner_html']
+
+def _filter_and_sort(index_df, sentiments, topics, publishers, entities, sort_label, hide_duplicates=False):
+    mask = pd.Series(True, index=index_df.index)
+    if hide_duplicates:
+        mask &= ~index_df['is_duplicate']
+    if sentiments:
+        mask &= index_df['label'].isin([s.lower() for s in sentiments])
+    if topics:
+        mask &= index_df['topic'].isin(topics)
+    if publishers:
+        mask &= index_df['publisher'].isin(publishers)
+    if entities:
+        selected = frozenset(entities)
+        mask &= index_df['entities'].map(lambda words: not words.isdisjoint(selected))
+    result = index_df[mask]
+    sort = SORT_OPTIONS[sort_label]
+    if sort is not None:
+        column, ascending = sort
+        result = result.sort_values(column, ascending=ascending, kind='stable', na_position='last')
+    return result['pos'].tolist()
+
+def _render_article(i, article):
+    sentiment_label = article['sentiment']['label'].capitalize()
+    sentiment_score = article['sentiment']['score']
+
+    # Box untuk setiap artikel dengan warna sentimen
+    if sentiment_label.lower() == 'positif':
+        st.success(f"**Positif** ({sentiment_score:.2f}) | **{article['title']}**")
+    elif sentiment_label.lower() == 'negatif':
+        st.error(f"**Negatif** ({sentiment_score:.2f}) | **{article['title']}**")
+    else:
+        st.info(f"**Netral** ({sentiment_score:.2f}) | **{article['title']}**")
+
+    # Berita hampir-duplikat (sindikasi) dianalisis sekali lewat artikel perwakilannya
+    if article.get('duplicate_of'):
+        st.caption("📑 Salinan berita yang sama dari media lain (hasil analisis mengikuti artikel perwakilan)")
+    elif article.get('cluster_size', 1) > 1:
+        st.caption(f"📑 Diberitakan oleh {article['cluster_size']} media")
+
+    # Hasil pencarian arsip lokal membawa snippet dengan kata kunci yang disorot
+    if article.get('snippet'):
+        st.markdown(f"<small>🔎 {article['snippet']}</small>", unsafe_allow_html=True)
+
+    with st.expander(f"Analisis Mendalam & Ringkasan Artikel {i+1} (Klik untuk Lihat)"):
+        st.subheader("📜 Ringkasan Otomatis")
+        if article.get('summary'):
+            st.write(article['summary'])
+        elif article.get('summary_error'):
+            st.write("Tidak dapat membuat ringkasan untuk artikel ini (teks terlalu pendek atau masalah model).")
+        else:
+            st.caption("Ringkasan sedang disiapkan di latar belakang...")
+
+        st.subheader("🎨 Analisis Entitas dalam Teks")
+        st.markdown(_ner_html(article), unsafe_allow_html=True)
+
+        # Tambahkan info topik jika tersedia
+        if 'topic_name' in article:
+            st.markdown(f"**Topik Teridentifikasi:** `{article['topic_name']}` (ID: {article['topic_id']})")
+
+        # "Temukan artikel seperti ini": dicari di indeks semantik hanya saat tombol ditekan
+        if st.button("🔗 Cari Artikel Serupa di Arsip", key=f"similar_{i}"):
+            try:
+                similar = similar_articles(article['url'])
+            except Exception as e:
+                st.warning(f"Pencarian semantik tidak tersedia: {e}")
+            else:
+                for match in similar:
+                    st.markdown(f"- [{match['title']}]({match['url']}) (kemiripan {match['similarity']:.2f})")
+                if not similar:
+                    st.caption("Belum ada artikel serupa di arsip.")
+
+        st.markdown("---")
+        st.caption(f"**Sumber:** {article.get('publisher', {}).get('title', 'N/A')} | **Tanggal Publikasi:** {article.get('published date', 'N/A')}")
+        st.link_button("Baca Artikel Lengkap di Sumber Asli", article['url'])
+
+@st.fragment
+def render_article_details(news_items):
     """
     Merender daftar artikel dengan detail analisis mendalam (sentimen, ringkasan, NER).
+    Ringkasan dibaca dari `article['summary']` yang diisi job ringkasan batch (utils/summaries.py);
+    tidak ada model yang dipanggil di sini, karena isi expander dieksekusi pada setiap rerun.
+    Hanya satu halaman artikel yang dirender; filter & urutan memakai indeks prahitung,
+    dan interaksi di bagian ini hanya menjalankan ulang fragment ini.
     """
     st.markdown("<h2 style='text-align: center; color: #4CAF50;'>📄 Detail Laporan Artikel</h2>", unsafe_allow_html=True)
     st.markdown("---")
@@ -14,40 +166,42 @@ def render_article_details(news_items, summarizer):
         st.info("Tidak ada artikel untuk ditampilkan. Silakan lakukan pencarian terlebih dahulu.")
         return
 
-    for i, article in enumerate(news_items):
-        sentiment_label = article['sentiment']['label'].capitalize()
-        sentiment_score = article['sentiment']['score']
+    index_df = _cached_article_index(news_items)
+    entity_counts = pd.Series([w for words in index_df['entities'] for w in words]).value_counts()
 
-        # Box untuk setiap artikel dengan warna sentimen
-        if sentiment_label.lower() == 'positif':
-            st.success(f"**Positif** ({sentiment_score:.2f}) | **{article['title']}**")
-        elif sentiment_label.lower() == 'negatif':
-            st.error(f"**Negatif** ({sentiment_score:.2f}) | **{article['title']}**")
-        else:
-            st.info(f"**Netral** ({sentiment_score:.2f}) | **{article['title']}**")
-
-        with st.expander(f"Analisis Mendalam & Ringkasan Artikel {i+1} (Klik untuk Lihat)"):
-            st.subheader("📜 Ringkasan Otomatis")
-            # Ringkasan hanya dilakukan saat expander dibuka
-            with st.spinner("Meringkas artikel..."):
-                try:
-                    summary = summarizer(article['clean_text'], max_length=150, min_length=30, do_sample=False)[0]['summary_text']
-                except IndexError:
-                    summary = "Tidak dapat membuat ringkasan untuk artikel ini (teks terlalu pendek atau masalah model)."
-                except Exception as e:
-                    summary = f"Terjadi kesalahan saat meringkas: {e}"
-            st.write(summary)
-
-            st.subheader("🎨 Analisis Entitas dalam Teks")
-            # Pastikan teks yang divisualisasikan adalah teks asli dari artikel
-            # dan bersihkan sedikit jika ada karakter aneh dari GNews
-            display_text = html.escape(article['clean_text']) # Escape HTML entities to prevent injection
-            st.markdown(visualize_ner(display_text, article['entities']), unsafe_allow_html=True)
-
-            # Tambahkan info topik jika tersedia
-            if 'topic_name' in article:
-                st.markdown(f"**Topik Teridentifikasi:** `{article['topic_name']}` (ID: {article['topic_id']})")
-
-            st.markdown("---")
-            st.caption(f"**Sumber:** {article.get('publisher', {}).get('title', 'N/A')} | **Tanggal Publikasi:** {article.get('published date', 'N/A')}")
-            st.link_button("Baca Artikel Lengkap di Sumber Asli", article['url'])
\ No newline at end of file
+    col_f1, col_f2, col_f3, col_f4 = st.columns(4)
+    with col_f1:
+        sentiments = st.multiselect("Sentimen:", ["Positif", "Netral", "Negatif"], key="detail_sentiments")
+    with col_f2:
+        topics = st.multiselect("Topik:", sorted(index_df['topic'].unique()), key="detail_topics")
+    with col_f3:
+        publishers = st.multiselect("Sumber:", sorted(index_df['publisher'].unique()), key="detail_publishers")
+    with col_f4:
+        # Entitas diurutkan dari yang paling sering muncul
+        entities = st.multiselect("Entitas:", entity_counts.index.tolist(), key="detail_entities")
+
+    col_s1, col_s2, col_s3 = st.columns([2, 1, 1])
+    with col_s1:
+        sort_label = st.selectbox("Urutkan:", list(SORT_OPTIONS), key="detail_sort")
+        hide_duplicates = st.checkbox("Sembunyikan salinan berita dari media lain", value=True, key="detail_hide_duplicates")
+    with col_s2:
+        page_size = st.selectbox("Artikel per Halaman:", PAGE_SIZE_OPTIONS, key="detail_page_size")
+
+    positions = _filter_and_sort(index_df, sentiments, topics, publishers, entities, sort_label, hide_duplicates)
+    n_pages = max(1, math.ceil(len(positions) / page_size))
+    # Nilai halaman hanya lewat session state (tanpa `value=`): diisi sekali, lalu dibatasi
+    # bila filter dipersempit sehingga halaman tersimpan melewati jumlah halaman
+    if "detail_page" not in st.session_state:
+        st.session_state.detail_page = 1
+    elif st.session_state.detail_page > n_pages:
+        st.session_state.detail_page = n_pages
+    with col_s3:
+        page = st.number_input("Halaman:", min_value=1, max_value=n_pages, key="detail_page")
+
+    st.caption(f"Menampilkan {len(positions)} dari {len(news_items)} artikel | Halaman {page}/{n_pages}")
+    if not positions:
+        st.info("Tidak ada artikel yang cocok dengan filter.")
+        return
+
+    for pos in positions[(page - 1) * page_size:page * page_size]:
+        _render_article(pos, news_items[pos])
@@ -0,0 +1,28 @@
+# dashboard_sections/job_progress.py
+import streamlit as st
+
+def render_job_progress(snapshot, stage_labels):
+    """
+    Merender progres job laporan yang sedang berjalan (per tahap) beserta hasil parsialnya.
+    `snapshot` adalah hasil `Job.snapshot()`, `stage_labels` berisi urutan & label tahap.
+    """
+    st.markdown(f"### ⏳ {snapshot['name']} sedang diproses ({snapshot['elapsed']:.0f} detik)")
+    stages = snapshot['stages']
+    for stage, label in stage_labels.items():
+        info = stages.get(stage)
+        if info is None:
+            st.caption(f"⚪ {label}: menunggu")
+            continue
+        done, total = info['done'], info['total']
+        fraction = min(1.0, done / total) if total else 1.0
+        st.progress(fraction, text=f"{label}: {done}/{total}")
+
+    # Hasil parsial: tampilkan lebih awal apa yang sudah tersedia
+    partial = snapshot['partial']
+    if 'processed_data' in partial:
+        comp_df = partial['processed_data'].get('sentiment_comp_df')
+        if comp_df is not None and not comp_df.empty:
+            st.markdown("**Komposisi Sentimen Sementara** (topik masih diproses)")
+            st.dataframe(comp_df, use_container_width=True, hide_index=True)
+    elif 'news_items' in partial:
+        st.markdown(f"**{len(partial['news_items'])} berita terkumpul**, analisis AI sedang berjalan...")
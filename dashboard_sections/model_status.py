@@ -0,0 +1,23 @@
+# dashboard_sections/model_status.py
+import streamlit as st
+
+STATUS_BADGES = {
+    "idle": "⚪ Belum dimuat (dimuat saat dibutuhkan)",
+    "loading": "🟡 Sedang dimuat...",
+    "ready": "🟢 Siap",
+    "error": "🔴 Gagal dimuat",
+}
+
+def render_model_status(status):
+    """
+    Merender status kesiapan model AI di sidebar.
+    `status` adalah dict hasil `models.loader.model_status()`.
+    """
+    with st.sidebar:
+        st.markdown("### 🤖 Status Model AI")
+        for info in status.values():
+            st.caption(f"**{info['label']}**: {STATUS_BADGES.get(info['status'], info['status'])}")
+            if info['error']:
+                st.caption(f"↳ {info['error']}")
+        if st.button("🔄 Perbarui Status Model", use_container_width=True):
+            st.rerun()
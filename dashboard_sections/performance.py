@@ -0,0 +1,55 @@
+# dashboard_sections/performance.py
+import pandas as pd
+import streamlit as st
+from utils.profiling import PROFILE_MODE, PROFILE_MODES
+
+STAGE_COLUMNS = {
+    'stage': "Tahap",
+    'wall_s': "Wall (detik)",
+    'cpu_s': "CPU (detik)",
+    'items': "Item",
+    'peak_rss_mb': "Puncak RSS (MB)",
+}
+
+
+def render_profile_switch():
+    """Pilihan profiling mendalam untuk laporan berikutnya di sidebar. Mengembalikan mode atau None."""
+    options = [None, *PROFILE_MODES]
+    with st.sidebar:
+        return st.selectbox(
+            "⏱️ Profiling laporan berikutnya:", options=options,
+            index=options.index(PROFILE_MODE) if PROFILE_MODE in options else 0,
+            format_func=lambda mode: mode or "Nonaktif",
+            key="profile_mode",
+        )
+
+
+def _stage_table(metrics):
+    df = pd.DataFrame(metrics.get('stages') or [], columns=list(STAGE_COLUMNS))
+    return df.rename(columns=STAGE_COLUMNS)
+
+
+def render_performance_panel(metrics, render_metrics=None):
+    """
+    Merender panel performa (tertutup secara default): total & per tahap dari pipeline laporan
+    (`processed_data['metrics']`) dan waktu render dashboard pada rerun ini.
+    """
+    if not metrics and not render_metrics:
+        return
+    with st.expander("⏱️ Performa Laporan", expanded=False):
+        if metrics:
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Wall time", f"{metrics.get('wall_s', 0):.2f} dtk")
+            col2.metric("CPU time", f"{metrics.get('cpu_s', 0):.2f} dtk")
+            peak = metrics.get('peak_rss_mb')
+            col3.metric("Puncak memori", f"{peak:,.0f} MB" if peak is not None else "-")
+            st.dataframe(_stage_table(metrics), use_container_width=True, hide_index=True)
+            st.caption("CPU time dihitung per proses, termasuk laporan lain yang berjalan bersamaan.")
+            if metrics.get('profile_path'):
+                st.caption(f"Profil {metrics['profile']} tersimpan di `{metrics['profile_path']}`.")
+            if metrics.get('profile_error'):
+                st.caption(metrics['profile_error'])
+        if render_metrics:
+            st.markdown(f"**Render dashboard**: {render_metrics['wall_s']:.2f} detik")
+            st.dataframe(_stage_table(render_metrics).drop(columns=[STAGE_COLUMNS['peak_rss_mb']]),
+                         use_container_width=True, hide_index=True)
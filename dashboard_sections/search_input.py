@@ -1,26 +1,58 @@
 # dashboard_sections/search_input.py
 import streamlit as st
+from datetime import date, timedelta
+from utils.pipeline import GNEWS_SOURCE, ARCHIVE_SOURCE, SEMANTIC_SOURCE, ARCHIVE_SOURCES
+
+SOURCE_OPTIONS = {"Google News": GNEWS_SOURCE, "Arsip Lokal": ARCHIVE_SOURCE, "Arsip Semantik": SEMANTIC_SOURCE}
+PERIOD_OPTIONS = {"24 Jam Terakhir": "1d", "Seminggu Terakhir": "7d", "Sebulan Terakhir": "1m", "Tiga Bulan Terakhir": "3m"}
+
+def set_search_inputs(query, period, num_articles):
+    """
+    Mengisi widget pencarian (sumber Google News) dengan parameter sebuah laporan, mis. laporan
+    tersimpan yang dibuka dari sidebar. Harus dipanggil sebelum `render_search_input` di run yang sama.
+    """
+    st.session_state.search_source = "Google News"
+    st.session_state.search_query = query
+    period_labels = {code: label for label, code in PERIOD_OPTIONS.items()}
+    if period in period_labels:
+        st.session_state.search_period = period_labels[period]
+    st.session_state.search_num_articles = max(5, min(int(num_articles), 100))
 
 def render_search_input():
     """
     Merender bagian input pencarian berita.
-    Mengembalikan query, selected_period_code, dan num_articles.
+    Mengembalikan query, period, num_articles, status tombol, dan source.
+    `period` berupa kode periode GNews, atau tuple (tanggal_awal, tanggal_akhir) untuk sumber arsip.
     """
     st.header("Pencarian Berita Canggih")
-    PERIOD_OPTIONS = {"24 Jam Terakhir": "1d", "Seminggu Terakhir": "7d", "Sebulan Terakhir": "1m", "Tiga Bulan Terakhir": "3m"}
-    
+    # Nilai awal lewat session state (bukan `value=`) agar bisa diisi oleh set_search_inputs
+    st.session_state.setdefault("search_query", "Ibu Kota Nusantara")
+    st.session_state.setdefault("search_num_articles", 20)
+
+    source_label = st.radio("Sumber Berita:", options=list(SOURCE_OPTIONS.keys()), horizontal=True, key="search_source",
+                            help="Arsip Lokal mencari kata kunci di artikel yang sudah tersimpan di database tanpa mengakses jaringan; "
+                                 "Arsip Semantik mencari artikel yang maknanya paling mirip dengan pertanyaan Anda.")
+    source = SOURCE_OPTIONS[source_label]
+
     col_input1, col_input2, col_input3 = st.columns([2, 1, 1])
     with col_input1:
-        query = st.text_input("Topik Intelijen (Kata Kunci Berita):", value="Ibu Kota Nusantara")
+        query = st.text_input("Topik Intelijen (Kata Kunci Berita):", key="search_query")
     with col_input2:
-        selected_period_label = st.selectbox("Rentang Waktu Laporan:", options=list(PERIOD_OPTIONS.keys()))
+        if source in ARCHIVE_SOURCES:
+            date_range = st.date_input("Rentang Tanggal Publikasi:", value=(date.today() - timedelta(days=365), date.today()))
+            # Saat pengguna baru memilih tanggal awal, date_input mengembalikan satu tanggal saja
+            period = tuple(date_range) if len(date_range) == 2 else (date_range[0], None)
+        else:
+            selected_period_label = st.selectbox("Rentang Waktu Laporan:", options=list(PERIOD_OPTIONS.keys()), key="search_period")
+            period = PERIOD_OPTIONS[selected_period_label]
     with col_input3:
-        num_articles = st.number_input("Jumlah Artikel Maksimal:", min_value=5, max_value=100, value=20)
+        max_articles = 500 if source in ARCHIVE_SOURCES else 100
+        # Nilai dari sumber arsip (maks. 500) bisa melebihi batas Google News saat sumber diganti
+        st.session_state.search_num_articles = min(st.session_state.search_num_articles, max_articles)
+        num_articles = st.number_input("Jumlah Artikel Maksimal:", min_value=5, max_value=max_articles, key="search_num_articles")
 
-    period_code = PERIOD_OPTIONS[selected_period_label]
-    
     # Tombol aksi utama
     if st.button("🚀 Hasilkan Laporan Intelijen & Analisis", type="primary", use_container_width=True):
-        return query, period_code, num_articles, True # True menandakan tombol ditekan
-    
-    return query, period_code, num_articles, False # False jika tombol belum ditekan
\ No newline at end of file
+        return query, period, num_articles, True, source # True menandakan tombol ditekan
+
+    return query, period, num_articles, False, source # False jika tombol belum ditekan
@@ -0,0 +1,36 @@
+# dashboard_sections/stored_reports.py
+import streamlit as st
+from datetime import datetime
+from utils.report_store import list_reports, load_report
+
+def render_stored_reports():
+    """
+    Merender daftar laporan siap-buka hasil worker headless (worker.py) di sidebar.
+    Mengembalikan laporan yang dipilih pengguna (dict dari `load_report`, ditambah
+    topic_query & period), atau None.
+    """
+    with st.sidebar:
+        st.markdown("### 📂 Laporan Tersimpan")
+        try:
+            reports = list_reports()
+        except Exception as e:
+            st.caption(f"Laporan tersimpan tidak dapat dibaca: {e}")
+            return None
+        if not reports:
+            st.caption("Belum ada laporan dari worker watchlist.")
+            return None
+
+        labels = [
+            f"{r['topic_query']} ({r['period']}) · {r['n_articles']} artikel · "
+            f"{datetime.fromtimestamp(r['created_at']).strftime('%d/%m %H:%M')}"
+            for r in reports
+        ]
+        choice = st.selectbox("Laporan hasil worker:", options=range(len(reports)), format_func=labels.__getitem__)
+        if not st.button("📂 Buka Laporan", use_container_width=True):
+            return None
+        selected = reports[choice]
+        report = load_report(selected['topic_query'], selected['period'])
+        if report is None:
+            st.caption("Laporan sudah tidak tersedia.")
+            return None
+        return {**report, 'topic_query': selected['topic_query'], 'period': selected['period']}
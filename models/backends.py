@@ -0,0 +1,148 @@
+# models/backends.py
+"""
+Backend inferensi CPU untuk pipeline transformers.
+
+Backend dipilih lewat environment variable NEWS_INTEL_INFERENCE_BACKEND:
+- "pytorch"    : PyTorch full precision (default, perilaku lama)
+- "torch-int8" : PyTorch dengan dynamic int8 quantization pada layer Linear
+- "onnx-int8"  : ekspor ke ONNX + dynamic int8 quantization, dijalankan dengan ONNX Runtime
+                 (butuh paket opsional `optimum[onnxruntime]`)
+
+Jika backend yang diminta gagal (paket tidak ada / ekspor gagal), loader turun ke
+backend berikutnya: onnx-int8 -> torch-int8 -> pytorch.
+"""
+import os
+import logging
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+BACKEND_PYTORCH, BACKEND_TORCH_INT8, BACKEND_ONNX_INT8 = "pytorch", "torch-int8", "onnx-int8"
+SUPPORTED_BACKENDS = (BACKEND_PYTORCH, BACKEND_TORCH_INT8, BACKEND_ONNX_INT8)
+
+INFERENCE_BACKEND = os.getenv("NEWS_INTEL_INFERENCE_BACKEND", BACKEND_PYTORCH)
+ONNX_CACHE_DIR = Path(os.getenv("NEWS_INTEL_ONNX_CACHE_DIR", "data/onnx_models"))
+# Set instruksi CPU untuk konfigurasi kuantisasi ONNX: avx2, avx512, avx512_vnni, arm64
+ONNX_QUANT_ARCH = os.getenv("NEWS_INTEL_ONNX_QUANT_ARCH", "avx2")
+
+_FALLBACK_ORDER = {
+    BACKEND_ONNX_INT8: [BACKEND_ONNX_INT8, BACKEND_TORCH_INT8, BACKEND_PYTORCH],
+    BACKEND_TORCH_INT8: [BACKEND_TORCH_INT8, BACKEND_PYTORCH],
+    BACKEND_PYTORCH: [BACKEND_PYTORCH],
+}
+
+# Kelas model per task untuk backend torch-int8 dan onnx-int8
+_TORCH_MODEL_CLASSES = {
+    "sentiment-analysis": "AutoModelForSequenceClassification",
+    "ner": "AutoModelForTokenClassification",
+    "summarization": "AutoModelForSeq2SeqLM",
+}
+_ORT_MODEL_CLASSES = {
+    "sentiment-analysis": "ORTModelForSequenceClassification",
+    "ner": "ORTModelForTokenClassification",
+    "summarization": "ORTModelForSeq2SeqLM",
+}
+
+
+def configured_backend(backend=None):
+    """Backend yang diminta (default NEWS_INTEL_INFERENCE_BACKEND); nilai tidak dikenal menjadi pytorch."""
+    backend = backend or INFERENCE_BACKEND
+    return backend if backend in SUPPORTED_BACKENDS else BACKEND_PYTORCH
+
+
+def build_pipeline(task, model_id, backend=None, **pipeline_kwargs):
+    """
+    Membangun pipeline transformers untuk `task`/`model_id` dengan backend yang dipilih.
+    Mengembalikan pipeline; backend yang benar-benar dipakai tersimpan di atribut `inference_backend`.
+    """
+    requested = backend or INFERENCE_BACKEND
+    backend = configured_backend(requested)
+    if backend != requested:
+        logger.warning("Backend inferensi '%s' tidak dikenal, memakai '%s'.", requested, backend)
+
+    last_error = None
+    for candidate in _FALLBACK_ORDER[backend]:
+        try:
+            pipe = _BUILDERS[candidate](task, model_id, **pipeline_kwargs)
+        except Exception as e:
+            last_error = e
+            logger.warning("Backend '%s' gagal untuk %s (%s), mencoba backend berikutnya.", candidate, model_id, e)
+            continue
+        pipe.inference_backend = candidate
+        return pipe
+    raise last_error
+
+
+def _build_pytorch(task, model_id, **pipeline_kwargs):
+    from transformers import pipeline
+    return pipeline(task, model=model_id, **pipeline_kwargs)
+
+
+def _build_torch_int8(task, model_id, **pipeline_kwargs):
+    import torch
+    import transformers
+    from transformers import AutoTokenizer, pipeline
+
+    model_class = getattr(transformers, _TORCH_MODEL_CLASSES[task])
+    model = model_class.from_pretrained(model_id)
+    model.eval()
+    model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    tokenizer = AutoTokenizer.from_pretrained(model_id)
+    return pipeline(task, model=model, tokenizer=tokenizer, **pipeline_kwargs)
+
+
+def _onnx_export_dir(model_id):
+    return ONNX_CACHE_DIR / model_id.replace("/", "__")
+
+
+def export_quantized_onnx(task, model_id):
+    """
+    Mengekspor `model_id` ke ONNX lalu menerapkan dynamic int8 quantization.
+    Hasil disimpan di ONNX_CACHE_DIR dan dipakai ulang pada pemanggilan berikutnya.
+    Mengembalikan path direktori model terkuantisasi.
+    """
+    import optimum.onnxruntime as ort
+    from optimum.onnxruntime import ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+    export_dir = _onnx_export_dir(model_id)
+    quantized_dir = export_dir / "int8"
+    if quantized_dir.exists() and any(quantized_dir.glob("*_quantized.onnx")):
+        return quantized_dir
+
+    model_class = getattr(ort, _ORT_MODEL_CLASSES[task])
+    model = model_class.from_pretrained(model_id, export=True)
+    model.save_pretrained(export_dir)
+
+    qconfig = getattr(AutoQuantizationConfig, ONNX_QUANT_ARCH)(is_static=False, per_channel=False)
+    # Model seq2seq (T5) terdiri dari beberapa file ONNX (encoder/decoder); kuantisasi satu per satu
+    for onnx_file in sorted(export_dir.glob("*.onnx")):
+        quantizer = ORTQuantizer.from_pretrained(export_dir, file_name=onnx_file.name)
+        quantizer.quantize(save_dir=quantized_dir, quantization_config=qconfig)
+    return quantized_dir
+
+
+def _build_onnx_int8(task, model_id, **pipeline_kwargs):
+    import optimum.onnxruntime as ort
+    from transformers import AutoTokenizer, pipeline
+
+    quantized_dir = export_quantized_onnx(task, model_id)
+    model_class = getattr(ort, _ORT_MODEL_CLASSES[task])
+    if task == "summarization":
+        model = model_class.from_pretrained(
+            quantized_dir,
+            encoder_file_name="encoder_model_quantized.onnx",
+            decoder_file_name="decoder_model_quantized.onnx",
+            decoder_with_past_file_name="decoder_with_past_model_quantized.onnx",
+        )
+    else:
+        model = model_class.from_pretrained(quantized_dir, file_name="model_quantized.onnx")
+    tokenizer = AutoTokenizer.from_pretrained(model_id)
+    return pipeline(task, model=model, tokenizer=tokenizer, **pipeline_kwargs)
+
+
+_BUILDERS = {
+    BACKEND_PYTORCH: _build_pytorch,
+    BACKEND_TORCH_INT8: _build_torch_int8,
+    BACKEND_ONNX_INT8: _build_onnx_int8,
+}
@@ -1,33 +1,72 @@
 # models/loader.py
-import streamlit as st
-from transformers import pipeline
-from bertopic import BERTopic
-from sklearn.feature_extraction.text import TfidfVectorizer # Untuk BERTopic
+import os
+import json
+import hashlib
+import threading
+from models.backends import build_pipeline, configured_backend
 
-@st.cache_resource(show_spinner=False)
-def load_sentiment_model():
-    # st.write("Memuat model Analisis Sentimen...") # Kita hilangkan ini untuk tampilan lebih bersih
-    return pipeline("sentiment-analysis", model="taufiqdp/indonesian-sentiment")
+# Identitas model yang dipakai; perubahan apa pun di sini membatalkan cache analisis di DB
+SENTIMENT_MODEL_ID = "taufiqdp/indonesian-sentiment"
+SUMMARIZER_MODEL_ID = "panggi/t5-base-indonesian-summarization-cased"
+NER_MODEL_ID = "cahya/bert-base-indonesian-NER"
+# Model sentence-transformer yang dipakai BERTopic untuk language="indonesian" (multilingual)
+EMBEDDING_MODEL_ID = "paraphrase-multilingual-MiniLM-L12-v2"
 
-@st.cache_resource(show_spinner=False)
-def load_summarizer_model():
-    # st.write("Memuat model Peringkas Berita...")
-    return pipeline("summarization", model="panggi/t5-base-indonesian-summarization-cased")
+# Model yang hasilnya disimpan di cache analysis (per `model_version`)
+FINGERPRINT_MODELS = ("sentiment", "ner")
 
-@st.cache_resource(show_spinner=False)
-def load_ner_model():
-    # st.write("Memuat model Ekstraksi Entitas...")
-    return pipeline("ner", model="cahya/bert-base-indonesian-NER", grouped_entities=True)
+def get_model_fingerprint():
+    """
+    Fingerprint singkat dari konfigurasi model AI, dipakai sebagai `model_version`
+    untuk cache hasil analisis di news_intelligence.db.
+    Tidak memuat model: backend inferensi diambil dari pipeline yang sudah dimuat (build_pipeline
+    bisa turun dari onnx-int8 ke torch-int8/pytorch per model), atau dari backend yang dikonfigurasi
+    bila model belum dimuat. Fingerprint bisa berubah sekali setelah pipeline yang turun backend dimuat.
+    """
+    config = {
+        "sentiment": SENTIMENT_MODEL_ID,
+        "summarizer": SUMMARIZER_MODEL_ID,
+        "ner": NER_MODEL_ID,
+        "ner_grouped_entities": True,
+        "inference_backend": {name: _inference_backend(name) for name in FINGERPRINT_MODELS},
+    }
+    return hashlib.sha1(json.dumps(config, sort_keys=True).encode("utf-8")).hexdigest()[:12]
 
-@st.cache_resource(show_spinner=False)
-def load_topic_model():
-    # st.write("Memuat model Topic Modeling...")
+def _inference_backend(name):
+    return getattr(_models.get(name), "inference_backend", None) or configured_backend()
+
+# --- Builder model (import library berat dilakukan di dalam fungsi agar cold start cepat) ---
+# Backend inferensi (pytorch / torch-int8 / onnx-int8) diatur di models/backends.py
+
+def _build_sentiment_model():
+    return build_pipeline("sentiment-analysis", SENTIMENT_MODEL_ID)
+
+def _build_summarizer_model():
+    return build_pipeline("summarization", SUMMARIZER_MODEL_ID)
+
+def _build_ner_model():
+    return build_pipeline("ner", NER_MODEL_ID, grouped_entities=True)
+
+def _build_embedding_model():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(EMBEDDING_MODEL_ID)
+
+def create_topic_model():
+    """
+    Membuat instance BERTopic BARU (state clustering/representasi milik satu permintaan).
+    Embedding model di dalamnya adalah instance bersama dari registry dan hanya dibaca.
+    """
+    from bertopic import BERTopic
+    from sklearn.feature_extraction.text import TfidfVectorizer # Untuk BERTopic
     # Menggunakan representasi TF-IDF sebagai fallback untuk BERTopic
     # Jika Anda memiliki model sentence-transformer yang spesifik untuk bahasa Indonesia, bisa diubah di sini
     vectorizer_model = TfidfVectorizer(stop_words=None, ngram_range=(1, 2), min_df=5)
     # Model BERTopic dasar. Untuk performa lebih baik, bisa pakai model bahasa Indonesia yang lebih besar
     return BERTopic(
         language="indonesian",
+        # Embedding model bersama dari registry; embedding dokumen dihitung & di-cache di
+        # utils/embedding_store.py lalu diberikan langsung ke fit_transform
+        embedding_model=get_model("embedding"),
         calculate_probabilities=True,
         # Untuk model yang lebih cepat atau jika ingin mengontrol embeddings:
         # embedding_model="indonesian-sbert", # Contoh: "indonesian-sbert" jika ada model sentence-transformers yang diinstal
@@ -35,5 +74,153 @@ def load_topic_model():
         verbose=False
     )
 
+# Jumlah topik tetap untuk model topik online (MiniBatchKMeans tidak mengenal outlier -1)
+ONLINE_TOPIC_COUNT = int(os.getenv("NEWS_INTEL_ONLINE_TOPICS", "8"))
+ONLINE_TOPIC_DIMENSIONS = 5
+
+def create_online_topic_model(n_topics=ONLINE_TOPIC_COUNT):
+    """
+    Membuat BERTopic yang dapat di-`partial_fit` (mode topik inkremental, lihat utils/topic_service.py):
+    IncrementalPCA menggantikan UMAP, MiniBatchKMeans menggantikan HDBSCAN, dan
+    OnlineCountVectorizer memperbarui kosakata sedikit demi sedikit.
+    Tanpa embedding_model: embedding dokumen selalu diberikan dari utils/embedding_store.py,
+    sehingga model bisa di-pickle apa adanya.
+    """
+    from bertopic import BERTopic
+    from bertopic.vectorizers import OnlineCountVectorizer
+    from sklearn.cluster import MiniBatchKMeans
+    from sklearn.decomposition import IncrementalPCA
+    return BERTopic(
+        language="indonesian",
+        umap_model=IncrementalPCA(n_components=ONLINE_TOPIC_DIMENSIONS),
+        hdbscan_model=MiniBatchKMeans(n_clusters=n_topics, random_state=0, n_init=3),
+        # decay: bobot kata lama meluruh agar kosakata mengikuti pemberitaan terbaru
+        vectorizer_model=OnlineCountVectorizer(stop_words=None, decay=.01),
+        verbose=False
+    )
+
+# --- Registry model: setiap model dimuat saat pertama kali dibutuhkan (lazy) ---
+# State registry bersifat per-proses, sehingga dipakai bersama oleh semua sesi Streamlit
+# (setara dengan @st.cache_resource sebelumnya).
+
+MODEL_BUILDERS = {
+    "sentiment": _build_sentiment_model,
+    "summarizer": _build_summarizer_model,
+    "ner": _build_ner_model,
+    "embedding": _build_embedding_model,
+}
+
+MODEL_LABELS = {
+    "sentiment": "Analisis Sentimen",
+    "summarizer": "Peringkas Berita",
+    "ner": "Ekstraksi Entitas",
+    "embedding": "Embedding Dokumen",
+}
+
+STATUS_IDLE, STATUS_LOADING, STATUS_READY, STATUS_ERROR = "idle", "loading", "ready", "error"
+
+_models = {}
+_model_status = {name: STATUS_IDLE for name in MODEL_BUILDERS}
+_model_errors = {}
+_model_locks = {name: threading.Lock() for name in MODEL_BUILDERS}
+
+def get_model(name):
+    """
+    Mengembalikan instance model `name`, memuatnya terlebih dahulu jika belum tersedia.
+    Aman dipanggil dari beberapa thread: setiap model hanya dimuat satu kali.
+    """
+    if name in _models:
+        return _models[name]
+    with _model_locks[name]:
+        if name not in _models:
+            _model_status[name] = STATUS_LOADING
+            try:
+                _models[name] = MODEL_BUILDERS[name]()
+            except Exception as e:
+                _model_status[name] = STATUS_ERROR
+                _model_errors[name] = str(e)
+                raise
+            _model_status[name] = STATUS_READY
+            _model_errors.pop(name, None)
+    return _models[name]
+
+def warm_up_models(names=None, background=True):
+    """
+    Memuat model lebih awal. Dengan `background=True` setiap model dimuat di thread daemon
+    terpisah sehingga halaman tetap bisa dirender. Model yang sudah/ sedang dimuat dilewati.
+    """
+    names = list(names or MODEL_BUILDERS)
+    threads = []
+    for name in names:
+        if _model_status[name] in (STATUS_READY, STATUS_LOADING):
+            continue
+        if not background:
+            get_model(name)
+            continue
+        _model_status[name] = STATUS_LOADING
+        thread = threading.Thread(target=_warm_up_worker, args=(name,), name=f"warmup-{name}", daemon=True)
+        thread.start()
+        threads.append(thread)
+    return threads
+
+def _warm_up_worker(name):
+    try:
+        get_model(name)
+    except Exception:
+        pass # Error sudah dicatat di registry dan akan muncul lagi saat model dipakai
+
+def model_status():
+    """Status kesiapan setiap model: dict name -> {'label', 'status', 'error'}."""
+    return {
+        name: {
+            'label': MODEL_LABELS.get(name, name),
+            'status': _model_status[name],
+            'error': _model_errors.get(name),
+        }
+        for name in MODEL_BUILDERS
+    }
+
+class LazyModel:
+    """
+    Proxy ringan untuk model di registry. Model baru dimuat ketika proxy dipanggil
+    atau atributnya diakses (mis. `summarizer.tokenizer`).
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __call__(self, *args, **kwargs):
+        return get_model(self.name)(*args, **kwargs)
+
+    def __getattr__(self, attr):
+        # Atribut privat/dunder (mis. saat copy/pickle) tidak boleh memicu pemuatan model
+        if attr.startswith('_') or attr == 'name':
+            raise AttributeError(attr)
+        return getattr(get_model(self.name), attr)
+
+    def is_ready(self):
+        return _model_status[self.name] == STATUS_READY
+
+def lazy_model(name):
+    """Mengembalikan LazyModel untuk `name` tanpa memuat modelnya."""
+    if name not in MODEL_BUILDERS:
+        raise KeyError(f"Model tidak dikenal: {name}")
+    return LazyModel(name)
+
+# --- API lama (tetap tersedia): memuat model secara langsung melalui registry ---
+
+def load_sentiment_model():
+    return get_model("sentiment")
+
+def load_summarizer_model():
+    return get_model("summarizer")
+
+def load_ner_model():
+    return get_model("ner")
+
+def load_topic_model():
+    # Tidak lagi di-cache: setiap pemanggilan menghasilkan instance baru (lihat create_topic_model)
+    return create_topic_model()
+
 # Catatan: Relationship Extraction akan lebih kompleks, mungkin membutuhkan model terpisah
-# atau pendekatan berbasis aturan/pola yang lebih canggih. Untuk tahap awal, kita fokus ke NER dan Topic.
\ No newline at end of file
+# atau pendekatan berbasis aturan/pola yang lebih canggih. Untuk tahap awal, kita fokus ke NER dan Topic.
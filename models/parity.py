@@ -0,0 +1,141 @@
+# models/parity.py
+"""
+Pemeriksaan kesetaraan akurasi (accuracy parity) antara backend inferensi.
+
+Menjalankan pipeline sentimen & NER (opsional: peringkas) dengan backend acuan
+(PyTorch full precision) dan backend kandidat pada sampel teks tetap, lalu
+membandingkan label, skor, entitas, dan waktu inferensi.
+
+Contoh:
+    python -m models.parity --backend onnx-int8
+    python -m models.parity --backend torch-int8 --include-summarizer
+"""
+import sys
+import time
+import argparse
+
+from models.backends import build_pipeline, BACKEND_PYTORCH, SUPPORTED_BACKENDS
+from models.loader import SENTIMENT_MODEL_ID, NER_MODEL_ID, SUMMARIZER_MODEL_ID
+
+SAMPLE_TEXTS = [
+    "Presiden Joko Widodo meresmikan Bendungan Sepaku Semoi di Kalimantan Timur. Proyek ini mendukung pasokan air untuk Ibu Kota Nusantara.",
+    "Otorita IKN menyatakan pembangunan istana negara mengalami keterlambatan akibat cuaca buruk dan kendala pasokan material.",
+    "Bank Indonesia menahan suku bunga acuan di level 6 persen untuk menjaga stabilitas nilai tukar rupiah.",
+    "Banjir besar melanda Samarinda, ribuan warga mengungsi dan aktivitas ekonomi lumpuh selama tiga hari.",
+    "Menteri Keuangan Sri Mulyani mengapresiasi kinerja penerimaan pajak yang melampaui target tahun ini.",
+    "KPK menetapkan dua pejabat Kementerian Pekerjaan Umum sebagai tersangka kasus suap proyek jalan tol.",
+    "Timnas Indonesia meraih kemenangan dramatis atas Vietnam di Stadion Utama Gelora Bung Karno.",
+    "Badan Pengelola Keuangan Haji melaporkan dana kelolaan haji tumbuh stabil dengan imbal hasil yang aman.",
+    "Harga beras di Jakarta terus naik, pedagang pasar mengeluhkan turunnya daya beli masyarakat.",
+    "Pemerintah Provinsi Jawa Barat meluncurkan program beasiswa untuk 10 ribu mahasiswa berprestasi.",
+]
+
+
+def _timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def _entity_set(entities):
+    return {(e['word'].strip(), e['entity_group']) for e in entities}
+
+
+def compare_sentiment(reference, candidate, texts):
+    """Membandingkan label & skor sentimen. Mengembalikan dict metrik."""
+    ref_results, ref_time = _timed(reference, texts)
+    cand_results, cand_time = _timed(candidate, texts)
+    agree = sum(r['label'] == c['label'] for r, c in zip(ref_results, cand_results))
+    score_diff = [abs(r['score'] - c['score']) for r, c in zip(ref_results, cand_results)]
+    return {
+        'label_agreement': agree / len(texts),
+        'max_score_diff': max(score_diff),
+        'reference_seconds': ref_time,
+        'candidate_seconds': cand_time,
+    }
+
+
+def compare_ner(reference, candidate, texts):
+    """Membandingkan entitas (kata, tipe) dengan F1 mikro terhadap backend acuan."""
+    ref_results, ref_time = _timed(reference, texts)
+    cand_results, cand_time = _timed(candidate, texts)
+    true_pos = n_ref = n_cand = 0
+    for r, c in zip(ref_results, cand_results):
+        ref_set, cand_set = _entity_set(r), _entity_set(c)
+        true_pos += len(ref_set & cand_set)
+        n_ref += len(ref_set)
+        n_cand += len(cand_set)
+    precision = true_pos / n_cand if n_cand else 1.0
+    recall = true_pos / n_ref if n_ref else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {
+        'entity_f1': f1,
+        'reference_seconds': ref_time,
+        'candidate_seconds': cand_time,
+    }
+
+
+def compare_summarizer(reference, candidate, texts):
+    """Membandingkan ringkasan dengan tumpang-tindih token (unigram F1) rata-rata."""
+    kwargs = dict(max_length=150, min_length=30, do_sample=False)
+    ref_results, ref_time = _timed(reference, texts, **kwargs)
+    cand_results, cand_time = _timed(candidate, texts, **kwargs)
+    scores = []
+    for r, c in zip(ref_results, cand_results):
+        ref_tokens, cand_tokens = set(r['summary_text'].lower().split()), set(c['summary_text'].lower().split())
+        overlap = len(ref_tokens & cand_tokens)
+        if not ref_tokens or not cand_tokens or not overlap:
+            scores.append(0.0)
+            continue
+        precision, recall = overlap / len(cand_tokens), overlap / len(ref_tokens)
+        scores.append(2 * precision * recall / (precision + recall))
+    return {
+        'token_f1': sum(scores) / len(scores),
+        'reference_seconds': ref_time,
+        'candidate_seconds': cand_time,
+    }
+
+
+def run_parity_check(backend, include_summarizer=False, texts=None):
+    """Menjalankan seluruh pemeriksaan untuk `backend`. Mengembalikan dict metrik per model."""
+    texts = texts or SAMPLE_TEXTS
+    report = {}
+    checks = [
+        ("sentiment", "sentiment-analysis", SENTIMENT_MODEL_ID, {}, compare_sentiment),
+        ("ner", "ner", NER_MODEL_ID, {"grouped_entities": True}, compare_ner),
+    ]
+    if include_summarizer:
+        checks.append(("summarizer", "summarization", SUMMARIZER_MODEL_ID, {}, compare_summarizer))
+    for name, task, model_id, kwargs, compare in checks:
+        reference = build_pipeline(task, model_id, backend=BACKEND_PYTORCH, **kwargs)
+        candidate = build_pipeline(task, model_id, backend=backend, **kwargs)
+        metrics = compare(reference, candidate, texts)
+        metrics['backend_used'] = candidate.inference_backend
+        report[name] = metrics
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pemeriksaan parity akurasi backend inferensi.")
+    parser.add_argument("--backend", choices=SUPPORTED_BACKENDS, default="onnx-int8")
+    parser.add_argument("--include-summarizer", action="store_true")
+    parser.add_argument("--min-label-agreement", type=float, default=0.9)
+    parser.add_argument("--min-entity-f1", type=float, default=0.9)
+    args = parser.parse_args(argv)
+
+    report = run_parity_check(args.backend, include_summarizer=args.include_summarizer)
+    for name, metrics in report.items():
+        speedup = metrics['reference_seconds'] / max(metrics['candidate_seconds'], 1e-9)
+        details = ", ".join(f"{k}={v:.3f}" if isinstance(v, float) else f"{k}={v}" for k, v in metrics.items())
+        print(f"[{name}] speedup={speedup:.2f}x | {details}")
+
+    ok = (
+        report['sentiment']['label_agreement'] >= args.min_label_agreement
+        and report['ner']['entity_f1'] >= args.min_entity_f1
+    )
+    print("PARITY OK" if ok else "PARITY GAGAL: akurasi backend kandidat di bawah ambang batas")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
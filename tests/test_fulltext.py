@@ -0,0 +1,138 @@
+# tests/test_fulltext.py
+"""
+Tahap teks lengkap (utils/fulltext.py) diuji offline terhadap http.server lokal yang menyajikan
+halaman fixture (tests/fixtures/fulltext). "127.0.0.1" berperan sebagai situs penerbit dan
+"localhost" sebagai news.google.com (REDIRECT_HOSTS diarahkan ke sana).
+"""
+import base64
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from utils import fulltext
+from utils.news_fetcher import RequestsTransport
+
+FIXTURES = Path(__file__).parent / "fixtures" / "fulltext"
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    publisher = google = None
+    hits = []
+
+    def do_GET(self):
+        self.hits.append((self.headers["Host"].split(":")[0], self.path))
+        path = self.path.split("?")[0]
+        if path == "/artikel/ikn":
+            self._page("publisher_article.html")
+        elif path == "/artikel/consent":
+            self._redirect(f"{self.google}/consent")
+        elif path == "/rss/articles/http-redirect":
+            self._redirect(f"{self.publisher}/artikel/ikn")
+        elif path.startswith("/status/"):
+            self.send_error(int(path.rsplit("/", 1)[1]))
+        elif path in ("/rss/articles/consent", "/consent"):
+            self._page("google_consent.html")
+        elif path.startswith("/rss/articles/"):
+            self._page("google_redirect.html")
+        else:
+            self.send_error(404)
+
+    def _page(self, name):
+        body = (FIXTURES / name).read_text(encoding="utf-8")
+        body = body.replace("{{PUBLISHER}}", self.publisher).replace("{{GOOGLE}}", self.google).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _redirect(self, location):
+        self.send_response(302)
+        self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _FixtureHandler)
+    port = httpd.server_address[1]
+    _FixtureHandler.publisher = f"http://127.0.0.1:{port}"
+    _FixtureHandler.google = f"http://localhost:{port}"
+    _FixtureHandler.hits = []
+    monkeypatch.setattr(fulltext, "REDIRECT_HOSTS", ("localhost",))
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield _FixtureHandler
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "news.db")
+
+
+def _fetch(urls, db_path):
+    return fulltext.fetch_full_texts(urls, transport=RequestsTransport(retries=0), rate=0, db_path=db_path)
+
+
+def test_publisher_page_is_extracted(server, db_path):
+    url = f"{server.publisher}/artikel/ikn"
+    text = _fetch([url], db_path)[url]
+    assert text.startswith("Presiden meresmikan tahap kedua")
+    assert "Otorita IKN" in text
+    assert "Beranda" not in text and "Hak cipta" not in text and "Foto:" not in text
+
+
+def test_google_page_resolves_to_publisher(server, db_path):
+    url = f"{server.google}/rss/articles/AU_yqLnewformat?oc=5"
+    text = _fetch([url], db_path)[url]
+    assert "Ibu Kota Nusantara" in text
+    assert ("127.0.0.1", "/artikel/ikn") in server.hits
+
+
+def test_google_http_redirect_is_followed(server, db_path):
+    url = f"{server.google}/rss/articles/http-redirect"
+    assert "Ibu Kota Nusantara" in _fetch([url], db_path)[url]
+
+
+def test_publisher_url_embedded_in_article_id_skips_google(server, db_path):
+    publisher_url = f"{server.publisher}/artikel/ikn".encode("ascii")
+    token = base64.urlsafe_b64encode(b"\x08\x13\x22" + bytes([len(publisher_url)]) + publisher_url + b"\xd2\x01\x00")
+    url = f"{server.google}/rss/articles/{token.decode().rstrip('=')}?oc=5"
+    assert "Ibu Kota Nusantara" in _fetch([url], db_path)[url]
+    assert not any(host == "localhost" for host, _ in server.hits)
+
+
+@pytest.mark.parametrize("path", ["/rss/articles/consent", None])
+def test_final_google_page_is_a_failed_download(server, db_path, path):
+    url = f"{server.google}{path}" if path else f"{server.publisher}/artikel/consent"
+    assert _fetch([url], db_path) == {}
+    text, error = fulltext.load_cached_fulltext([url], db_path)[url]
+    assert text is None and error.startswith("download:")
+
+    item = {'url': url, 'title': "Judul", 'description': "Deskripsi feed"}
+    assert fulltext.attach_full_texts([item], db_path=db_path) == 0
+    assert 'full_text' not in item
+
+
+def test_results_are_cached(server, db_path):
+    url = f"{server.publisher}/artikel/ikn"
+    first = _fetch([url], db_path)
+    server.hits.clear()
+    assert _fetch([url], db_path) == first
+    assert server.hits == []
+
+
+@pytest.mark.parametrize("status, attempts", [(404, 1), (403, 1), (503, 1 + fulltext.FETCH_RETRIES), (429, 1 + fulltext.FETCH_RETRIES)])
+def test_only_transient_errors_are_retried(server, db_path, monkeypatch, status, attempts):
+    monkeypatch.setattr(fulltext, "RETRY_BACKOFF", 0)
+    url = f"{server.publisher}/status/{status}"
+    assert _fetch([url], db_path) == {}
+    assert [path for _, path in server.hits] == [f"/status/{status}"] * attempts
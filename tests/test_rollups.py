@@ -0,0 +1,75 @@
+# tests/test_rollups.py
+"""
+Rollup harian `sentiment_daily` (utils/storage.py) harus selalu sama dengan hasil `rebuild_rollups`,
+termasuk saat query pemantauan yang tumpang tindih menyimpan artikel yang sama.
+"""
+from contextlib import closing
+
+import pytest
+
+from utils.storage import get_connection, rebuild_rollups, save_analysis_results
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "news.db")
+
+
+def _article(url, label="positif", score=0.9, **extra):
+    return {'url': url, 'title': url, 'clean_text': url, 'published date': "Fri, 06 Jun 2025 05:03:43 GMT",
+            'sentiment': {'label': label, 'score': score}, **extra}
+
+
+def _rollup(db_path):
+    with closing(get_connection(db_path)) as conn:
+        rows = conn.execute("SELECT topic_query, day, n, score_sum FROM sentiment_daily WHERE n > 0").fetchall()
+    return {(r["topic_query"], r["day"]): (r["n"], round(r["score_sum"], 6)) for r in rows}
+
+
+def _assert_matches_rebuild(db_path):
+    incremental = _rollup(db_path)
+    with closing(get_connection(db_path)) as conn:
+        rebuild_rollups(conn)
+        conn.commit()
+    assert incremental == _rollup(db_path)
+
+
+def test_overlapping_queries_count_article_in_each_query(db_path):
+    save_analysis_results([_article("u1"), _article("u2")], "Haji", "mv", db_path=db_path)
+    save_analysis_results([_article("u1")], "Badan Pengelola Keuangan Haji", "mv", db_path=db_path)
+    save_analysis_results([_article("u1"), _article("u2")], "Haji", "mv", db_path=db_path)
+
+    rollup = _rollup(db_path)
+    assert rollup[("Haji", "2025-06-06")] == (2, 1.8)
+    assert rollup[("Badan Pengelola Keuangan Haji", "2025-06-06")] == (1, 0.9)
+    _assert_matches_rebuild(db_path)
+
+
+def test_sentiment_change_updates_every_query(db_path):
+    save_analysis_results([_article("u1")], "A", "mv", db_path=db_path)
+    save_analysis_results([_article("u1")], "B", "mv", db_path=db_path)
+    save_analysis_results([_article("u1", label="negatif", score=0.5)], None, "mv", db_path=db_path)
+
+    rollup = _rollup(db_path)
+    assert rollup[("A", "2025-06-06")] == rollup[("B", "2025-06-06")] == (1, -0.5)
+    _assert_matches_rebuild(db_path)
+
+
+def test_syndicated_duplicates_are_not_counted(db_path):
+    save_analysis_results([_article("u1"), _article("u2", duplicate_of="u1")], "A", "mv", db_path=db_path)
+    assert _rollup(db_path)[("A", "2025-06-06")] == (1, 0.9)
+
+    save_analysis_results([_article("u1"), _article("u2")], "A", "mv", db_path=db_path)
+    assert _rollup(db_path)[("A", "2025-06-06")] == (2, 1.8)
+    _assert_matches_rebuild(db_path)
+
+
+def test_deleting_article_removes_it_from_every_query(db_path):
+    save_analysis_results([_article("u1"), _article("u2")], "A", "mv", db_path=db_path)
+    save_analysis_results([_article("u1")], "B", "mv", db_path=db_path)
+    with closing(get_connection(db_path)) as conn:
+        conn.execute("DELETE FROM articles WHERE url = 'u1'")
+        conn.commit()
+
+    assert _rollup(db_path) == {("A", "2025-06-06"): (1, 0.9)}
+    _assert_matches_rebuild(db_path)
@@ -1,97 +1,297 @@
 # utils/analysis_engine.py
 import pandas as pd
-from datetime import datetime, timedelta
 from collections import Counter
 from wordcloud import WordCloud
-import numpy as np
 import networkx as nx # NEW: Untuk representasi graf
-import re # NEW: Untuk pembersihan teks lebih lanjut di relasi
+from utils.text_processor import split_sentences_with_offsets, assign_entities_to_sentences
+from utils.inference import run_sentiment, run_ner, DEFAULT_BATCH_SIZE, BATCHED_INFERENCE
+from utils.profiling import NULL_PROFILER
+from utils.embedding_store import content_hash
+from utils.topic_service import run_topic_modeling, run_online_topic_modeling, TOPIC_MODE, INCREMENTAL_TOPIC_MODE
+from utils.article_frames import (build_article_frames, sentiment_composition, daily_sentiment_trend,
+                                  entity_sentiment_matrix, cooccurrence_counts)
 
-def analyze_news_data(news_items, sentiment_analyzer, ner_analyzer, topic_model):
+WORDCLOUD_STOPWORDS = set([
+    'yang', 'dan', 'di', 'ke', 'dari', 'dengan', 'untuk', 'pada', 'juga', 'tersebut', 'ini', 'itu',
+    'adalah', 'akan', 'sebagai', 'saat', 'telah', 'bagi', 'kata', 'oleh', 'tidak', 'bisa', 'para',
+    'mereka', 'harus', 'sudah', 'melakukan', 'ada', 'pun', 'tentang', 'serta', 'seperti', 'masih',
+    'maupun', 'dalam', 'antara', 'hingga', 'mengatakan', 'pihak', # Tambahan stopword umum
+    'tahun', 'baru', 'kembali', 'usai', 'melalui', 'mendapatkan', 'hingga', 'selama', 'setelah'
+])
+
+def _new_wordcloud():
+    return WordCloud(
+        width=800, height=400,
+        background_color='black',
+        stopwords=WORDCLOUD_STOPWORDS,
+        collocations=False,
+        colormap='viridis'
+    )
+
+def article_key(article, idx=None):
+    """Kunci unik artikel untuk state analisis (URL, atau posisi jika URL tidak ada)."""
+    return article.get('url') or f"__idx_{idx}"
+
+def new_analysis_state():
     """
-    Melakukan analisis sentimen, NER, topic modeling, dan relationship extraction pada kumpulan berita.
-    Mengembalikan data yang sudah diproses untuk dashboard.
+    State analisis inkremental yang disimpan di session Streamlit.
+    Menyimpan kontribusi per artikel (kunci: URL) beserta frekuensi kata berjalan,
+    sehingga artikel yang sudah dianalisis tidak perlu diproses ulang. Agregat entitas &
+    relasi dihitung ulang secara vektor dari kontribusi (lihat utils/article_frames.py).
+    """
+    return {
+        'articles': {},                  # url -> kontribusi per artikel (lihat _article_contribution)
+        'word_frequencies': Counter(),   # kata -> frekuensi (untuk Word Cloud)
+        'topic_cache': None,             # (frozenset url, hasil topic modeling)
+    }
+
+def signed_sentiment_score(sentiment_result):
+    """Skor bertanda: positif = +score, negatif = -score, netral = 0."""
+    score = sentiment_result['score']
+    if sentiment_result['label'].lower() == 'negatif':
+        score = -score
+    elif sentiment_result['label'].lower() == 'netral':
+        score = 0
+    return score
+
+def _article_contribution(article, wordcloud_tokenizer):
+    """
+    Menghitung kontribusi satu artikel (yang sudah punya `sentiment` & `entities`)
+    terhadap agregat dashboard.
+    """
+    clean_text = article['clean_text'] # Sudah dibersihkan di text_processor
+    sentiment_result = article['sentiment']
+    score = signed_sentiment_score(sentiment_result)
+
+    # Segmentasi kalimat sekali jalan (dengan offset), lalu entitas dipetakan ke kalimat via bisect.
+    # Penyebutan disimpan mentah (sentence_id, teks, jenis); filter & agregasi di utils/article_frames.py
+    sentence_spans = split_sentences_with_offsets(clean_text)
+    entities_by_sentence = assign_entities_to_sentences(sentence_spans, article['entities'])
+    mentions = [
+        (sentence_id, e['word'].strip(), e['entity_group'])
+        for sentence_id, sentence_entities in enumerate(entities_by_sentence)
+        for e in sentence_entities
+    ]
+
+    return {
+        'text_hash': content_hash(clean_text), # sha1: stabil lintas proses & restart (tidak seperti hash())
+        'sentiment': sentiment_result,
+        'entities': article['entities'],
+        'sentiment_row': {'label': sentiment_result['label'], 'date': article['published date'], 'score': score},
+        'mentions': mentions,
+        'word_frequencies': Counter(wordcloud_tokenizer.process_text(clean_text)),
+    }
+
+def new_partial_aggregate():
+    """Agregat parsial (mis. per shard worker) dengan struktur yang sama seperti di state."""
+    return {'word_frequencies': Counter()}
+
+def fold_contribution(aggregate, contribution):
+    """Menambahkan kontribusi satu artikel ke agregat (state atau agregat parsial)."""
+    aggregate['word_frequencies'].update(contribution['word_frequencies'])
+
+def merge_partial_aggregate(state, aggregate):
+    """Menggabungkan agregat parsial (hasil shard) ke agregat di state."""
+    state['word_frequencies'].update(aggregate['word_frequencies'])
+
+def _add_contribution(state, key, contribution):
+    state['articles'][key] = contribution
+    fold_contribution(state, contribution)
+
+def _remove_contribution(state, key):
+    contribution = state['articles'].pop(key)
+    # Counter -= membuang entri yang hasilnya <= 0
+    state['word_frequencies'] -= contribution['word_frequencies']
+
+def _report(progress, stage, done, total):
+    if progress:
+        progress(stage, done, total)
+
+def update_analysis_state(state, news_items, sentiment_analyzer, ner_analyzer,
+                          batch_size=DEFAULT_BATCH_SIZE, batched=BATCHED_INFERENCE, progress=None,
+                          execution_mode=None, profiler=None):
+    """
+    Menyelaraskan state dengan `news_items` berdasarkan URL:
+    artikel yang hilang dikurangkan dari agregat, artikel baru diinferensi dan ditambahkan,
+    dan artikel yang sudah ada cukup memakai ulang hasil sebelumnya.
+    `progress(stage, done, total)` (opsional) menerima kemajuan tahap sentimen, NER, dan agregasi.
+    `execution_mode="process"` membagi artikel baru ke process pool (lihat utils/parallel.py);
+    default diambil dari NEWS_INTEL_EXECUTION_MODE.
+    `profiler` (utils/profiling.py) menerima metrik tahap sentimen, NER, dan agregasi.
+    Mengembalikan jumlah artikel yang baru dianalisis.
+    """
+    from utils.parallel import EXECUTION_MODE, PROCESS_MODE, analyze_in_process_pool
+    execution_mode = execution_mode or EXECUTION_MODE
+    profiler = profiler or NULL_PROFILER
+
+    keys = [article_key(a, i) for i, a in enumerate(news_items)]
+    text_hashes = {k: content_hash(a['clean_text']) for k, a in zip(keys, news_items)}
+    # Artikel yang hilang dari hasil baru, atau yang teksnya berubah, dikeluarkan dari agregat
+    for stale_key in [k for k, c in state['articles'].items() if text_hashes.get(k) != c['text_hash']]:
+        _remove_contribution(state, stale_key)
+
+    # Hanya artikel yang belum ada di state yang perlu dianalisis (URL duplikat cukup sekali)
+    new_idx, seen = [], set()
+    for i, key in enumerate(keys):
+        if key not in state['articles'] and key not in seen:
+            new_idx.append(i)
+        seen.add(key)
+
+    if execution_mode == PROCESS_MODE and new_idx:
+        # Mode multi-proses: setiap worker memakai model miliknya sendiri dan mengembalikan
+        # kontribusi per artikel beserta agregat parsial shard-nya
+        with profiler.stage('process_pool', items=len(new_idx)):
+            contributions, shard_aggregates = analyze_in_process_pool(
+                [news_items[i] for i in new_idx], batch_size=batch_size, batched=batched, progress=progress
+            )
+        for i, contribution in zip(new_idx, contributions):
+            state['articles'][keys[i]] = contribution
+        for aggregate in shard_aggregates:
+            merge_partial_aggregate(state, aggregate)
+        new_idx_local = []
+    else:
+        new_idx_local = new_idx
+
+    # Inferensi batch: clean_text yang belum punya hasil (mis. belum ada di cache DB)
+    # dikirim sekaligus ke pipeline sentimen & NER
+    pending_idx = [i for i in new_idx_local if news_items[i].get('sentiment') is None or news_items[i].get('entities') is None]
+    texts = [news_items[i]['clean_text'] for i in pending_idx]
+    _report(progress, 'sentiment', 0, len(texts))
+    _report(progress, 'ner', 0, len(texts))
+    if texts:
+        with profiler.stage('sentiment', items=len(texts)):
+            sentiment_results = run_sentiment(
+                sentiment_analyzer, texts, batch_size=batch_size, batched=batched,
+                progress=lambda done, total: _report(progress, 'sentiment', done, total),
+            )
+        with profiler.stage('ner', items=len(texts)):
+            ner_results = run_ner(
+                ner_analyzer, texts, batch_size=batch_size, batched=batched,
+                progress=lambda done, total: _report(progress, 'ner', done, total),
+            )
+        for i, sentiment_result, entities in zip(pending_idx, sentiment_results, ner_results):
+            news_items[i]['sentiment'] = sentiment_result
+            news_items[i]['entities'] = entities
+
+    # Segmentasi kalimat & pemetaan entitas ke kalimat per artikel baru
+    with profiler.stage('aggregate', items=len(new_idx_local)):
+        wordcloud_tokenizer = _new_wordcloud()
+        for n, i in enumerate(new_idx_local, start=1):
+            _add_contribution(state, keys[i], _article_contribution(news_items[i], wordcloud_tokenizer))
+            _report(progress, 'aggregate', n, len(new_idx_local))
+    if not new_idx_local:
+        _report(progress, 'aggregate', len(new_idx), len(new_idx))
+
+    # Artikel yang sudah dianalisis sebelumnya: pakai ulang sentimen & entitas dari state
+    for key, article in zip(keys, news_items):
+        article['sentiment'] = state['articles'][key]['sentiment']
+        article['entities'] = state['articles'][key]['entities']
+    return len(new_idx)
+
+def _document_embeddings(documents):
+    """
+    Embedding dokumen untuk BERTopic dari cache (utils/embedding_store.py); hanya dokumen baru
+    yang di-encode. Mengembalikan None jika cache tidak tersedia, sehingga BERTopic menghitung sendiri.
+    """
+    from models.loader import get_model, EMBEDDING_MODEL_ID
+    from utils.embedding_store import get_or_compute_embeddings
+    try:
+        return get_or_compute_embeddings(documents, get_model("embedding"), EMBEDDING_MODEL_ID)
+    except Exception:
+        return None
+
+def _run_topic_modeling(state, news_items, topic_model_factory, processed_data, topic_query=None):
+    """
+    Topic modeling atas seluruh artikel; hasil dipakai ulang bila kumpulan URL tidak berubah.
+    Dalam mode inkremental (NEWS_INTEL_TOPIC_MODE=incremental) dan dengan `topic_query`,
+    artikel ditempatkan ke model topik online milik query tersebut alih-alih melatih model baru.
+    """
+    url_set = frozenset(article_key(a, i) for i, a in enumerate(news_items))
+    cached = state.get('topic_cache')
+    if cached is not None and cached[0] == url_set:
+        topic_result = cached[1]
+    else:
+        topic_result = {'warning': None, 'topics_by_key': {}, 'topic_info_df': pd.DataFrame(), 'topic_keywords': pd.DataFrame()}
+        documents_for_topic_model = [a['clean_text'] for a in news_items]
+        if documents_for_topic_model and len(documents_for_topic_model) > 1: # BERTopic needs at least 2 documents
+            try:
+                embeddings = _document_embeddings(documents_for_topic_model)
+                if TOPIC_MODE == INCREMENTAL_TOPIC_MODE and topic_query:
+                    fitted = run_online_topic_modeling(topic_query, documents_for_topic_model, embeddings=embeddings,
+                                                       model_factory=topic_model_factory)
+                else:
+                    # Model topik baru per permintaan (lihat utils/topic_service.py), bukan objek bersama
+                    fitted = run_topic_modeling(documents_for_topic_model, embeddings=embeddings, model_factory=topic_model_factory)
+                topic_result['topic_info_df'] = fitted['topic_info_df']
+                topic_result['topic_keywords'] = fitted['topic_keywords']
+
+                # Menambahkan topic ke setiap artikel
+                for idx, topic_id in enumerate(fitted['topics']):
+                    if idx < len(news_items): # Ensure index is valid
+                        topic_name = fitted['topic_names'].get(topic_id, "Lain-lain") if topic_id != -1 else "Lain-lain"
+                        topic_result['topics_by_key'][article_key(news_items[idx], idx)] = (topic_id, topic_name)
+
+            except Exception as e:
+                topic_result['warning'] = f"Gagal melakukan Topic Modeling: {e}. Mungkin terlalu sedikit dokumen atau model tidak dapat menemukan topik."
+                topic_result['fallback_name'] = "Gagal Deteksi Topik"
+        else:
+            topic_result['warning'] = "Tidak cukup dokumen untuk melakukan Topic Modeling (minimal 2 artikel)."
+            topic_result['fallback_name'] = "Tidak Ada Topik"
+        state['topic_cache'] = (url_set, topic_result)
+
+    processed_data['topic_info_df'] = topic_result['topic_info_df']
+    processed_data['topic_keywords'] = topic_result['topic_keywords']
+    if topic_result['warning']:
+        processed_data['warnings'].append(topic_result['warning'])
+    for idx, article in enumerate(news_items):
+        topic_id, topic_name = topic_result['topics_by_key'].get(
+            article_key(article, idx), (-1, topic_result.get('fallback_name', "Lain-lain"))
+        )
+        article['topic_id'] = topic_id
+        article['topic_name'] = topic_name
+
+def _add_topics(state, news_items, topic_model_factory, processed_data, progress, topic_query, profiler):
+    _report(progress, 'topics', 0, 1)
+    with profiler.stage('topics', items=len(news_items)):
+        _run_topic_modeling(state, news_items, topic_model_factory, processed_data, topic_query)
+    _report(progress, 'topics', 1, 1)
+
+def with_topics(state, news_items, processed_data, topic_model_factory=None, progress=None, topic_query=None,
+                profiler=None):
+    """
+    Melengkapi hasil `build_processed_data(..., include_topics=False)` dengan topic modeling tanpa
+    menyusun ulang frame, word cloud, dan graf. Mengembalikan salinan; `processed_data` (mis. hasil
+    parsial yang sedang ditampilkan) tidak diubah.
     """
-    all_sentiments_data = []
-    all_text_for_wordcloud = []
-    entity_sentiments = {} # Untuk matriks frekuensi vs sentimen
-    documents_for_topic_model = [] # Untuk BERTopic
-    all_sentences = [] # NEW: Untuk relationship extraction
-    
-    # Store all entities for relationship extraction across all articles
-    # This will be a list of lists of entities per sentence for each article
-    entities_per_sentence_global = [] 
-
-    for article_idx, article in enumerate(news_items):
-        clean_text = article['clean_text'] # Sudah dibersihkan di text_processor
-        
-        # 1. Sentiment Analysis
-        sentiment_result = sentiment_analyzer(clean_text)[0]
-        article['sentiment'] = sentiment_result
-        score = sentiment_result['score']
-        if sentiment_result['label'].lower() == 'negatif':
-            score = -score
-        elif sentiment_result['label'].lower() == 'netral':
-            score = 0
-        all_sentiments_data.append({'label': sentiment_result['label'], 'date': article['published date'], 'score': score})
-        
-        # 2. Named Entity Recognition (NER)
-        entities = ner_analyzer(clean_text)
-        article['entities'] = entities
-        
-        # Process entities for Entity Matrix and Relationship Extraction
-        article_sentences = re.split(r'[.!?]', clean_text) # Split into sentences
-        current_article_entities_per_sentence = []
-
-        for sentence in article_sentences:
-            if not sentence.strip(): continue
-            all_sentences.append(sentence.strip())
-            
-            sentence_entities = []
-            for e in entities:
-                # Check if entity is within the current sentence
-                if e['start'] >= clean_text.find(sentence) and e['end'] <= clean_text.find(sentence) + len(sentence):
-                    word = e['word'].strip()
-                    if len(word) > 2 and not any(c.isdigit() for c in word): # Filter short or numeric entities
-                        if e['entity_group'] in ['PER', 'ORG', 'GPE', 'LOC']: # Consider these for relations
-                            sentence_entities.append({'text': word, 'type': e['entity_group']})
-                        
-                        # Only consider PER (Orang) and ORG (Organisasi) for entity sentiment matrix
-                        if e['entity_group'] in ['PER', 'ORG']:
-                            if word not in entity_sentiments: entity_sentiments[word] = []
-                            entity_sentiments[word].append(score)
-            
-            if sentence_entities:
-                current_article_entities_per_sentence.append(sentence_entities)
-        
-        if current_article_entities_per_sentence:
-            entities_per_sentence_global.append({'article_idx': article_idx, 'sentences_entities': current_article_entities_per_sentence})
-            
-        # 3. Data untuk Topic Modeling
-        documents_for_topic_model.append(clean_text)
-        
-        # 4. Data untuk Word Cloud
-        all_text_for_wordcloud.append(clean_text)
-
-    processed_data = {}
+    processed_data = {**processed_data, 'warnings': list(processed_data.get('warnings', []))}
+    _add_topics(state, news_items, topic_model_factory, processed_data, progress, topic_query,
+                profiler or NULL_PROFILER)
+    return processed_data
+
+def build_processed_data(state, news_items, topic_model_factory=None, include_topics=True, progress=None,
+                         topic_query=None, profiler=None):
+    """
+    Menyusun data dashboard dari agregat di `state` (tanpa inferensi ulang).
+    `topic_model_factory()` membuat model topik baru per permintaan (default: BERTopic dari
+    models/loader.py). Dengan `include_topics=False` topic modeling dilewati (untuk hasil parsial).
+    `topic_query` menentukan model topik online yang dipakai dalam mode inkremental.
+    `profiler` (utils/profiling.py) menerima metrik tiap tahap penyusunan.
+    """
+    profiler = profiler or NULL_PROFILER
+    processed_data = {'warnings': []}
+    keys = list(dict.fromkeys(article_key(a, i) for i, a in enumerate(news_items)))
+    with profiler.stage('frames', items=len(keys)) as stage:
+        articles_df, mentions_df = build_article_frames([(k, state['articles'][k]) for k in keys if k in state['articles']])
+        stage['items'] = len(mentions_df)
+    processed_data['articles_df'] = articles_df
+    processed_data['mentions_df'] = mentions_df
 
     # --- Proses Sentimen ---
-    if all_sentiments_data:
-        sentiment_df = pd.DataFrame(all_sentiments_data)
-        
-        # Komposisi Sentimen
-        sentiment_comp_df = sentiment_df['label'].value_counts().reset_index()
-        sentiment_comp_df.columns = ['Kategori', 'Jumlah']
-        sentiment_comp_df['Persentase'] = (sentiment_comp_df['Jumlah'] / len(sentiment_df) * 100).round(1)
-        processed_data['sentiment_comp_df'] = sentiment_comp_df
-
-        # Tren Sentimen (dengan resampling harian untuk smoothnes)
-        sentiment_df['date'] = pd.to_datetime(sentiment_df['date'], utc=True)
-        # Ambil rata-rata skor sentimen harian
-        sentiment_trend_df = sentiment_df.groupby(sentiment_df['date'].dt.date)['score'].mean().reset_index()
-        sentiment_trend_df.columns = ['date', 'average_score']
-        sentiment_trend_df['date'] = pd.to_datetime(sentiment_trend_df['date']) # Konversi kembali ke datetime
-        sentiment_trend_df = sentiment_trend_df.set_index('date').sort_index()
+    if not articles_df.empty:
+        processed_data['sentiment_comp_df'] = sentiment_composition(articles_df)
+
+        # Tren Sentimen (rata-rata skor sentimen harian)
+        sentiment_trend_df = daily_sentiment_trend(articles_df)
         processed_data['sentiment_trend_df'] = sentiment_trend_df
 
         # NEW: Event Markers
@@ -99,140 +299,69 @@ def analyze_news_data(news_items, sentiment_analyzer, ner_analyzer, topic_model)
         if len(sentiment_trend_df) > 3: # Butuh setidaknya beberapa poin data
             mean_score = sentiment_trend_df['average_score'].mean()
             std_score = sentiment_trend_df['average_score'].std()
-            
+
             # Identify "events" as days where sentiment deviates significantly
             # Using a threshold of 1.5 standard deviations, adjust as needed
-            event_threshold = 1.5 * std_score 
-            
+            event_threshold = 1.5 * std_score
+
             events = sentiment_trend_df[
                 (sentiment_trend_df['average_score'] > mean_score + event_threshold) |
                 (sentiment_trend_df['average_score'] < mean_score - event_threshold)
             ].index.tolist()
-            
+
             processed_data['sentiment_events'] = events
         else:
             processed_data['sentiment_events'] = []
 
 
     # --- Matriks Entitas (Frekuensi vs. Sentimen) ---
-    matrix_data = []
-    for entity, scores in entity_sentiments.items():
-        if len(scores) > 1: # Hanya masukkan entitas yang muncul minimal 2 kali
-            matrix_data.append({
-                'Entitas': entity,
-                'Frekuensi': len(scores),
-                'Avg_Sentiment': np.mean(scores)
-            })
-    processed_data['matrix_df'] = pd.DataFrame(matrix_data) if matrix_data else pd.DataFrame()
+    # Hanya entitas yang muncul minimal 2 kali
+    with profiler.stage('matrix', items=len(mentions_df)):
+        matrix_df = entity_sentiment_matrix(mentions_df)
+    processed_data['matrix_df'] = matrix_df if not matrix_df.empty else pd.DataFrame()
 
     # --- Topic Modeling ---
-    if documents_for_topic_model and len(documents_for_topic_model) > 1: # BERTopic needs at least 2 documents
-        try:
-            topics, probabilities = topic_model.fit_transform(documents_for_topic_model)
-            
-            # Mendapatkan info topik
-            topic_info = topic_model.get_topic_info()
-            topic_info = topic_info[topic_info['Topic'] != -1].copy() # Filter topic -1 (outliers)
-            topic_info.rename(columns={'Name': 'Topik_Utama', 'Count': 'Jumlah_Artikel'}, inplace=True)
-            processed_data['topic_info_df'] = topic_info
-
-            # Menambahkan topic ke setiap artikel
-            for idx, topic_id in enumerate(topics):
-                if idx < len(news_items): # Ensure index is valid
-                    article_info = news_items[idx]
-                    article_info['topic_id'] = topic_id
-                    article_info['topic_name'] = topic_model.get_topic_info(topic_id)['Name'] if topic_id != -1 else "Lain-lain"
-            
-            topic_keywords = []
-            for topic_id in topic_info['Topic']:
-                words = [word for word, score in topic_model.get_topic(topic_id)]
-                topic_keywords.append({'Topic': topic_id, 'Keywords': ", ".join(words[:5])}) # Ambil 5 kata kunci teratas
-            processed_data['topic_keywords'] = pd.DataFrame(topic_keywords)
-
-        except Exception as e:
-            st.warning(f"Gagal melakukan Topic Modeling: {e}. Mungkin terlalu sedikit dokumen atau model tidak dapat menemukan topik.")
-            processed_data['topic_info_df'] = pd.DataFrame() # Ensure dataframe exists even if empty
-            processed_data['topic_keywords'] = pd.DataFrame()
-            for article in news_items: # Clear topic info if topic modeling fails
-                article['topic_id'] = -1
-                article['topic_name'] = "Gagal Deteksi Topik"
+    if include_topics:
+        _add_topics(state, news_items, topic_model_factory, processed_data, progress, topic_query, profiler)
     else:
-        st.warning("Tidak cukup dokumen untuk melakukan Topic Modeling (minimal 2 artikel).")
         processed_data['topic_info_df'] = pd.DataFrame()
         processed_data['topic_keywords'] = pd.DataFrame()
-        for article in news_items:
-                article['topic_id'] = -1
-                article['topic_name'] = "Tidak Ada Topik"
 
     # --- Word Cloud ---
-    if all_text_for_wordcloud:
-        stopwords = set([
-            'yang', 'dan', 'di', 'ke', 'dari', 'dengan', 'untuk', 'pada', 'juga', 'tersebut', 'ini', 'itu',
-            'adalah', 'akan', 'sebagai', 'saat', 'telah', 'bagi', 'kata', 'oleh', 'tidak', 'bisa', 'para',
-            'mereka', 'harus', 'sudah', 'melakukan', 'ada', 'pun', 'tentang', 'serta', 'seperti', 'masih',
-            'maupun', 'dalam', 'antara', 'hingga', 'mengatakan', 'pihak', # Tambahan stopword umum
-            'tahun', 'baru', 'kembali', 'usai', 'melalui', 'mendapatkan', 'hingga', 'selama', 'setelah'
-        ])
-        full_text_concat = " ".join(all_text_for_wordcloud)
-        processed_data['wordcloud'] = WordCloud(
-            width=800, height=400,
-            background_color='black',
-            stopwords=stopwords,
-            collocations=False,
-            colormap='viridis'
-        ).generate(full_text_concat)
-        
+    if state['word_frequencies']:
+        with profiler.stage('wordcloud', items=len(state['word_frequencies'])):
+            processed_data['wordcloud'] = _new_wordcloud().generate_from_frequencies(state['word_frequencies'])
+
     # --- NEW: Relationship Extraction (Heuristic-based) ---
-    G = nx.Graph()
-    relation_counts = Counter()
-
-    for article in news_items:
-        clean_text = article['clean_text']
-        sentences = re.split(r'(?<=[.!?])\s+', clean_text) # Split sentences robustly
-
-        for sentence in sentences:
-            current_sentence_entities = []
-            
-            # Find entities in the current sentence using their 'start' and 'end' positions
-            # This is a bit tricky since NER output is for the whole article.
-            # A more robust approach would be to run NER on each sentence.
-            # For simplicity, we'll re-scan the sentence for the extracted entities.
-            
-            # Filter article's entities that appear in this specific sentence
-            entities_in_sentence = [e for e in article['entities'] if e['word'].strip() in sentence]
-
-            for ent in entities_in_sentence:
-                word = ent['word'].strip()
-                if len(word) > 2 and not any(c.isdigit() for c in word):
-                    current_sentence_entities.append(word)
-
-            # Create connections for co-occurring entities in the same sentence
-            if len(current_sentence_entities) > 1:
-                # Remove duplicates while preserving order for pairs
-                unique_entities = list(dict.fromkeys(current_sentence_entities))
-                for i in range(len(unique_entities)):
-                    for j in range(i + 1, len(unique_entities)):
-                        entity1 = unique_entities[i]
-                        entity2 = unique_entities[j]
-                        
-                        # Ensure entity names are consistent (e.g., lowercased or title cased)
-                        # For simplicity, we'll keep as extracted, but consider normalization if needed.
-                        
-                        # Add node to graph if not exists
-                        G.add_node(entity1)
-                        G.add_node(entity2)
-
-                        # Add edge and count occurrence
-                        pair = tuple(sorted((entity1, entity2)))
-                        relation_counts[pair] += 1
-                        
-    # Add edges with weights to the graph
-    for (e1, e2), count in relation_counts.items():
+    _report(progress, 'graph', 0, 1)
+    with profiler.stage('graph') as stage:
+        relation_df = cooccurrence_counts(mentions_df)
+        G = nx.Graph()
+        G.add_nodes_from(pd.unique(relation_df[['Entitas_1', 'Entitas_2']].to_numpy().ravel()))
         # Only add edges if they appear more than N times (e.g., 1 or 2) to filter noise
-        if count > 1: # Adjust threshold as needed
-            G.add_edge(e1, e2, weight=count)
+        strong = relation_df[relation_df['Frekuensi'] > 1] # Adjust threshold as needed
+        G.add_weighted_edges_from(strong.itertuples(index=False, name=None))
+        stage['items'] = len(relation_df)
 
     processed_data['entity_graph'] = G
-    processed_data['relation_counts'] = relation_counts
-        
-    return processed_data
\ No newline at end of file
+    processed_data['relation_df'] = relation_df
+    _report(progress, 'graph', 1, 1)
+
+    return processed_data
+
+def analyze_news_data(news_items, sentiment_analyzer, ner_analyzer, topic_model_factory=None,
+                      batch_size=DEFAULT_BATCH_SIZE, batched=BATCHED_INFERENCE, state=None, progress=None):
+    """
+    Melakukan analisis sentimen, NER, topic modeling, dan relationship extraction pada kumpulan berita.
+    Inferensi sentimen & NER dijalankan per batch (`batch_size`); set `batched=False`
+    untuk memakai jalur lama per artikel sebagai pembanding. Artikel yang sudah memiliki
+    `sentiment` dan `entities` (hasil cache) tidak diinferensi ulang.
+    Jika `state` (dari `new_analysis_state`) diberikan, hanya artikel baru yang dianalisis
+    dan agregat diperbarui secara inkremental.
+    Mengembalikan data yang sudah diproses untuk dashboard.
+    """
+    if state is None:
+        state = new_analysis_state()
+    update_analysis_state(state, news_items, sentiment_analyzer, ner_analyzer,
+                          batch_size=batch_size, batched=batched, progress=progress)
+    return build_processed_data(state, news_items, topic_model_factory, progress=progress)
@@ -0,0 +1,101 @@
+# utils/archive_search.py
+"""
+Pencarian full-text atas arsip artikel lokal (news_intelligence.db) lewat indeks FTS5.
+
+Indeks `articles_fts` dijaga oleh trigger di utils/storage.py. Hasil diurutkan dengan BM25
+(judul diberi bobot terbesar), bisa difilter rentang `published_ts`, dan membawa snippet
+dengan sorotan kata yang cocok. Artikel dikembalikan dalam format GNews, sehingga dapat
+dianalisis oleh pipeline laporan yang sama tanpa mengakses jaringan; teks lengkap yang
+tersimpan di `article_fulltext` ikut dibawa sebagai `full_text`.
+"""
+import re
+import html
+from datetime import datetime, time, timedelta
+
+from utils.storage import ensure_db, read_connection
+
+# Bobot BM25 per kolom, urutan sama dengan storage.SEARCH_COLUMNS (title, description, clean_text, topic_query)
+BM25_WEIGHTS = (10.0, 4.0, 1.0, 2.0)
+SNIPPET_TOKENS = 24
+# Penanda sorotan sementara; teks di-escape dulu sebelum diganti <mark>
+_HL_START, _HL_END = "\x02", "\x03"
+
+
+def build_fts_query(text):
+    """
+    Mengubah input pengguna menjadi query FTS5 yang aman: setiap kata dikutip dan
+    digabung dengan AND implisit. Mengembalikan string kosong jika tidak ada kata.
+    """
+    tokens = re.findall(r"\w+", text or "", flags=re.UNICODE)
+    return " ".join(f'"{token}"' for token in tokens)
+
+
+def _date_bound(value, end=False):
+    # date -> batas published_ts; batas akhir inklusif sampai akhir hari
+    if value is None:
+        return None
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, time.min)
+        if end:
+            value += timedelta(days=1)
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def highlight_snippet(snippet):
+    """Snippet FTS5 -> HTML aman dengan kata yang cocok dibungkus <mark>."""
+    return html.escape(snippet or "").replace(_HL_START, "<mark>").replace(_HL_END, "</mark>")
+
+
+def search_archive(text, start_date=None, end_date=None, topic_query=None, limit=50, offset=0, db_path=None):
+    """
+    Mencari artikel tersimpan yang cocok dengan `text`, diurutkan berdasarkan BM25.
+    `start_date`/`end_date` (date atau datetime, inklusif) memfilter tanggal publikasi;
+    `topic_query` membatasi ke artikel dari query pemantauan tertentu.
+    Mengembalikan list artikel berformat GNews dengan tambahan 'snippet' (HTML) dan 'search_rank'.
+    """
+    match = build_fts_query(text)
+    if not match:
+        return []
+
+    weights = ", ".join(str(w) for w in BM25_WEIGHTS)
+    sql = f"""
+        SELECT a.title, a.url, a.description, a.published_date, a.publisher, f.text AS full_text,
+               snippet(articles_fts, -1, ?, ?, '…', {SNIPPET_TOKENS}) AS snippet,
+               bm25(articles_fts, {weights}) AS rank
+        FROM articles_fts
+        JOIN articles a ON a.id = articles_fts.rowid
+        LEFT JOIN article_fulltext f ON f.url = a.url
+        WHERE articles_fts MATCH ?
+    """
+    params = [_HL_START, _HL_END, match]
+    start, end = _date_bound(start_date), _date_bound(end_date, end=True)
+    if start:
+        sql += " AND a.published_ts >= ?"
+        params.append(start)
+    if end:
+        sql += " AND a.published_ts < ?"
+        params.append(end)
+    if topic_query:
+        sql += " AND a.id IN (SELECT article_id FROM article_queries WHERE topic_query = ?)"
+        params.append(topic_query)
+    sql += " ORDER BY rank LIMIT ? OFFSET ?"
+    params.extend([limit, offset])
+
+    ensure_db(db_path)
+    with read_connection(db_path) as conn:
+        rows = conn.execute(sql, params).fetchall()
+    return [
+        {
+            'title': row["title"],
+            'description': row["description"],
+            # Teks lengkap yang dulu dianalisis (bila ada), agar clean_text sama dengan yang tersimpan
+            # dan hasil analisis di cache tetap terpakai
+            'full_text': row["full_text"],
+            'published date': row["published_date"],
+            'url': row["url"],
+            'publisher': {'title': row["publisher"]},
+            'snippet': highlight_snippet(row["snippet"]),
+            'search_rank': row["rank"],
+        }
+        for row in rows
+    ]
@@ -0,0 +1,112 @@
+# utils/article_frames.py
+"""
+Tabel kolumnar hasil analisis dan agregat dashboard yang dihitung secara vektor (pandas/NumPy).
+
+- articles_df : satu baris per artikel (article_id, url, label, date, score)
+- mentions_df : satu baris per penyebutan entitas (article_id, sentence_id, entity, type, score)
+
+Frame dibangun dari artikel perwakilan cluster hampir-duplikat saja (utils/dedup.py), jadi
+agregat di sini menghitung satu cerita sindikasi satu kali, tanpa bobot `cluster_size`.
+
+`entity`, `type`, dan `label` bertipe categorical, sehingga groupby & self-join bekerja pada kode
+integer, bukan string. Kategori entitas terurut alfabetis, jadi pasangan ko-okurensi
+(kode_1 < kode_2) sama dengan pasangan string yang diurutkan.
+"""
+import numpy as np
+import pandas as pd
+
+MIN_ENTITY_CHARS = 3
+MATRIX_ENTITY_TYPES = ('PER', 'ORG') # Hanya Orang & Organisasi di matriks frekuensi vs sentimen
+MATRIX_MIN_MENTIONS = 2
+
+
+def build_article_frames(contributions):
+    """
+    Menyusun (articles_df, mentions_df) dari kontribusi per artikel (lihat
+    analysis_engine._article_contribution). Penyebutan entitas pendek atau berisi angka dibuang.
+    """
+    urls, labels, dates, scores = [], [], [], []
+    mention_articles, mention_sentences, mention_entities, mention_types = [], [], [], []
+    for article_id, (url, contribution) in enumerate(contributions):
+        row = contribution['sentiment_row']
+        urls.append(url)
+        labels.append(row['label'])
+        dates.append(row['date'])
+        scores.append(row['score'])
+        mentions = contribution['mentions']
+        if mentions:
+            sentence_ids, entities, types = zip(*mentions)
+            mention_articles.extend([article_id] * len(mentions))
+            mention_sentences.extend(sentence_ids)
+            mention_entities.extend(entities)
+            mention_types.extend(types)
+
+    scores = np.asarray(scores, dtype=float)
+    articles_df = pd.DataFrame({
+        'article_id': np.arange(len(urls), dtype=np.int32),
+        'url': urls,
+        'label': pd.Categorical(labels),
+        'date': pd.to_datetime(pd.Series(dates, dtype=object), utc=True),
+        'score': scores,
+    })
+
+    entities = pd.Series(mention_entities, dtype=object)
+    keep = (entities.str.len() >= MIN_ENTITY_CHARS) & ~entities.str.contains(r'\d', regex=True)
+    keep = keep.to_numpy(dtype=bool)
+    mention_articles = np.asarray(mention_articles, dtype=np.int32)[keep]
+    mentions_df = pd.DataFrame({
+        'article_id': mention_articles,
+        'sentence_id': np.asarray(mention_sentences, dtype=np.int32)[keep],
+        'entity': pd.Categorical(entities[keep]),
+        'type': pd.Categorical(np.asarray(mention_types, dtype=object)[keep]),
+        'score': scores[mention_articles] if len(mention_articles) else np.empty(0),
+    })
+    return articles_df, mentions_df
+
+
+def sentiment_composition(articles_df):
+    """Jumlah & persentase artikel per label sentimen (kolom Kategori, Jumlah, Persentase)."""
+    counts = articles_df['label'].value_counts()
+    counts = counts[counts > 0]
+    composition = pd.DataFrame({'Kategori': counts.index.astype(str), 'Jumlah': counts.to_numpy()})
+    composition['Persentase'] = (composition['Jumlah'] / len(articles_df) * 100).round(1)
+    return composition
+
+
+def daily_sentiment_trend(articles_df):
+    """Rata-rata skor sentimen harian (indeks `date` per hari UTC, kolom `average_score`)."""
+    day = articles_df['date'].dt.floor('D').dt.tz_localize(None).rename('date')
+    trend = articles_df['score'].groupby(day).mean().to_frame('average_score')
+    return trend.sort_index()
+
+
+def entity_sentiment_matrix(mentions_df, min_mentions=MATRIX_MIN_MENTIONS):
+    """Frekuensi penyebutan & rata-rata sentimen artikel per entitas Orang/Organisasi."""
+    people = mentions_df[mentions_df['type'].isin(MATRIX_ENTITY_TYPES)]
+    stats = people.groupby('entity', observed=True)['score'].agg(['size', 'mean'])
+    stats = stats[stats['size'] >= min_mentions]
+    return pd.DataFrame({
+        'Entitas': stats.index.astype(str),
+        'Frekuensi': stats['size'].to_numpy(),
+        'Avg_Sentiment': stats['mean'].to_numpy(),
+    })
+
+
+def cooccurrence_counts(mentions_df):
+    """
+    Jumlah kalimat tempat dua entitas muncul bersama (kolom Entitas_1, Entitas_2, Frekuensi),
+    lewat self-join penyebutan unik per (article_id, sentence_id).
+    """
+    unique = mentions_df[['article_id', 'sentence_id', 'entity']].drop_duplicates()
+    # Kalimat dengan satu entitas tidak menghasilkan pasangan; buang sebelum join
+    per_sentence = unique.groupby(['article_id', 'sentence_id'])['entity'].transform('size')
+    unique = unique[per_sentence > 1]
+    pairs = unique.merge(unique, on=['article_id', 'sentence_id'], suffixes=('_1', '_2'))
+    pairs = pairs[pairs['entity_1'].cat.codes < pairs['entity_2'].cat.codes]
+    counts = pairs.groupby(['entity_1', 'entity_2'], observed=True).size()
+    relation_df = pd.DataFrame({
+        'Entitas_1': counts.index.get_level_values(0).astype(str),
+        'Entitas_2': counts.index.get_level_values(1).astype(str),
+        'Frekuensi': counts.to_numpy(),
+    })
+    return relation_df.sort_values('Frekuensi', ascending=False, kind='stable').reset_index(drop=True)
@@ -0,0 +1,152 @@
+# utils/chunking.py
+"""
+Pemotongan dokumen panjang menjadi jendela geser (sliding window) untuk sentimen & NER.
+
+Model transformers hanya menerima ~512 token, sedangkan teks lengkap artikel jauh lebih panjang.
+Jendela dihitung dari tokenizer pipeline (fast tokenizer, offset mapping) dengan overlap
+`NEWS_INTEL_CHUNK_STRIDE` token; tanpa fast tokenizer dipakai jendela per kalimat berbasis karakter.
+Setiap jendela "memiliki" wilayah dokumen sampai titik tengah overlap dengan jendela berikutnya:
+entitas dari jendela hanya diambil di wilayahnya (konteks kiri-kanan utuh), lalu entitas yang
+terpotong di batas jendela digabung. Sentimen dokumen = gabungan sentimen jendela, ditimbang
+dengan panjang wilayahnya.
+"""
+import os
+import threading
+
+from utils.text_processor import split_sentences_with_offsets
+
+MODEL_MAX_TOKENS = 512
+CHUNK_STRIDE = int(os.getenv("NEWS_INTEL_CHUNK_STRIDE", "64")) # token overlap antar jendela
+MAX_CHUNK_CHARS = int(os.getenv("NEWS_INTEL_MAX_CHUNK_CHARS", "1500")) # jendela karakter (tanpa fast tokenizer)
+
+# Fast tokenizer (Rust) menolak dipanggil bersamaan saat setelan truncation-nya diubah
+_tokenizer_lock = threading.Lock()
+
+
+def char_windows(text, max_chars=MAX_CHUNK_CHARS):
+    """
+    Jendela (start, end) tanpa overlap sepanjang <= `max_chars` karakter di batas kalimat.
+    Kalimat yang lebih panjang dari `max_chars` dipotong di spasi terakhir sebelum batas.
+    """
+    if len(text) <= max_chars:
+        return [(0, len(text))]
+    spans = []
+    for start, end in split_sentences_with_offsets(text):
+        # Sertakan tanda baca penutup kalimat
+        while end < len(text) and text[end] in '.!?':
+            end += 1
+        while end - start > max_chars:
+            cut = text.rfind(' ', start + 1, start + max_chars + 1)
+            cut = cut if cut > start else start + max_chars
+            spans.append((start, cut))
+            start = cut
+            while start < end and text[start].isspace():
+                start += 1
+        if start >= end:
+            continue
+        if spans and end - spans[-1][0] <= max_chars:
+            spans[-1] = (spans[-1][0], end)
+        else:
+            spans.append((start, end))
+    return spans or [(0, len(text))]
+
+
+def _window_tokens(tokenizer, max_tokens=None):
+    # model_max_length bisa berupa nilai sentinel raksasa bila tidak diset di konfigurasi model
+    limit = min(max_tokens or getattr(tokenizer, 'model_max_length', MODEL_MAX_TOKENS), MODEL_MAX_TOKENS)
+    return limit - tokenizer.num_special_tokens_to_add(pair=False)
+
+
+def token_windows(tokenizer, text, max_tokens=None, stride=CHUNK_STRIDE):
+    """
+    Jendela (start, end) dalam koordinat karakter, masing-masing <= `max_tokens` token
+    (termasuk token spesial) dengan overlap `stride` token antar jendela berurutan.
+    """
+    window = _window_tokens(tokenizer, max_tokens)
+    # Setiap token mencakup minimal satu karakter: teks sependek ini pasti muat satu jendela
+    if len(text) <= window:
+        return [(0, len(text))]
+    with _tokenizer_lock:
+        encoding = tokenizer(
+            text, add_special_tokens=False, truncation=True, max_length=window,
+            stride=min(stride, window // 2), return_overflowing_tokens=True, return_offsets_mapping=True,
+        )
+    spans = []
+    for offsets in encoding['offset_mapping']:
+        offsets = [(start, end) for start, end in offsets if end > start]
+        if offsets:
+            spans.append((offsets[0][0], offsets[-1][1]))
+    return spans or [(0, len(text))]
+
+
+def document_windows(text, tokenizer=None, max_tokens=None, stride=CHUNK_STRIDE, max_chars=MAX_CHUNK_CHARS):
+    """Jendela untuk `text`: berbasis token bila `tokenizer` adalah fast tokenizer, selain itu berbasis karakter."""
+    if tokenizer is not None and getattr(tokenizer, 'is_fast', False):
+        return token_windows(tokenizer, text, max_tokens, stride)
+    return char_windows(text, max_chars)
+
+
+def window_ownership(windows):
+    """Wilayah (start, end) milik setiap jendela: batas di titik tengah overlap dengan jendela tetangga."""
+    cuts = []
+    for (_, end), (next_start, _) in zip(windows, windows[1:]):
+        cuts.append((next_start + end) // 2 if next_start < end else next_start)
+    starts = [windows[0][0]] + cuts
+    ends = cuts + [windows[-1][1]]
+    return list(zip(starts, ends))
+
+
+def merge_chunk_entities(text, windows, chunk_entities):
+    """
+    Menggabungkan entitas NER per jendela menjadi entitas dokumen: offset dipindah ke koordinat
+    dokumen, entitas di luar wilayah jendelanya dibuang, lalu entitas tumpang tindih atau yang
+    terpotong di batas jendela (jenis sama, hanya dipisah spasi) disatukan.
+    """
+    owned = window_ownership(windows)
+    entities = []
+    for (offset, _), (own_start, own_end), found in zip(windows, owned, chunk_entities):
+        for entity in found:
+            entity = dict(entity)
+            entity['start'] += offset
+            entity['end'] += offset
+            if own_start <= entity['start'] < own_end:
+                entities.append(entity)
+    if len(windows) == 1:
+        return entities
+
+    cuts = {start for start, _ in owned[1:]}
+    merged = []
+    for entity in sorted(entities, key=lambda e: (e['start'], -e['end'])):
+        previous = merged[-1] if merged else None
+        if previous is not None and entity['start'] < previous['end']:
+            # Tumpang tindih: jenis sama disatukan, jenis berbeda diambil skor tertinggi
+            if entity['entity_group'] == previous['entity_group']:
+                previous['end'] = max(previous['end'], entity['end'])
+            elif entity.get('score', 0) > previous.get('score', 0):
+                merged[-1] = entity
+            continue
+        if (previous is not None and entity['entity_group'] == previous['entity_group']
+                and not text[previous['end']:entity['start']].strip()
+                and any(previous['end'] <= cut <= entity['start'] for cut in cuts)):
+            previous['end'] = entity['end']
+            previous['score'] = (float(previous.get('score', 0)) + float(entity.get('score', 0))) / 2
+            continue
+        merged.append(entity)
+    for entity in merged:
+        entity['word'] = text[entity['start']:entity['end']]
+    return merged
+
+
+def merge_chunk_sentiment(windows, chunk_results):
+    """
+    Sentimen dokumen dari sentimen per jendela: label dengan total (skor x panjang wilayah)
+    terbesar, dengan skor rata-rata tertimbang jendela berlabel tersebut.
+    """
+    totals, lengths = {}, {}
+    for (start, end), result in zip(window_ownership(windows), chunk_results):
+        weight = max(end - start, 1)
+        label = result['label']
+        totals[label] = totals.get(label, 0.0) + float(result['score']) * weight
+        lengths[label] = lengths.get(label, 0) + weight
+    label = max(totals, key=totals.get)
+    return {'label': label, 'score': totals[label] / lengths[label]}
@@ -0,0 +1,176 @@
+# utils/db.py
+"""
+Akses SQLite news_intelligence.db untuk banyak sesi Streamlit + worker sekaligus.
+
+- Semua koneksi memakai mode WAL (pembaca tidak memblokir penulis dan sebaliknya) dengan
+  synchronous=NORMAL dan busy timeout; NEWS_INTEL_DB_WAL=0 mematikan WAL (mis. di network drive).
+- Penulisan ke tabel artikel dikirim ke satu thread penulis per file DB (`run_write`). Penulisan
+  yang tiba bersamaan digabung dalam satu transaksi (group commit); masing-masing dibungkus
+  SAVEPOINT sehingga kegagalan satu penulisan tidak membatalkan yang lain.
+- Pembacaan memakai koneksi read-only dari pool (`read_connection`).
+"""
+import os
+import queue
+import sqlite3
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+from concurrent.futures import Future
+
+DB_PATH = os.getenv("NEWS_INTEL_DB_PATH", "news_intelligence.db")
+WAL_ENABLED = os.getenv("NEWS_INTEL_DB_WAL", "1") != "0"
+BUSY_TIMEOUT = 30 # detik
+READ_POOL_SIZE = int(os.getenv("NEWS_INTEL_DB_READ_POOL", "8"))
+WRITE_BATCH_MAX = 64 # penulisan maksimum per transaksi
+CACHE_SIZE_KB = 16000
+
+_wal_paths = set()
+_wal_lock = threading.Lock()
+
+
+def _configure(conn):
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA synchronous = NORMAL" if WAL_ENABLED else "PRAGMA synchronous = FULL")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KB}")
+    return conn
+
+
+def _enable_wal(conn, db_path):
+    # journal_mode=WAL tersimpan di file DB, cukup sekali per path per proses
+    key = os.path.abspath(db_path)
+    if not WAL_ENABLED or key in _wal_paths:
+        return
+    with _wal_lock:
+        if key in _wal_paths:
+            return
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+            _wal_paths.add(key)
+        except sqlite3.OperationalError:
+            pass # DB sedang dikunci proses lain; dicoba lagi pada koneksi berikutnya
+
+
+def get_connection(db_path=None, isolation_level=""):
+    """Membuka koneksi SQLite baru (WAL, row_factory sqlite3.Row)."""
+    db_path = db_path or DB_PATH
+    conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT, isolation_level=isolation_level)
+    _enable_wal(conn, db_path)
+    return _configure(conn)
+
+
+class DatabaseWriter:
+    """Satu thread penulis untuk satu file DB. `submit(fn)` -> Future hasil `fn(conn)`."""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, fn):
+        """
+        Menjadwalkan `fn(conn)` di thread penulis. `fn` tidak boleh commit/rollback sendiri:
+        transaksi dikelola penulis. Mengembalikan Future berisi nilai kembalian `fn`; jangan
+        kembalikan cursor (cursor yang dibebaskan di thread lain bentrok dengan thread penulis).
+        """
+        future = Future()
+        self._queue.put((fn, future))
+        return future
+
+    def _run(self):
+        # Autocommit di level driver; BEGIN/SAVEPOINT/COMMIT dikirim eksplisit
+        conn = get_connection(self.db_path, isolation_level=None)
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < WRITE_BATCH_MAX:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write_batch(conn, batch)
+            except Exception as e: # koneksi bermasalah: gagalkan sisa batch, lanjut dengan koneksi baru
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                conn.close()
+                conn = get_connection(self.db_path, isolation_level=None)
+
+    def _write_batch(self, conn, batch):
+        conn.execute("BEGIN IMMEDIATE")
+        outcomes = []
+        for fn, future in batch:
+            conn.execute("SAVEPOINT write_job")
+            try:
+                value = fn(conn)
+            except Exception as e:
+                conn.execute("ROLLBACK TO write_job")
+                conn.execute("RELEASE write_job")
+                outcomes.append((future, None, e))
+            else:
+                conn.execute("RELEASE write_job")
+                outcomes.append((future, value, None))
+        try:
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        for future, value, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(value)
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer(db_path=None):
+    """Thread penulis bersama (per proses) untuk `db_path`."""
+    key = os.path.abspath(db_path or DB_PATH)
+    with _writers_lock:
+        if key not in _writers:
+            _writers[key] = DatabaseWriter(key)
+        return _writers[key]
+
+
+def run_write(fn, db_path=None):
+    """Menjalankan `fn(conn)` di thread penulis dan menunggu transaksinya di-commit."""
+    return get_writer(db_path).submit(fn).result()
+
+
+_read_pools = {}
+_read_pools_lock = threading.Lock()
+
+
+def _open_read_only(db_path):
+    conn = sqlite3.connect(Path(db_path).resolve().as_uri() + "?mode=ro", uri=True,
+                           timeout=BUSY_TIMEOUT, check_same_thread=False)
+    return _configure(conn)
+
+
+@contextmanager
+def read_connection(db_path=None):
+    """
+    Koneksi read-only dari pool untuk `db_path` (file DB harus sudah ada). Koneksi dipakai
+    satu thread dalam satu waktu lalu dikembalikan ke pool; kelebihan dari READ_POOL_SIZE ditutup.
+    """
+    key = os.path.abspath(db_path or DB_PATH)
+    with _read_pools_lock:
+        pool = _read_pools.setdefault(key, queue.LifoQueue(maxsize=READ_POOL_SIZE))
+    try:
+        conn = pool.get_nowait()
+    except queue.Empty:
+        conn = _open_read_only(key)
+    try:
+        yield conn
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
@@ -0,0 +1,132 @@
+# utils/dedup.py
+"""
+Penggabungan berita hampir-duplikat (salinan sindikasi lintas media) sebelum inferensi.
+
+clean_text setiap artikel (tanpa nama media) dipecah menjadi shingle karakter, diringkas
+menjadi signature MinHash, lalu dikelompokkan dengan LSH (banding). Pasangan kandidat
+dari bucket yang sama diverifikasi dengan estimasi Jaccard >= NEWS_INTEL_DEDUP_THRESHOLD.
+Hanya satu artikel perwakilan per cluster yang dianalisis; hasilnya disalin ke artikel
+salinan, dan perwakilan membawa `cluster_size` (jumlah media yang memuat berita tersebut).
+
+Setiap cluster sengaja dihitung satu kali di agregat (komposisi, tren, matriks entitas, event,
+rollup `sentiment_daily`): salinan sindikasi tidak menambah bobot satu cerita. `cluster_size`
+hanya untuk tampilan (urutan & keterangan di dashboard_sections/article_details.py).
+"""
+import os
+import re
+import zlib
+from collections import defaultdict
+
+import numpy as np
+
+DEDUP_ENABLED = os.getenv("NEWS_INTEL_DEDUP", "1") != "0"
+DEDUP_THRESHOLD = float(os.getenv("NEWS_INTEL_DEDUP_THRESHOLD", "0.7"))
+SHINGLE_SIZE = 5 # karakter
+NUM_PERM = 64
+LSH_BANDS = 16 # 16 band x 4 baris: pasangan dengan Jaccard ~0.5 ke atas mulai menjadi kandidat
+
+# Field hasil analisis yang disalin dari perwakilan ke salinannya
+PROPAGATED_FIELDS = ('sentiment', 'entities', 'topic_id', 'topic_name', 'summary', 'summary_key', 'summary_error')
+
+# Permutasi h(x) = (a * x + b) mod p dengan p = 2^31 - 1: x, a, b < p sehingga a * x + b
+# muat di uint64, dan modulus benar-benar mengacak urutan (bukan fungsi monoton dari x)
+_MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, (1 << 31) - 1, size=NUM_PERM).astype(np.uint64)
+_PERM_B = _rng.randint(0, (1 << 31) - 1, size=NUM_PERM).astype(np.uint64)
+
+
+def _normalized_text(article):
+    """clean_text huruf kecil tanpa nama media (salinan sindikasi berbeda di bagian itu saja)."""
+    text = (article.get('clean_text') or '').lower()
+    publisher = article.get('publisher') or {}
+    publisher = publisher.get('title') if isinstance(publisher, dict) else publisher
+    if publisher:
+        text = text.replace(publisher.lower(), ' ')
+    return ' '.join(re.findall(r'\w+', text))
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Himpunan shingle karakter berukuran `size` dari teks yang sudah dinormalisasi."""
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def minhash_signature(shingle_set):
+    """Signature MinHash (NUM_PERM nilai uint64) dari himpunan shingle."""
+    if not shingle_set:
+        return np.full(NUM_PERM, _MERSENNE_PRIME, dtype=np.uint64)
+    hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingle_set), dtype=np.uint64, count=len(shingle_set))
+    hashes %= _MERSENNE_PRIME
+    return ((hashes[:, None] * _PERM_A + _PERM_B) % _MERSENNE_PRIME).min(axis=0)
+
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def cluster_near_duplicates(news_items, threshold=DEDUP_THRESHOLD):
+    """
+    Mengelompokkan artikel hampir-duplikat. Mengembalikan list cluster (list indeks artikel),
+    masing-masing terurut sesuai urutan `news_items`; indeks pertama adalah perwakilannya.
+    """
+    signatures = [minhash_signature(shingles(_normalized_text(a))) for a in news_items]
+    rows_per_band = NUM_PERM // LSH_BANDS
+    buckets = defaultdict(list)
+    for idx, signature in enumerate(signatures):
+        if not news_items[idx].get('clean_text'):
+            continue
+        for band in range(LSH_BANDS):
+            buckets[(band, signature[band * rows_per_band:(band + 1) * rows_per_band].tobytes())].append(idx)
+
+    parent = list(range(len(news_items)))
+    checked = set()
+    for members in buckets.values():
+        for pos, i in enumerate(members):
+            for j in members[pos + 1:]:
+                if (i, j) in checked:
+                    continue
+                checked.add((i, j))
+                if _find(parent, i) != _find(parent, j) and np.mean(signatures[i] == signatures[j]) >= threshold:
+                    root_i, root_j = _find(parent, i), _find(parent, j)
+                    # Akar = indeks terkecil, sehingga perwakilan adalah artikel yang muncul pertama
+                    parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    clusters = defaultdict(list)
+    for idx in range(len(news_items)):
+        clusters[_find(parent, idx)].append(idx)
+    return sorted(clusters.values(), key=lambda members: members[0])
+
+
+def collapse_near_duplicates(news_items, threshold=DEDUP_THRESHOLD):
+    """
+    Menandai cluster hampir-duplikat pada `news_items` dan mengembalikan artikel perwakilan.
+    Perwakilan mendapat `cluster_size`; salinan mendapat `duplicate_of` (URL perwakilan)
+    dan `cluster_size` yang sama.
+    """
+    representatives = []
+    for members in cluster_near_duplicates(news_items, threshold):
+        representative = news_items[members[0]]
+        representative['cluster_size'] = len(members)
+        representative.pop('duplicate_of', None)
+        for idx in members[1:]:
+            news_items[idx]['duplicate_of'] = representative.get('url')
+            news_items[idx]['cluster_size'] = len(members)
+        representatives.append(representative)
+    return representatives
+
+
+def propagate_cluster_results(news_items):
+    """Menyalin hasil analisis perwakilan ke setiap salinannya (berdasarkan `duplicate_of`)."""
+    by_url = {a.get('url'): a for a in news_items if not a.get('duplicate_of')}
+    for article in news_items:
+        representative = by_url.get(article.get('duplicate_of'))
+        if representative is None:
+            continue
+        for field in PROPAGATED_FIELDS:
+            if field in representative:
+                article[field] = representative[field]
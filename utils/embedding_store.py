@@ -0,0 +1,79 @@
+# utils/embedding_store.py
+"""
+Penyimpanan embedding dokumen (sentence-transformer) di news_intelligence.db.
+
+Embedding disimpan sebagai BLOB float32 dengan kunci (hash konten, nama model),
+sehingga artikel yang muncul lagi di laporan lain tidak perlu di-embed ulang
+sebelum topic modeling.
+"""
+import hashlib
+
+import numpy as np
+
+from utils.storage import ensure_db, read_connection, run_write
+
+
+def content_hash(text):
+    """Hash SHA-1 dari teks dokumen (kunci cache embedding)."""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def load_embeddings(hashes, model_name, db_path=None):
+    """Mengambil embedding tersimpan. Mengembalikan dict hash -> np.ndarray float32."""
+    hashes = list(dict.fromkeys(hashes))
+    found = {}
+    if not hashes:
+        return found
+    ensure_db(db_path) # Tabel document_embeddings dibuat oleh init_db (utils/storage.py)
+    with read_connection(db_path) as conn:
+        for i in range(0, len(hashes), 500):
+            chunk = hashes[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT content_hash, dim, vector FROM document_embeddings "
+                f"WHERE model_name = ? AND content_hash IN ({placeholders})",
+                [model_name, *chunk],
+            ).fetchall()
+            for row in rows:
+                found[row["content_hash"]] = np.frombuffer(row["vector"], dtype=np.float32, count=row["dim"])
+    return found
+
+
+def save_embeddings(vectors_by_hash, model_name, db_path=None):
+    """Menyimpan embedding (dict hash -> vektor) sebagai BLOB float32."""
+    rows = [
+        (h, model_name, int(v.shape[0]), np.ascontiguousarray(v, dtype=np.float32).tobytes())
+        for h, v in vectors_by_hash.items()
+    ]
+    if not rows:
+        return 0
+    ensure_db(db_path)
+    run_write(lambda conn: conn.executemany(
+        "INSERT OR REPLACE INTO document_embeddings (content_hash, model_name, dim, vector) VALUES (?, ?, ?, ?)",
+        rows,
+    ).rowcount, db_path)
+    return len(rows)
+
+
+def get_or_compute_embeddings(documents, embedding_model, model_name, batch_size=32, db_path=None):
+    """
+    Mengembalikan matriks embedding float32 (n_dokumen x dim) untuk `documents`.
+    Hanya dokumen yang belum ada di cache yang di-encode, lalu hasilnya disimpan.
+    """
+    hashes = [content_hash(doc) for doc in documents]
+    cached = load_embeddings(hashes, model_name, db_path)
+
+    missing = list(dict.fromkeys(h for h in hashes if h not in cached))
+    if missing:
+        doc_by_hash = dict(zip(hashes, documents))
+        encoded = embedding_model.encode(
+            [doc_by_hash[h] for h in missing],
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        ).astype(np.float32)
+        new_vectors = dict(zip(missing, encoded))
+        save_embeddings(new_vectors, model_name, db_path)
+        cached.update(new_vectors)
+
+    return np.vstack([cached[h] for h in hashes])
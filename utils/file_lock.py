@@ -0,0 +1,54 @@
+# utils/file_lock.py
+"""
+Kunci file lintas proses untuk state di disk yang ditulis oleh dashboard Streamlit dan
+worker headless sekaligus (model topik online, indeks vektor). Lock threading hanya berlaku
+di dalam satu proses; kunci ini memakai fcntl.flock (POSIX) atau msvcrt.locking (Windows).
+"""
+import time
+from pathlib import Path
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError: # Windows
+    fcntl = None
+    import msvcrt
+
+WINDOWS_RETRY_INTERVAL = 0.1 # detik
+
+
+def _lock(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        return
+    while True:
+        try:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            return
+        except OSError:
+            time.sleep(WINDOWS_RETRY_INTERVAL)
+
+
+def _unlock(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def file_lock(path):
+    """
+    Kunci eksklusif atas file `path` (dibuat bila belum ada), menunggu sampai tersedia.
+    Tidak re-entrant: jangan mengunci file yang sama dua kali dari satu thread.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as f:
+        _lock(f)
+        try:
+            yield
+        finally:
+            _unlock(f)
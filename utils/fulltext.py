@@ -0,0 +1,286 @@
+# utils/fulltext.py
+"""
+Tahap opsional pengambilan teks lengkap artikel (NEWS_INTEL_FULLTEXT=1).
+
+Halaman artikel diunduh secara konkuren lewat transport HTTP yang di-pool (sama seperti
+utils/news_fetcher.py), dengan batas laju per host, timeout, dan retry dengan backoff.
+Teks isi artikel diekstrak dengan lxml, lalu HTML mentah (terkompresi) dan teks hasil
+ekstraksi di-cache di tabel `article_fulltext` (kunci: URL) di news_intelligence.db;
+arsip lokal (utils/archive_search.py, utils/vector_index.py) ikut membaca teksnya.
+Artikel yang gagal diunduh/diekstrak tetap dianalisis dari judul + deskripsi GNews.
+
+Tautan feed Google News (news.google.com/rss/articles/...) bukan halaman penerbit, jadi
+lebih dulu diarahkan ke URL penerbit (`resolve_publisher_url`); halaman yang tetap berakhir
+di Google (interstisial, consent) dianggap gagal diunduh, bukan diekstrak sebagai artikel.
+
+Transport dapat diganti (parameter `transport`), sehingga tahap ini bisa diuji offline
+terhadap server HTTP lokal yang menyajikan halaman fixture (tests/test_fulltext.py).
+"""
+import os
+import re
+import time
+import zlib
+import base64
+import binascii
+import threading
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+from utils.storage import ensure_db, read_connection, run_write
+from utils.news_fetcher import get_default_transport
+
+FULLTEXT_ENABLED = os.getenv("NEWS_INTEL_FULLTEXT", "0") == "1"
+FULLTEXT_WORKERS = int(os.getenv("NEWS_INTEL_FULLTEXT_WORKERS", "8"))
+PER_HOST_RATE = float(os.getenv("NEWS_INTEL_FULLTEXT_PER_HOST_RATE", "2")) # request per detik per host
+FETCH_TIMEOUT = 10
+FETCH_RETRIES = 2
+RETRY_STATUSES = (429,) # selain 5xx; 4xx lain (404, 403, ...) tidak akan berubah bila dicoba lagi
+RETRY_BACKOFF = 1.0 # detik, dikali 2 setiap percobaan ulang
+FAILED_RETRY_AFTER = 6 * 3600 # URL yang gagal baru dicoba lagi setelah 6 jam
+MIN_PARAGRAPH_CHARS = 40
+# Host pengalih/interstisial Google (news.google.com, consent.google.com, ...), dicocokkan dengan sufiks
+REDIRECT_HOSTS = ("google.com",)
+
+# Elemen yang tidak pernah berisi teks artikel
+_NOISE_TAGS = ("script", "style", "noscript", "nav", "header", "footer", "aside", "form", "iframe", "figure")
+
+
+class HostRateLimiter:
+    """Menjaga jarak minimal antar request ke host yang sama (1 / rate detik)."""
+
+    def __init__(self, rate=PER_HOST_RATE):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def load_cached_fulltext(urls, db_path=None):
+    """Entri cache yang masih berlaku: dict url -> (text, error)."""
+    urls = list(dict.fromkeys(u for u in urls if u))
+    cached = {}
+    if not urls:
+        return cached
+    ensure_db(db_path) # Tabel article_fulltext dibuat oleh init_db (utils/storage.py)
+    with read_connection(db_path) as conn:
+        for i in range(0, len(urls), 500):
+            chunk = urls[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT url, text, error, fetched_at FROM article_fulltext WHERE url IN ({placeholders})", chunk
+            ).fetchall()
+            for row in rows:
+                # Kegagalan di-cache sementara saja agar host yang sedang bermasalah tidak dibanjiri
+                if row["error"] and time.time() - row["fetched_at"] > FAILED_RETRY_AFTER:
+                    continue
+                cached[row["url"]] = (row["text"], row["error"])
+    return cached
+
+
+def save_fulltext(entries, db_path=None):
+    """Menyimpan hasil unduhan: list tuple (url, html_bytes, text, error)."""
+    rows = [
+        (url, zlib.compress(html) if html else None, text, error, time.time())
+        for url, html, text, error in entries
+    ]
+    if not rows:
+        return 0
+    ensure_db(db_path)
+    run_write(lambda conn: conn.executemany(
+        "INSERT OR REPLACE INTO article_fulltext (url, html, text, error, fetched_at) VALUES (?, ?, ?, ?, ?)",
+        rows,
+    ).rowcount, db_path)
+    return len(rows)
+
+
+def extract_article_text(html):
+    """
+    Mengekstrak teks isi artikel dari HTML dengan lxml: elemen <article> bila ada, jika tidak
+    elemen yang memuat teks paragraf (<p>) terbanyak. Mengembalikan paragraf dipisah baris kosong.
+    """
+    import lxml.html
+    from lxml import etree
+
+    document = lxml.html.fromstring(html)
+    etree.strip_elements(document, *_NOISE_TAGS, with_tail=False)
+
+    candidates = document.xpath("//article")
+    if not candidates:
+        # Induk paragraf dengan total teks paling panjang dianggap badan artikel
+        totals = {}
+        for paragraph in document.iter("p"):
+            parent = paragraph.getparent()
+            if parent is not None:
+                totals[parent] = totals.get(parent, 0) + len(paragraph.text_content().strip())
+        candidates = [max(totals, key=totals.get)] if totals else []
+    if not candidates:
+        return ""
+
+    body = max(candidates, key=lambda el: len(el.text_content()))
+    paragraphs = [' '.join(p.text_content().split()) for p in body.iter("p")]
+    paragraphs = [p for p in paragraphs if len(p) >= MIN_PARAGRAPH_CHARS]
+    if not paragraphs:
+        paragraphs = [' '.join(body.text_content().split())]
+    return "\n\n".join(p for p in paragraphs if p)
+
+
+def _is_redirect_host(url):
+    host = (urlparse(url).hostname or "").lower()
+    return any(host == h or host.endswith("." + h) for h in REDIRECT_HOSTS)
+
+
+def _decode_article_id(url):
+    """
+    URL penerbit yang tertanam di ID artikel Google News format lama (".../articles/CBMi...":
+    protobuf ber-base64url berisi URL apa adanya). None untuk format baru yang tidak memuat URL.
+    """
+    token = urlparse(url).path.rstrip("/").rsplit("/", 1)[-1]
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    except (ValueError, binascii.Error):
+        return None
+    match = re.search(rb"https?://[\x21-\x7e]+", raw)
+    return match.group().decode("ascii") if match else None
+
+
+def find_publisher_url(html):
+    """
+    URL penerbit di halaman pengalih Google News: atribut `data-n-au`, meta refresh, link canonical,
+    atau satu-satunya tautan keluar dari Google. None bila tidak ada (mis. halaman consent).
+    """
+    import lxml.html
+
+    document = lxml.html.fromstring(html)
+    candidates = document.xpath("//@data-n-au")
+    for content in document.xpath("//meta[translate(@http-equiv, 'REFSH', 'refsh')='refresh']/@content"):
+        match = re.search(r"url\s*=\s*['\"]?([^'\";]+)", content, flags=re.IGNORECASE)
+        if match:
+            candidates.append(match.group(1))
+    candidates += document.xpath("//link[@rel='canonical']/@href")
+    external = {href for href in document.xpath("//a/@href")
+                if href.startswith(("http://", "https://")) and not _is_redirect_host(href)}
+    if len(external) == 1:
+        candidates += list(external)
+    for candidate in candidates:
+        candidate = candidate.strip()
+        if candidate.startswith(("http://", "https://")) and not _is_redirect_host(candidate):
+            return candidate
+    return None
+
+
+def _is_transient(error):
+    """Kegagalan yang layak dicoba lagi: koneksi putus, timeout, HTTP 5xx/429."""
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is not None:
+        return status >= 500 or status in RETRY_STATUSES
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(error, requests.RequestException): # URL tidak valid, redirect berulang, dll.
+        return False
+    return isinstance(error, OSError) # transport lain: socket/timeout
+
+
+def _download(url, transport, limiter, timeout=FETCH_TIMEOUT, retries=FETCH_RETRIES):
+    """
+    Mengunduh `url`, mencoba lagi hanya kegagalan sementara (`_is_transient`).
+    Mengembalikan (bytes, URL akhir); transport tanpa `fetch` tidak melaporkan redirect.
+    """
+    fetch = getattr(transport, "fetch", None)
+    for attempt in range(retries + 1):
+        limiter.wait(urlparse(url).netloc)
+        try:
+            return fetch(url, timeout=timeout) if fetch else (transport(url, timeout=timeout), url)
+        except Exception as e:
+            if attempt == retries or not _is_transient(e):
+                raise
+            time.sleep(RETRY_BACKOFF * (2 ** attempt))
+
+
+def resolve_publisher_url(url, transport, limiter):
+    """
+    Mengembalikan (URL penerbit, HTML halamannya bila sudah terunduh atau None) untuk tautan feed.
+    URL non-Google dikembalikan apa adanya. Melempar ValueError bila tidak bisa keluar dari Google.
+    """
+    if not _is_redirect_host(url):
+        return url, None
+    decoded = _decode_article_id(url)
+    if decoded and not _is_redirect_host(decoded):
+        return decoded, None
+    html, final_url = _download(url, transport, limiter)
+    if not _is_redirect_host(final_url):
+        return final_url, html # Redirect HTTP langsung ke penerbit
+    publisher_url = find_publisher_url(html)
+    if not publisher_url:
+        raise ValueError(f"halaman akhir masih di {urlparse(final_url).hostname}, URL penerbit tidak ditemukan")
+    return publisher_url, None
+
+
+def _fetch_one(url, transport, limiter):
+    try:
+        target, html = resolve_publisher_url(url, transport, limiter)
+        if html is None:
+            html, final_url = _download(target, transport, limiter)
+            if _is_redirect_host(final_url):
+                # Penerbit mengalihkan kembali ke Google (consent dsb.): bukan halaman artikel
+                raise ValueError(f"halaman akhir di {urlparse(final_url).hostname}, bukan situs penerbit")
+    except Exception as e:
+        return url, None, None, f"download: {e}"
+    try:
+        text = extract_article_text(html)
+    except Exception as e:
+        return url, html, None, f"extract: {e}"
+    return url, html, text, None if text else "extract: teks artikel tidak ditemukan"
+
+
+def fetch_full_texts(urls, transport=None, max_workers=FULLTEXT_WORKERS, rate=PER_HOST_RATE,
+                     progress=None, db_path=None):
+    """
+    Mengambil teks lengkap untuk `urls` (cache SQLite lebih dulu, sisanya diunduh konkuren).
+    Mengembalikan dict url -> teks (hanya URL yang berhasil diekstrak).
+    """
+    urls = list(dict.fromkeys(u for u in urls if u))
+    cached = load_cached_fulltext(urls, db_path)
+    texts = {url: text for url, (text, error) in cached.items() if text}
+    missing = [u for u in urls if u not in cached]
+    done = len(urls) - len(missing)
+    if progress:
+        progress(done, len(urls))
+    if not missing:
+        return texts
+
+    transport = transport or get_default_transport()
+    limiter = HostRateLimiter(rate)
+    entries = []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(missing)), thread_name_prefix="fulltext") as executor:
+        futures = [executor.submit(_fetch_one, url, transport, limiter) for url in missing]
+        for future in as_completed(futures):
+            url, html, text, error = future.result()
+            entries.append((url, html, text, error))
+            if text:
+                texts[url] = text
+            done += 1
+            if progress:
+                progress(done, len(urls))
+    save_fulltext(entries, db_path)
+    return texts
+
+
+def attach_full_texts(news_items, transport=None, progress=None, db_path=None):
+    """Mengisi `full_text` pada artikel yang teks lengkapnya berhasil diambil. Mengembalikan jumlahnya."""
+    texts = fetch_full_texts([a.get('url') for a in news_items], transport=transport, progress=progress, db_path=db_path)
+    hits = 0
+    for article in news_items:
+        text = texts.get(article.get('url'))
+        if text:
+            article['full_text'] = text
+            hits += 1
+    return hits
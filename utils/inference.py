@@ -0,0 +1,158 @@
+# utils/inference.py
+"""
+Tahap inferensi batch untuk pipeline transformers (sentimen, NER & ringkasan).
+
+Teks dikelompokkan berdasarkan panjangnya (length-bucketing) sebelum dipotong
+menjadi batch, sehingga padding di dalam satu batch seminimal mungkin.
+Hasil selalu dikembalikan dalam urutan input semula.
+
+Teks panjang (mis. teks lengkap artikel dari utils/fulltext.py) dipecah menjadi jendela token
+(utils/chunking.py) sebelum masuk sentimen/NER; semua jendela ikut batch yang sama, lalu hasilnya
+digabung kembali menjadi satu hasil per teks dalam koordinat teks asal.
+
+Konfigurasi lewat environment variable:
+- NEWS_INTEL_BATCH_SIZE      : ukuran batch inferensi (default 16)
+- NEWS_INTEL_BATCHED_INFERENCE: "0" untuk kembali ke jalur lama per artikel
+- NEWS_INTEL_CHUNK_STRIDE    : overlap token antar jendela teks panjang (default 64)
+"""
+import os
+
+from utils.chunking import CHUNK_STRIDE, document_windows, merge_chunk_entities, merge_chunk_sentiment
+
+DEFAULT_BATCH_SIZE = int(os.getenv("NEWS_INTEL_BATCH_SIZE", "16"))
+BATCHED_INFERENCE = os.getenv("NEWS_INTEL_BATCHED_INFERENCE", "1") != "0"
+
+
+def length_bucketed_batches(texts, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Mengembalikan list batch berisi indeks teks, diurutkan berdasarkan panjang teks.
+    Teks dengan panjang serupa berada di batch yang sama untuk mengurangi padding.
+    """
+    batch_size = max(1, int(batch_size))
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    return [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+
+def run_batched_pipeline(pipe, texts, batch_size=DEFAULT_BATCH_SIZE, progress=None, **pipe_kwargs):
+    """
+    Menjalankan pipeline transformers pada semua teks dalam batch berukuran `batch_size`.
+    Mengembalikan list hasil (satu per teks) dengan urutan yang sama seperti `texts`.
+    `progress(done, total)` (opsional) dipanggil setiap satu batch selesai.
+    """
+    results = [None] * len(texts)
+    done = 0
+    for batch_indices in length_bucketed_batches(texts, batch_size):
+        batch_texts = [texts[i] for i in batch_indices]
+        batch_results = pipe(batch_texts, batch_size=len(batch_texts), **pipe_kwargs)
+        for idx, result in zip(batch_indices, batch_results):
+            results[idx] = result
+        done += len(batch_indices)
+        if progress:
+            progress(done, len(texts))
+    return results
+
+
+def _run_one_by_one(pipe, texts, progress=None):
+    results = []
+    for text in texts:
+        results.append(pipe(text))
+        if progress:
+            progress(len(results), len(texts))
+    return results
+
+
+def _expand_chunks(pipe, texts, stride):
+    # Mengembalikan (teks jendela, windows) dengan windows[i] = list jendela (start, end) teks ke-i
+    tokenizer = getattr(pipe, 'tokenizer', None)
+    chunk_texts, windows = [], []
+    for text in texts:
+        spans = document_windows(text, tokenizer, stride=stride)
+        chunk_texts.extend(text[start:end] for start, end in spans)
+        windows.append(spans)
+    return chunk_texts, windows
+
+
+def _split_per_text(results, windows):
+    # Hasil per jendela (berurutan) -> list hasil per teks
+    per_text, pos = [], 0
+    for spans in windows:
+        per_text.append(results[pos:pos + len(spans)])
+        pos += len(spans)
+    return per_text
+
+
+def run_sentiment(sentiment_analyzer, texts, batch_size=DEFAULT_BATCH_SIZE, batched=BATCHED_INFERENCE, progress=None,
+                  stride=CHUNK_STRIDE):
+    """
+    Analisis sentimen untuk sekumpulan teks. Mengembalikan satu dict {label, score} per teks.
+    Teks yang melebihi batas token model dianalisis per jendela lalu digabung (utils/chunking.py).
+    Jika `batched=False`, pipeline dipanggil satu per satu (jalur lama, untuk perbandingan).
+    """
+    chunk_texts, windows = _expand_chunks(sentiment_analyzer, texts, stride)
+    if not batched:
+        results = [r[0] for r in _run_one_by_one(sentiment_analyzer, chunk_texts, progress)]
+    else:
+        results = run_batched_pipeline(sentiment_analyzer, chunk_texts, batch_size, progress=progress)
+        # Beberapa versi pipeline membungkus hasil per teks dalam list
+        results = [r[0] if isinstance(r, list) else r for r in results]
+    if len(chunk_texts) == len(texts):
+        return results
+    return [
+        chunk_results[0] if len(spans) == 1 else merge_chunk_sentiment(spans, chunk_results)
+        for spans, chunk_results in zip(windows, _split_per_text(results, windows))
+    ]
+
+
+def run_ner(ner_analyzer, texts, batch_size=DEFAULT_BATCH_SIZE, batched=BATCHED_INFERENCE, progress=None,
+            stride=CHUNK_STRIDE):
+    """
+    Named Entity Recognition untuk sekumpulan teks. Mengembalikan list entitas per teks.
+    Teks yang melebihi batas token model diproses per jendela; offset entitas dikembalikan ke
+    koordinat teks asal dan entitas yang terpotong di batas jendela digabung (utils/chunking.py).
+    Jika `batched=False`, pipeline dipanggil satu per satu (jalur lama, untuk perbandingan).
+    """
+    chunk_texts, windows = _expand_chunks(ner_analyzer, texts, stride)
+    if not batched:
+        results = _run_one_by_one(ner_analyzer, chunk_texts, progress)
+    else:
+        results = run_batched_pipeline(ner_analyzer, chunk_texts, batch_size, progress=progress)
+    if len(chunk_texts) == len(texts):
+        return results
+    return [
+        chunk_entities[0] if len(spans) == 1 else merge_chunk_entities(text, spans, chunk_entities)
+        for text, spans, chunk_entities in zip(texts, windows, _split_per_text(results, windows))
+    ]
+
+
+def _summary_text(result):
+    # Pipeline summarization mengembalikan [{'summary_text': ...}] atau {'summary_text': ...} per teks
+    if isinstance(result, list):
+        result = result[0] if result else {}
+    return result.get('summary_text')
+
+
+def run_summarization(summarizer, texts, batch_size=DEFAULT_BATCH_SIZE, max_length=150, min_length=30, progress=None):
+    """
+    Meringkas sekumpulan teks per batch. Mengembalikan satu ringkasan (str) per teks, atau None
+    untuk teks yang gagal diringkas. Jika satu batch gagal, teks di batch itu dicoba satu per satu.
+    """
+    kwargs = dict(max_length=max_length, min_length=min_length, do_sample=False, truncation=True)
+    results = [None] * len(texts)
+    done = 0
+    for batch_indices in length_bucketed_batches(texts, batch_size):
+        batch_texts = [texts[i] for i in batch_indices]
+        try:
+            batch_results = [_summary_text(r) for r in summarizer(batch_texts, batch_size=len(batch_texts), **kwargs)]
+        except Exception:
+            batch_results = []
+            for text in batch_texts:
+                try:
+                    batch_results.append(_summary_text(summarizer(text, **kwargs)))
+                except Exception:
+                    batch_results.append(None)
+        for idx, summary in zip(batch_indices, batch_results):
+            results[idx] = summary
+        done += len(batch_indices)
+        if progress:
+            progress(done, len(texts))
+    return results
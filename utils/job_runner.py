@@ -0,0 +1,157 @@
+# utils/job_runner.py
+"""
+Job runner untuk menjalankan pembuatan laporan di luar thread skrip Streamlit.
+
+Setiap job tercatat di tabel job (per proses) beserta status, progres per tahap,
+hasil parsial, hasil akhir, dan error. Halaman Streamlit cukup mem-polling job
+berdasarkan `job_id` tanpa memblokir interaksi pengguna.
+
+Job satu grup (mis. satu sesi) dirantai: hanya job terdepan grup yang menempati worker,
+sisanya menunggu di antrean grup sehingga satu sesi tidak bisa memonopoli semua worker.
+"""
+import os
+import time
+import uuid
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+JOB_PENDING, JOB_RUNNING, JOB_DONE, JOB_FAILED, JOB_CANCELLED = "pending", "running", "done", "failed", "cancelled"
+
+MAX_WORKERS = int(os.getenv("NEWS_INTEL_JOB_WORKERS", "2"))
+MAX_FINISHED_JOBS = 200 # Job selesai yang disimpan di tabel sebelum dibuang (yang tertua)
+
+
+class Job:
+    """Satu entri tabel job. Diperbarui oleh thread worker, dibaca oleh halaman."""
+
+    def __init__(self, name, group=None, kind=None):
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.group = group
+        self.kind = kind or name
+        self.status = JOB_PENDING
+        self.stages = {} # stage -> {'done': int, 'total': int}
+        self.partial = {} # hasil parsial, mis. 'news_items', 'processed_data'
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._call = None # (fn, args, kwargs) sampai job dijalankan
+        self._lock = threading.Lock()
+
+    def update_progress(self, stage, done, total):
+        with self._lock:
+            self.stages[stage] = {'done': done, 'total': total}
+
+    def set_partial(self, name, value):
+        with self._lock:
+            self.partial[name] = value
+
+    def snapshot(self):
+        """Salinan status job yang aman dibaca dari thread lain."""
+        with self._lock:
+            return {
+                'id': self.id,
+                'name': self.name,
+                'status': self.status,
+                'stages': {k: dict(v) for k, v in self.stages.items()},
+                'partial': dict(self.partial),
+                'error': self.error,
+                'elapsed': (self.finished_at or time.time()) - (self.started_at or self.created_at),
+            }
+
+    @property
+    def finished(self):
+        return self.status in (JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+
+
+class JobRunner:
+    """
+    Thread pool dengan tabel job. Job dengan `group` yang sama (mis. satu sesi pengguna)
+    dijalankan berurutan agar tidak mengubah state analisis yang sama secara bersamaan.
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report-job")
+        self._jobs = {}
+        self._group_queues = {} # grup -> deque job yang menunggu; ada selama grup punya job aktif
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, name="report", group=None, kind=None, supersede=False, **kwargs):
+        """
+        Menjadwalkan `fn(job, *args, **kwargs)`. `fn` menerima objek Job untuk melaporkan
+        progres (`job.update_progress`) dan hasil parsial (`job.set_partial`). Mengembalikan job_id.
+        Dengan `supersede=True`, job grup yang sama dengan `kind` yang sama (default: `name`)
+        yang belum mulai dibatalkan, mis. laporan lama saat pencarian diubah lagi.
+        """
+        job = Job(name, group, kind)
+        job._call = (fn, args, kwargs)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+            if group is None:
+                self._executor.submit(self._run, job)
+                return job.id
+            pending = self._group_queues.get(group)
+            if pending is None:
+                # Grup tanpa job aktif: job ini langsung menjadi kepala rantai
+                self._group_queues[group] = deque()
+                self._executor.submit(self._run_group, group, job)
+                return job.id
+            if supersede:
+                for old in [j for j in pending if j.kind == job.kind]:
+                    pending.remove(old)
+                    old.status = JOB_CANCELLED
+                    old.finished_at = time.time()
+                    old._call = None
+            pending.append(job)
+        return job.id
+
+    def _run_group(self, group, job):
+        self._run(job)
+        with self._lock:
+            pending = self._group_queues[group]
+            if not pending:
+                del self._group_queues[group]
+                return
+            next_job = pending.popleft()
+        # Dijadwalkan ulang (bukan loop) agar grup lain yang sudah mengantre mendapat giliran
+        self._executor.submit(self._run_group, group, next_job)
+
+    def _run(self, job):
+        fn, args, kwargs = job._call
+        job._call = None
+        try:
+            job.started_at = time.time()
+            job.status = JOB_RUNNING
+            job.result = fn(job, *args, **kwargs)
+            job.status = JOB_DONE
+        except Exception as e:
+            job.error = str(e)
+            job.status = JOB_FAILED
+        finally:
+            job.finished_at = time.time()
+
+    def get(self, job_id):
+        """Mengembalikan Job atau None jika tidak ditemukan."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _prune(self):
+        finished = sorted((j for j in self._jobs.values() if j.finished), key=lambda j: j.finished_at)
+        for job in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            self._jobs.pop(job.id, None)
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+def get_job_runner():
+    """JobRunner bersama per proses (dipakai semua sesi Streamlit)."""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = JobRunner()
+        return _runner
@@ -1,15 +1,186 @@
 # utils/news_fetcher.py
+"""
+Pengambilan berita dari feed RSS Google News.
+
+- Hasil feed di-cache dengan TTL, dengan kunci (query, period, language, country).
+  Seluruh isi feed disimpan, sehingga perubahan max_results tidak memicu pengambilan ulang.
+- Beberapa query/periode dapat diambil sekaligus secara konkuren (`fetch_news_many`).
+- Koneksi HTTP memakai satu `requests.Session` yang di-pool dan dipakai ulang.
+- Transport dapat diganti (parameter `transport`) dan base URL dapat diarahkan ke
+  server feed lokal lewat NEWS_INTEL_GNEWS_BASE_URL, misalnya untuk pengujian offline.
+
+Format artikel mengikuti keluaran GNews: title, description, published date, url, publisher.
+"""
+import os
+import copy
+import time
+import threading
+import xml.etree.ElementTree as ET
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
 import streamlit as st
-from gnews import GNews
+from requests.adapters import HTTPAdapter
+
+GOOGLE_NEWS_RSS_URL = os.getenv("NEWS_INTEL_GNEWS_BASE_URL", "https://news.google.com/rss")
+FEED_CACHE_TTL = int(os.getenv("NEWS_INTEL_FEED_CACHE_TTL", "900")) # detik
+REQUEST_TIMEOUT = 15
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+)
+
+
+class RequestsTransport:
+    """
+    Transport HTTP default: satu `requests.Session` dengan connection pool dan retry.
+    Transport apa pun cukup berupa callable `transport(url, timeout) -> bytes`.
+    """
+
+    def __init__(self, pool_size=16, retries=2):
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": USER_AGENT})
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def __call__(self, url, timeout=REQUEST_TIMEOUT):
+        return self.fetch(url, timeout)[0]
+
+    def fetch(self, url, timeout=REQUEST_TIMEOUT):
+        """Seperti `__call__`, tetapi mengembalikan (bytes, URL akhir setelah redirect HTTP)."""
+        response = self.session.get(url, timeout=timeout)
+        response.raise_for_status()
+        return response.content, response.url
+
+
+_default_transport = None
+_transport_lock = threading.Lock()
+
+def get_default_transport():
+    """Transport bersama per proses (session HTTP di-pool)."""
+    global _default_transport
+    with _transport_lock:
+        if _default_transport is None:
+            _default_transport = RequestsTransport()
+        return _default_transport
+
+
+# --- Cache hasil feed (per proses, dipakai bersama oleh semua sesi) ---
+_feed_cache = {} # key -> (timestamp, items)
+_cache_lock = threading.Lock()
+
+def _cache_key(query, period, language, country):
+    # Tanpa max_results: Google News mengembalikan feed yang sama berapa pun max_results,
+    # jadi satu entri melayani semua nilai slider (mis. dari 20 ke 30)
+    return (query.strip().lower(), period, language, country)
+
+def _cache_lookup(key):
+    """Mengembalikan seluruh isi feed yang masih valid untuk `key`, atau None."""
+    with _cache_lock:
+        entry = _feed_cache.get(key)
+        if entry is None:
+            return None
+        ts, items = entry
+        if time.time() - ts > FEED_CACHE_TTL:
+            del _feed_cache[key]
+            return None
+        return items
+
+def _cache_store(key, items):
+    now = time.time()
+    with _cache_lock:
+        # Entri kedaluwarsa lain dibuang di sini agar cache tidak tumbuh tanpa batas
+        for stale_key in [k for k, (ts, _) in _feed_cache.items() if now - ts > FEED_CACHE_TTL]:
+            del _feed_cache[stale_key]
+        _feed_cache[key] = (now, items)
+
+def clear_news_cache():
+    """Mengosongkan cache feed berita."""
+    with _cache_lock:
+        _feed_cache.clear()
+
+
+# --- Pengambilan & parsing feed ---
+
+def build_feed_url(query, period='7d', language='id', country='ID', base_url=None):
+    """Menyusun URL pencarian RSS Google News (format yang sama dengan GNews)."""
+    search = quote(query)
+    if period:
+        search += quote(f" when:{period}")
+    return (
+        f"{base_url or GOOGLE_NEWS_RSS_URL}/search?q={search}"
+        f"&hl={language}&gl={country}&ceid={country}:{language}"
+    )
+
+def parse_feed(content, max_results=None):
+    """Mengubah XML RSS menjadi list artikel berformat GNews."""
+    root = ET.fromstring(content)
+    articles = []
+    for item in root.iter("item"):
+        source = item.find("source")
+        articles.append({
+            'title': item.findtext("title", default=""),
+            'description': item.findtext("description", default=""),
+            'published date': item.findtext("pubDate", default=""),
+            'url': item.findtext("link", default=""),
+            'publisher': {
+                'href': source.get("url", "") if source is not None else "",
+                'title': (source.text or "") if source is not None else "",
+            },
+        })
+        if max_results and len(articles) >= max_results:
+            break
+    return articles
+
+def fetch_feed(query, period='7d', max_results=10, language='id', country='ID',
+               transport=None, use_cache=True, base_url=None):
+    """
+    Mengambil artikel untuk satu query. Melempar exception bila gagal (tanpa pesan UI),
+    sehingga aman dipanggil dari thread worker.
+    """
+    key = _cache_key(query, period, language, country)
+    if use_cache:
+        cached = _cache_lookup(key)
+        if cached is not None:
+            return copy.deepcopy(cached[:max_results])
+
+    transport = transport or get_default_transport()
+    content = transport(build_feed_url(query, period, language, country, base_url), timeout=REQUEST_TIMEOUT)
+    items = parse_feed(content)
+    if use_cache:
+        _cache_store(key, items)
+    # Salinan agar analisis (yang menambah field ke artikel) tidak mengubah isi cache
+    return copy.deepcopy(items[:max_results])
+
+def fetch_news_many(requests_list, max_workers=8, language='id', country='ID', transport=None, use_cache=True):
+    """
+    Mengambil beberapa query/periode secara konkuren.
+    `requests_list` berisi tuple (query, period, max_results).
+    Mengembalikan (results, errors): dict (query, period, max_results) -> list artikel / pesan error.
+    """
+    results, errors = {}, {}
+    if not requests_list:
+        return results, errors
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(requests_list))) as executor:
+        futures = {
+            executor.submit(fetch_feed, q, p, n, language, country, transport, use_cache): (q, p, n)
+            for q, p, n in requests_list
+        }
+        for future, request_key in futures.items():
+            try:
+                results[request_key] = future.result()
+            except Exception as e:
+                errors[request_key] = str(e)
+    return results, errors
 
 def fetch_news(query, period='7d', max_results=10):
     """
     Mengambil berita dari Google News berdasarkan query dan periode waktu.
     """
     try:
-        google_news = GNews(language='id', country='ID', period=period)
-        google_news.max_results = max_results
-        return google_news.get_news(query)
+        return fetch_feed(query, period=period, max_results=max_results)
     except Exception as e:
         st.error(f"Gagal mengambil berita. Pastikan koneksi internet stabil atau coba ganti query. Error: {e}")
-        return []
\ No newline at end of file
+        return []
@@ -0,0 +1,158 @@
+# utils/parallel.py
+"""
+Eksekusi multi-proses untuk pekerjaan CPU per artikel.
+
+Dengan NEWS_INTEL_EXECUTION_MODE=process, artikel baru dibagi (shard) ke sebuah
+ProcessPoolExecutor. Setiap worker memuat model sentimen & NER miliknya sendiri
+satu kali melalui initializer, lalu menjalankan inferensi, segmentasi kalimat,
+filter entitas, dan tokenisasi word cloud untuk shard-nya. Kontribusi per artikel
+(baris sentimen, penyebutan entitas) dikembalikan ke proses utama untuk frame kolumnar
+(utils/article_frames.py); agregat parsial per shard hanya berisi frekuensi kata.
+
+Catatan: setiap worker memegang salinan model sendiri, jadi kebutuhan RAM bertambah
+sebanding jumlah worker (NEWS_INTEL_PROCESS_WORKERS).
+"""
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from utils.text_processor import clean_text_for_analysis, article_body
+
+LOCAL_MODE, PROCESS_MODE = "local", "process"
+EXECUTION_MODE = os.getenv("NEWS_INTEL_EXECUTION_MODE", LOCAL_MODE)
+PROCESS_WORKERS = int(os.getenv("NEWS_INTEL_PROCESS_WORKERS", str(os.cpu_count() or 1)))
+# Thread PyTorch per worker; 1 thread x N proses menghindari oversubscription core
+TORCH_THREADS_PER_WORKER = int(os.getenv("NEWS_INTEL_TORCH_THREADS_PER_WORKER", "1"))
+WORKER_MODELS = ("sentiment", "ner")
+
+# Field artikel yang dikirim ke worker (hindari pickling data yang tidak perlu)
+_SHARD_FIELDS = ('title', 'description', 'clean_text', 'published date', 'sentiment', 'entities')
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _init_worker(model_names, torch_threads):
+    """Initializer worker: atur jumlah thread PyTorch dan muat model sekali per proses."""
+    try:
+        import torch
+        torch.set_num_threads(torch_threads)
+    except ImportError:
+        pass
+    from models.loader import get_model
+    for name in model_names:
+        get_model(name)
+
+
+def get_process_pool():
+    """ProcessPoolExecutor bersama per proses utama (dibuat saat pertama kali dibutuhkan)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=PROCESS_WORKERS,
+                # spawn: aman untuk PyTorch/tokenizers yang tidak fork-safe
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(WORKER_MODELS, TORCH_THREADS_PER_WORKER),
+            )
+        return _pool
+
+
+def shutdown_process_pool():
+    """Menghentikan process pool (mis. saat worker headless selesai)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
+
+
+def make_shards(items, n_shards, size=len):
+    """
+    Membagi `items` ke `n_shards` shard dengan beban seimbang: item diurutkan dari yang
+    terbesar lalu dibagikan ke shard yang totalnya paling kecil. Mengembalikan list indeks per shard.
+    """
+    n_shards = max(1, min(n_shards, len(items)))
+    shards = [[] for _ in range(n_shards)]
+    loads = [0] * n_shards
+    for idx in sorted(range(len(items)), key=lambda i: size(items[i]), reverse=True):
+        target = loads.index(min(loads))
+        shards[target].append(idx)
+        loads[target] += size(items[idx])
+    return [sorted(shard) for shard in shards if shard]
+
+
+def _clean_shard(pairs):
+    return [clean_text_for_analysis(title, description) for title, description in pairs]
+
+
+def _analyze_shard(articles, batch_size, batched):
+    """Dijalankan di worker: inferensi + kontribusi per artikel + agregat parsial shard."""
+    from models.loader import get_model
+    from utils.inference import run_sentiment, run_ner
+    from utils.analysis_engine import _article_contribution, _new_wordcloud, new_partial_aggregate, fold_contribution
+
+    for article in articles:
+        if not article.get('clean_text'):
+            article['clean_text'] = clean_text_for_analysis(article.get('title', ''), article_body(article))
+
+    pending = [a for a in articles if a.get('sentiment') is None or a.get('entities') is None]
+    if pending:
+        texts = [a['clean_text'] for a in pending]
+        sentiment_results = run_sentiment(get_model("sentiment"), texts, batch_size=batch_size, batched=batched)
+        ner_results = run_ner(get_model("ner"), texts, batch_size=batch_size, batched=batched)
+        for article, sentiment_result, entities in zip(pending, sentiment_results, ner_results):
+            article['sentiment'] = sentiment_result
+            article['entities'] = entities
+
+    wordcloud_tokenizer = _new_wordcloud()
+    aggregate = new_partial_aggregate()
+    contributions = []
+    for article in articles:
+        contribution = _article_contribution(article, wordcloud_tokenizer)
+        fold_contribution(aggregate, contribution)
+        contributions.append(contribution)
+    return contributions, aggregate
+
+
+def clean_in_process_pool(news_items):
+    """Mengisi `clean_text` setiap artikel menggunakan process pool."""
+    pool = get_process_pool()
+    shards = make_shards(news_items, PROCESS_WORKERS, size=lambda a: len(article_body(a) or ''))
+    futures = {
+        pool.submit(_clean_shard, [(news_items[i].get('title', ''), article_body(news_items[i])) for i in shard]): shard
+        for shard in shards
+    }
+    for future in as_completed(futures):
+        for i, clean_text in zip(futures[future], future.result()):
+            news_items[i]['clean_text'] = clean_text
+
+
+def analyze_in_process_pool(articles, batch_size, batched, progress=None):
+    """
+    Menganalisis `articles` secara paralel di process pool.
+    Mengembalikan (contributions, shard_aggregates): kontribusi per artikel dengan urutan
+    yang sama seperti `articles`, dan list agregat parsial per shard untuk digabung.
+    """
+    pool = get_process_pool()
+    payload = [{field: a.get(field) for field in _SHARD_FIELDS} for a in articles]
+    shards = make_shards(payload, PROCESS_WORKERS * 2, size=lambda a: len(a.get('clean_text') or ''))
+    futures = {pool.submit(_analyze_shard, [payload[i] for i in shard], batch_size, batched): shard for shard in shards}
+
+    contributions = [None] * len(articles)
+    shard_aggregates = []
+    done = 0
+    for future in as_completed(futures):
+        shard_contributions, aggregate = future.result()
+        for i, contribution in zip(futures[future], shard_contributions):
+            contributions[i] = contribution
+            articles[i]['sentiment'] = contribution['sentiment']
+            articles[i]['entities'] = contribution['entities']
+        shard_aggregates.append(aggregate)
+        done += len(futures[future])
+        if progress:
+            for stage in ('sentiment', 'ner', 'aggregate'):
+                progress(stage, done, len(articles))
+    return contributions, shard_aggregates
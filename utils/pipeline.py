@@ -0,0 +1,183 @@
+# utils/pipeline.py
+"""
+Pipeline laporan intelijen lengkap: fetch -> (teks lengkap) -> clean -> cache DB -> analisis -> simpan.
+
+Tidak memanggil Streamlit sama sekali, sehingga dapat dijalankan di thread latar belakang
+(job runner) maupun di luar aplikasi. Kemajuan dilaporkan lewat callback
+`progress(stage, done, total)` dan hasil parsial lewat `on_partial(name, value)`.
+"""
+from utils.news_fetcher import fetch_feed
+from utils.archive_search import search_archive
+from utils.vector_index import semantic_search, sync_vector_index
+from utils.text_processor import clean_text_for_analysis, article_body
+from utils.analysis_engine import update_analysis_state, build_processed_data, with_topics, new_analysis_state
+from utils.storage import hydrate_cached_results, save_analysis_results
+from utils.summaries import summary_cache_key
+from utils.parallel import EXECUTION_MODE, PROCESS_MODE, clean_in_process_pool
+from utils.dedup import DEDUP_ENABLED, collapse_near_duplicates, propagate_cluster_results
+from utils.fulltext import FULLTEXT_ENABLED, attach_full_texts
+from utils.profiling import PROFILE_MODE, RunProfiler
+from utils.sentiment_rollups import TREND_SOURCE, ROLLUP_TREND_SOURCE, rollup_sentiment_trend
+
+# Sumber berita laporan: Google News (jaringan), atau arsip lokal news_intelligence.db
+# lewat pencarian kata kunci (FTS5) maupun pencarian semantik (indeks vektor)
+GNEWS_SOURCE, ARCHIVE_SOURCE, SEMANTIC_SOURCE = "gnews", "archive", "semantic"
+ARCHIVE_SOURCES = (ARCHIVE_SOURCE, SEMANTIC_SOURCE)
+
+# Di bawah jumlah ini, overhead IPC process pool lebih besar daripada biaya membersihkan teks
+PARALLEL_CLEAN_MIN_ITEMS = 500
+
+# Urutan & label tahap pipeline untuk tampilan progres
+PIPELINE_STAGES = {
+    'fetch': "Mengambil berita",
+    'clean': "Membersihkan teks",
+    'cache': "Membaca cache analisis",
+    'dedup': "Menggabungkan berita duplikat",
+    'sentiment': "Analisis sentimen",
+    'ner': "Ekstraksi entitas",
+    'aggregate': "Agregasi entitas & relasi",
+    'topics': "Topic modeling",
+    'graph': "Graf relasi entitas",
+    'store': "Menyimpan ke database",
+}
+if FULLTEXT_ENABLED:
+    PIPELINE_STAGES = {'fetch': PIPELINE_STAGES['fetch'], 'fulltext': "Mengunduh teks lengkap artikel",
+                       **{stage: label for stage, label in PIPELINE_STAGES.items() if stage != 'fetch'}}
+
+
+def run_report_pipeline(query, period, num_articles, sentiment_analyzer, ner_analyzer, topic_model_factory,
+                        model_version, state=None, progress=None, on_partial=None, source=GNEWS_SOURCE,
+                        full_text=FULLTEXT_ENABLED, profile=PROFILE_MODE, profiler=None):
+    """
+    Menjalankan seluruh pipeline laporan untuk satu query.
+    Dengan `source=ARCHIVE_SOURCE`/`SEMANTIC_SOURCE` berita diambil dari arsip lokal (FTS5/semantik)
+    dan `period` berupa tuple (tanggal_awal, tanggal_akhir); selain itu `period` adalah kode GNews.
+    Dengan `full_text=True` halaman artikel diunduh dan teks lengkapnya yang dianalisis.
+    Mengembalikan dict {'news_items', 'processed_data', 'warnings'}; `news_items` kosong
+    jika tidak ada berita yang ditemukan. Error pengambilan berita dilempar ke pemanggil.
+
+    Metrik per tahap (utils/profiling.py) disimpan di processed_data['metrics']; `profile`
+    ("cprofile"/"pyinstrument") menambahkan profil mendalam. Pemanggil yang masih menambah tahap
+    setelah pipeline (mis. worker) memberikan `profiler` sendiri dan menutupnya sendiri.
+    """
+    args = (query, period, num_articles, sentiment_analyzer, ner_analyzer, topic_model_factory, model_version,
+            state, progress, on_partial, source, full_text)
+    if profiler is not None:
+        return _run_stages(*args, profiler)
+    meta = {'query': query, 'period': str(period), 'source': source, 'num_articles': num_articles}
+    with RunProfiler("report", meta=meta, profile=profile) as profiler:
+        result = _run_stages(*args, profiler)
+    if result['processed_data'] is not None:
+        result['processed_data']['metrics'] = profiler.summary()
+    return result
+
+
+def _run_stages(query, period, num_articles, sentiment_analyzer, ner_analyzer, topic_model_factory, model_version,
+                state, progress, on_partial, source, full_text, profiler):
+    def report(stage, done, total):
+        if progress:
+            progress(stage, done, total)
+
+    def partial(name, value):
+        if on_partial:
+            on_partial(name, value)
+
+    state = state if state is not None else new_analysis_state()
+    warnings = []
+
+    report('fetch', 0, 1)
+    with profiler.stage('fetch') as stage:
+        if source == ARCHIVE_SOURCE:
+            start_date, end_date = period
+            news_items = search_archive(query, start_date, end_date, limit=num_articles)
+        elif source == SEMANTIC_SOURCE:
+            start_date, end_date = period
+            news_items = semantic_search(query, k=num_articles, start_date=start_date, end_date=end_date)
+        else:
+            news_items = fetch_feed(query, period=period, max_results=num_articles)
+        stage['items'] = len(news_items)
+    report('fetch', len(news_items), len(news_items))
+    if not news_items:
+        return {'news_items': [], 'processed_data': None, 'warnings': warnings}
+
+    # Teks lengkap artikel (opsional); artikel yang gagal diunduh tetap memakai deskripsi feed
+    if full_text:
+        try:
+            with profiler.stage('fulltext', items=len(news_items)):
+                attach_full_texts(news_items, progress=lambda done, total: report('fulltext', done, total))
+        except Exception as e:
+            warnings.append(f"Teks lengkap artikel gagal diambil, analisis memakai deskripsi berita. Error: {e}")
+
+    # Bersihkan dan tambahkan clean_text ke setiap artikel
+    with profiler.stage('clean', items=len(news_items)):
+        if EXECUTION_MODE == PROCESS_MODE and len(news_items) >= PARALLEL_CLEAN_MIN_ITEMS:
+            clean_in_process_pool(news_items)
+        else:
+            for article in news_items:
+                article['clean_text'] = clean_text_for_analysis(article.get('title', ''), article_body(article))
+    report('clean', len(news_items), len(news_items))
+    partial('news_items', news_items)
+
+    # Ambil hasil analisis tersimpan (cache DB) agar artikel lama tidak diinferensi ulang
+    try:
+        with profiler.stage('cache', items=len(news_items)):
+            hits = hydrate_cached_results(news_items, model_version, summary_key=summary_cache_key())
+        report('cache', hits, len(news_items))
+    except Exception as e:
+        warnings.append(f"Cache analisis tidak dapat dibaca, semua artikel akan dianalisis ulang. Error: {e}")
+
+    # Salinan sindikasi lintas media dianalisis sekali saja (lewat artikel perwakilannya)
+    report('dedup', 0, len(news_items))
+    with profiler.stage('dedup', items=len(news_items)):
+        analysis_items = collapse_near_duplicates(news_items) if DEDUP_ENABLED else news_items
+    report('dedup', len(news_items), len(news_items))
+
+    # Analisis inkremental: hanya artikel baru yang diinferensi
+    update_analysis_state(state, analysis_items, sentiment_analyzer, ner_analyzer, progress=progress, profiler=profiler)
+    # Hasil parsial (tanpa topic modeling) agar dashboard bisa tampil lebih awal; frame, word cloud,
+    # dan graf-nya dipakai ulang untuk hasil akhir sehingga hanya topic modeling yang ditambahkan
+    processed_data = build_processed_data(state, analysis_items, include_topics=False, progress=progress,
+                                          profiler=profiler)
+    partial('processed_data', processed_data)
+
+    # Model topik online hanya untuk query yang dipantau dari Google News, bukan pencarian arsip ad-hoc
+    processed_data = with_topics(state, analysis_items, processed_data, topic_model_factory, progress=progress,
+                                 topic_query=query if source not in ARCHIVE_SOURCES else None, profiler=profiler)
+    processed_data['duplicates_collapsed'] = len(news_items) - len(analysis_items)
+    propagate_cluster_results(news_items)
+
+    # Simpan hasil analisis ke news_intelligence.db untuk laporan berikutnya
+    report('store', 0, 1)
+    try:
+        # Artikel arsip tetap tercatat di bawah topic_query asalnya
+        with profiler.stage('store', items=len(news_items)):
+            save_analysis_results(news_items, query if source not in ARCHIVE_SOURCES else None, model_version)
+    except Exception as e:
+        warnings.append(f"Hasil analisis gagal disimpan ke database. Error: {e}")
+    else:
+        if source == GNEWS_SOURCE and TREND_SOURCE == ROLLUP_TREND_SOURCE:
+            with profiler.stage('rollup_trend'):
+                _apply_rollup_trend(processed_data, query, warnings)
+    try:
+        # Artikel baru langsung masuk indeks semantik (embedding-nya sudah di-cache oleh topic modeling)
+        with profiler.stage('vector_index'):
+            sync_vector_index()
+    except Exception as e:
+        warnings.append(f"Indeks pencarian semantik gagal diperbarui. Error: {e}")
+    report('store', 1, 1)
+
+    processed_data['warnings'] = warnings + processed_data.get('warnings', [])
+    return {'news_items': news_items, 'processed_data': processed_data, 'warnings': warnings}
+
+
+def _apply_rollup_trend(processed_data, query, warnings):
+    """Tren & event sentimen dari rollup harian query (rentang panjang); tetap memakai tren artikel bila gagal."""
+    try:
+        trend_df, events = rollup_sentiment_trend(query)
+    except Exception as e:
+        warnings.append(f"Tren sentimen jangka panjang tidak dapat dibaca, tren memakai artikel laporan ini. Error: {e}")
+        return
+    if not trend_df.empty:
+        processed_data['sentiment_trend_df'] = trend_df
+        processed_data['sentiment_events'] = events
+        processed_data['trend_days'] = len(trend_df)
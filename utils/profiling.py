@@ -0,0 +1,247 @@
+# utils/profiling.py
+"""
+Instrumentasi per tahap untuk pipeline laporan dan render dashboard.
+
+`RunProfiler` mencatat setiap tahap (`with profiler.stage("ner") as s: ...; s['items'] = n`):
+wall time, CPU time proses, jumlah item, dan puncak memori RSS (disampel thread latar).
+Ringkasannya (`summary()`) disimpan di processed_data['metrics'] dan ditulis sebagai log JSON
+(satu baris per tahap dan satu per laporan) ke logger `news_intel.metrics`, serta ditambahkan
+ke file NEWS_INTEL_METRICS_LOG bila diset.
+
+CPU time diukur per proses (mencakup thread inferensi PyTorch/tokenizer), sehingga ikut
+memuat pekerjaan laporan lain yang berjalan bersamaan; proses di process pool tidak terhitung.
+
+Profiling mendalam opsional per eksekusi (NEWS_INTEL_PROFILE atau argumen `profile`):
+"cprofile" (.prof, buka dengan snakeviz/pstats) atau "pyinstrument" (.html, paket opsional),
+disimpan di NEWS_INTEL_PROFILE_DIR. Keduanya hanya memprofil thread yang menjalankan laporan.
+"""
+import os
+import re
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+
+CPROFILE_MODE, PYINSTRUMENT_MODE = "cprofile", "pyinstrument"
+PROFILE_MODES = (CPROFILE_MODE, PYINSTRUMENT_MODE)
+PROFILE_MODE = os.getenv("NEWS_INTEL_PROFILE", "").lower() or None
+PROFILE_DIR = os.getenv("NEWS_INTEL_PROFILE_DIR", "profiles")
+METRICS_LOG_PATH = os.getenv("NEWS_INTEL_METRICS_LOG", "")
+MEMORY_SAMPLE_INTERVAL = 0.05 # detik antar sampel RSS
+
+logger = logging.getLogger("news_intel.metrics")
+_log_lock = threading.Lock()
+_rss_reader = None
+
+
+def _statm_rss():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def current_rss():
+    """RSS proses saat ini dalam byte (psutil bila terpasang, /proc di Linux), atau None."""
+    global _rss_reader
+    if _rss_reader is None:
+        try:
+            import psutil
+            process = psutil.Process()
+            _rss_reader = lambda: process.memory_info().rss
+        except ImportError:
+            _rss_reader = _statm_rss
+    return _rss_reader()
+
+
+def _mb(value):
+    return round(value / 2 ** 20, 1) if value is not None else None
+
+
+def _peak(current, sample):
+    if sample is None:
+        return current
+    return sample if current is None else max(current, sample)
+
+
+def log_metrics(record):
+    """Menulis satu record metrik sebagai satu baris JSON (logger & NEWS_INTEL_METRICS_LOG)."""
+    line = json.dumps(record, ensure_ascii=False, default=str)
+    logger.info(line)
+    if METRICS_LOG_PATH:
+        with _log_lock, open(METRICS_LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+def check_profile_mode(profile):
+    """ValueError bila `profile` (mis. dari NEWS_INTEL_PROFILE) bukan None/cprofile/pyinstrument."""
+    if profile and profile not in PROFILE_MODES:
+        raise ValueError(f"Mode profiling tidak dikenal: {profile!r} (pilihan: {', '.join(PROFILE_MODES)})")
+
+
+class RunProfiler:
+    """
+    Metrik satu eksekusi (laporan, entri watchlist, atau satu render dashboard).
+    Dipakai sebagai context manager, atau lewat `start()` / `finish()` bila tahap lain
+    (mis. ringkasan di worker) masih ditambahkan setelah pipeline selesai.
+    """
+
+    def __init__(self, name, meta=None, profile=None, sample_memory=True, log=True):
+        check_profile_mode(profile)
+        self.name = name
+        self.meta = dict(meta or {})
+        self.profile = profile
+        self.sample_memory = sample_memory
+        self.log = log
+        self.stages = []
+        self.status = None
+        self.profile_path = None
+        self.profile_error = None
+        self._open = [] # record tahap yang sedang berjalan (menerima sampel RSS)
+        self._peak_rss = None
+        self._lock = threading.Lock()
+        self._stop_sampling = threading.Event()
+        self._sampler = None
+        self._deep_profiler = None
+        self._started_at = self._wall = self._cpu = None
+        self._totals = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.finish(error=f"{exc_type.__name__}: {exc}" if exc_type else None)
+        return False
+
+    def start(self):
+        self._started_at = time.time()
+        self._wall, self._cpu = time.perf_counter(), time.process_time()
+        if self.sample_memory:
+            self._peak_rss = current_rss()
+            self._sampler = threading.Thread(target=self._sample_loop, name="metrics-rss", daemon=True)
+            self._sampler.start()
+        if self.profile:
+            self._start_deep_profile()
+        return self
+
+    def _sample_loop(self):
+        while not self._stop_sampling.wait(MEMORY_SAMPLE_INTERVAL):
+            self._record_rss(current_rss())
+
+    def _record_rss(self, rss):
+        with self._lock:
+            self._peak_rss = _peak(self._peak_rss, rss)
+            for record in self._open:
+                record['_peak_rss'] = _peak(record['_peak_rss'], rss)
+
+    @contextmanager
+    def stage(self, name, items=None):
+        """Mengukur satu tahap. Record yang di-yield dapat diisi `items` setelah jumlahnya diketahui."""
+        record = {'stage': name, 'items': items, '_peak_rss': None}
+        if self.sample_memory:
+            record['_peak_rss'] = current_rss()
+        with self._lock:
+            self._open.append(record)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record['wall_s'] = round(time.perf_counter() - wall, 4)
+            record['cpu_s'] = round(time.process_time() - cpu, 4)
+            if self.sample_memory:
+                self._record_rss(current_rss())
+            with self._lock:
+                self._open.remove(record)
+                record['peak_rss_mb'] = _mb(record.pop('_peak_rss'))
+                self.stages.append(record)
+
+    def _start_deep_profile(self):
+        try:
+            if self.profile == CPROFILE_MODE:
+                import cProfile
+                self._deep_profiler = cProfile.Profile()
+                self._deep_profiler.enable()
+            else:
+                from pyinstrument import Profiler
+                self._deep_profiler = Profiler()
+                self._deep_profiler.start()
+        except (ImportError, ValueError, RuntimeError) as e: # paket tidak ada / profiler lain sudah aktif
+            self._deep_profiler = None
+            self.profile_error = f"Profiling {self.profile} tidak dapat dijalankan: {e}"
+
+    def _stop_deep_profile(self):
+        if self._deep_profiler is None:
+            return
+        slug = re.sub(r"[^\w-]+", "_", str(self.meta.get('query') or self.name)).strip("_")[:60] or "run"
+        stem = os.path.join(PROFILE_DIR, f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(self._started_at))}_{slug}")
+        try:
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            if self.profile == CPROFILE_MODE:
+                self._deep_profiler.disable()
+                self.profile_path = stem + ".prof"
+                self._deep_profiler.dump_stats(self.profile_path)
+            else:
+                self._deep_profiler.stop()
+                self.profile_path = stem + ".html"
+                with open(self.profile_path, "w", encoding="utf-8") as f:
+                    f.write(self._deep_profiler.output_html())
+        except OSError as e:
+            self.profile_path = None
+            self.profile_error = f"Hasil profiling gagal disimpan: {e}"
+        self._deep_profiler = None
+
+    def finish(self, error=None):
+        """Menghentikan pengukuran, menulis log JSON, dan mengembalikan `summary()`. Aman dipanggil ulang."""
+        if self._totals is not None:
+            return self.summary()
+        self._stop_deep_profile()
+        if self._sampler is not None:
+            self._stop_sampling.set()
+            self._sampler.join()
+            self._record_rss(current_rss())
+        self.status = "error" if error else "ok"
+        self._totals = {
+            'wall_s': round(time.perf_counter() - self._wall, 4),
+            'cpu_s': round(time.process_time() - self._cpu, 4),
+            'peak_rss_mb': _mb(self._peak_rss),
+            'error': error,
+        }
+        if self.log:
+            summary = self.summary()
+            for record in summary['stages']:
+                log_metrics({'event': 'stage', 'run': self.name, 'started_at': self._started_at, **self.meta, **record})
+            log_metrics({'event': 'run', **{k: v for k, v in summary.items() if k != 'stages'}})
+        return self.summary()
+
+    def summary(self):
+        """Metrik eksekusi sebagai dict biasa (aman di-pickle/di-JSON-kan)."""
+        with self._lock:
+            stages = [dict(record) for record in self.stages]
+        return {
+            'run': self.name,
+            'started_at': self._started_at,
+            **self.meta,
+            **(self._totals or {}),
+            'status': self.status,
+            'stages': stages,
+            'profile': self.profile,
+            'profile_path': self.profile_path,
+            'profile_error': self.profile_error,
+        }
+
+    def stage_timings(self):
+        """Durasi per tahap {stage: {wall_s, cpu_s, items, peak_rss_mb}} untuk tabel `pipeline_runs`."""
+        return {record['stage']: {k: v for k, v in record.items() if k != 'stage'} for record in self.summary()['stages']}
+
+
+class NullProfiler:
+    """Pengganti RunProfiler bila pemanggil tidak mengukur apa pun."""
+
+    @contextmanager
+    def stage(self, name, items=None):
+        yield {'stage': name, 'items': items}
+
+
+NULL_PROFILER = NullProfiler()
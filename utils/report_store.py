@@ -0,0 +1,102 @@
+# utils/report_store.py
+"""
+Riwayat eksekusi pipeline dan laporan siap-buka di news_intelligence.db.
+
+- `pipeline_runs`  : satu baris per eksekusi laporan (worker headless), beserta status,
+  jumlah artikel, durasi total, dan durasi per tahap (JSON).
+- `stored_reports` : laporan terakhir per (topic_query, period) hasil worker, berupa
+  news_items + processed_data yang di-pickle dan dikompresi, sehingga dashboard dapat
+  membukanya seketika tanpa menjalankan model.
+"""
+import json
+import time
+import zlib
+import pickle
+
+from utils.storage import ensure_db, read_connection, run_write
+
+RUN_OK, RUN_EMPTY, RUN_ERROR = "ok", "empty", "error"
+
+# Tabel pipeline_runs & stored_reports dibuat oleh init_db (utils/storage.py); penulisan lewat
+# thread penulis (run_write), pembacaan lewat pool read-only
+
+
+def start_run(topic_query, period, db_path=None):
+    """Mencatat awal eksekusi laporan. Mengembalikan id baris `pipeline_runs`."""
+    ensure_db(db_path)
+    return run_write(lambda conn: conn.execute(
+        "INSERT INTO pipeline_runs (topic_query, period, started_at) VALUES (?, ?, ?)",
+        (topic_query, period, time.time()),
+    ).lastrowid, db_path)
+
+
+def finish_run(run_id, status, n_articles=0, stage_timings=None, error=None, db_path=None):
+    """Mencatat akhir eksekusi: status, jumlah artikel, durasi total & per tahap."""
+    finished_at = time.time()
+    values = (finished_at, status, n_articles, finished_at, json.dumps(stage_timings or {}), error, run_id)
+    ensure_db(db_path)
+    run_write(lambda conn: conn.execute("""
+        UPDATE pipeline_runs
+        SET finished_at = ?, status = ?, n_articles = ?, duration_s = ? - started_at,
+            stage_timings = ?, error = ?
+        WHERE id = ?
+    """, values).rowcount, db_path)
+
+
+def last_run_times(db_path=None):
+    """Waktu mulai eksekusi terakhir per (topic_query, period): dict -> epoch detik."""
+    ensure_db(db_path)
+    with read_connection(db_path) as conn:
+        rows = conn.execute(
+            "SELECT topic_query, period, MAX(started_at) AS started_at FROM pipeline_runs GROUP BY topic_query, period"
+        ).fetchall()
+    return {(row["topic_query"], row["period"]): row["started_at"] for row in rows}
+
+
+def recent_runs(limit=50, db_path=None):
+    """Eksekusi terbaru (terbaru lebih dulu) sebagai list dict, stage_timings sudah di-decode."""
+    ensure_db(db_path)
+    with read_connection(db_path) as conn:
+        rows = conn.execute("SELECT * FROM pipeline_runs ORDER BY started_at DESC LIMIT ?", (limit,)).fetchall()
+    runs = [dict(row) for row in rows]
+    for run in runs:
+        run['stage_timings'] = json.loads(run['stage_timings']) if run['stage_timings'] else {}
+    return runs
+
+
+def save_report(topic_query, period, news_items, processed_data, run_id=None, db_path=None):
+    """Menyimpan (menimpa) laporan terakhir untuk (topic_query, period)."""
+    payload = zlib.compress(pickle.dumps(
+        {'news_items': news_items, 'processed_data': processed_data}, protocol=pickle.HIGHEST_PROTOCOL,
+    ))
+    row = (topic_query, period, run_id, time.time(), len(news_items), payload)
+    ensure_db(db_path)
+    run_write(lambda conn: conn.execute("""
+        INSERT OR REPLACE INTO stored_reports (topic_query, period, run_id, created_at, n_articles, payload)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, row).rowcount, db_path)
+
+
+def list_reports(db_path=None):
+    """Daftar laporan tersimpan (tanpa payload), terbaru lebih dulu."""
+    ensure_db(db_path)
+    with read_connection(db_path) as conn:
+        rows = conn.execute(
+            "SELECT topic_query, period, created_at, n_articles FROM stored_reports ORDER BY created_at DESC"
+        ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def load_report(topic_query, period, db_path=None):
+    """Laporan tersimpan {'news_items', 'processed_data', 'created_at'}, atau None bila tidak ada."""
+    ensure_db(db_path)
+    with read_connection(db_path) as conn:
+        row = conn.execute(
+            "SELECT payload, created_at FROM stored_reports WHERE topic_query = ? AND period = ?",
+            (topic_query, period),
+        ).fetchone()
+    if row is None:
+        return None
+    report = pickle.loads(zlib.decompress(row["payload"]))
+    report['created_at'] = row["created_at"]
+    return report
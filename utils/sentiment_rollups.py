@@ -0,0 +1,83 @@
+# utils/sentiment_rollups.py
+"""
+Tren sentimen jangka panjang & deteksi event dari rollup harian `sentiment_daily`
+(dijaga trigger di utils/storage.py), tanpa memindai tabel `articles`.
+
+Event = hari yang rata-rata sentimennya menyimpang lebih dari NEWS_INTEL_EVENT_Z galat standar
+dari rata-rata bergerak eksponensial (EWMA) hari-hari sebelumnya, sehingga pergeseran bertahap
+tidak terus-menerus dianggap event seperti pada ambang rata-rata global.
+"""
+import os
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from utils.storage import ensure_db, read_connection
+
+# Sumber tren di dashboard: "rollup" (sentiment_daily, rentang panjang) atau "articles" (artikel laporan saja)
+ROLLUP_TREND_SOURCE, ARTICLES_TREND_SOURCE = "rollup", "articles"
+TREND_SOURCE = os.getenv("NEWS_INTEL_TREND_SOURCE", ROLLUP_TREND_SOURCE).lower()
+TREND_DAYS = int(os.getenv("NEWS_INTEL_TREND_DAYS", "180"))
+EVENT_SPAN_DAYS = int(os.getenv("NEWS_INTEL_EVENT_SPAN", "14"))
+EVENT_Z_THRESHOLD = float(os.getenv("NEWS_INTEL_EVENT_Z", "2.5"))
+EVENT_MIN_HISTORY = 5 # hari berdata sebelum deteksi dimulai
+EVENT_MIN_ARTICLES = 2 # hari dengan artikel lebih sedikit tidak dianggap event
+EVENT_STD_FLOOR = 0.1 # variasi antar-hari minimum; mencegah z meledak saat riwayat hampir konstan
+
+DAILY_COLUMNS = ["n", "score_sum", "score_sumsq", "n_positive", "n_neutral", "n_negative"]
+
+
+def load_daily_sentiment(topic_query, days=TREND_DAYS, end=None, db_path=None):
+    """
+    Rollup harian satu topic_query selama `days` hari terakhir (UTC) hingga `end`.
+    DataFrame berindeks `date` (hari, naive UTC) dengan kolom rollup mentah ditambah
+    `average_score` dan `score_std` (deviasi standar skor artikel dalam hari tersebut).
+    """
+    end = end or datetime.now(timezone.utc).date()
+    start = end - timedelta(days=days - 1)
+    ensure_db(db_path)
+    with read_connection(db_path) as conn:
+        rows = conn.execute(f"""
+            SELECT day, {", ".join(DAILY_COLUMNS)} FROM sentiment_daily
+            WHERE topic_query = ? AND day BETWEEN ? AND ? AND n > 0
+            ORDER BY day
+        """, (topic_query, start.isoformat(), end.isoformat())).fetchall()
+
+    daily = pd.DataFrame([tuple(row) for row in rows], columns=["date"] + DAILY_COLUMNS)
+    daily["date"] = pd.to_datetime(daily["date"])
+    daily = daily.set_index("date")
+    daily["average_score"] = daily["score_sum"] / daily["n"]
+    variance = daily["score_sumsq"] / daily["n"] - daily["average_score"] ** 2
+    daily["score_std"] = np.sqrt(variance.clip(lower=0)) # clip: sisa pembulatan float dari trigger
+    return daily
+
+
+def detect_sentiment_events(daily, span=EVENT_SPAN_DAYS, threshold=EVENT_Z_THRESHOLD,
+                            min_history=EVENT_MIN_HISTORY, min_articles=EVENT_MIN_ARTICLES):
+    """
+    Hari-hari (nilai indeks `daily`) yang skor rata-ratanya menyimpang > `threshold` dari baseline
+    EWMA hari-hari sebelumnya. `daily` berkolom rollup `n`, `score_sum`, `score_sumsq`, `average_score`.
+
+    Baseline = EWMA jumlah (n, Σskor, Σskor²), yaitu rata-rata & varians per artikel berbobot waktu.
+    Galat standar rata-rata hari itu (σ/√n) membuat hari dengan sedikit artikel tidak mudah memicu event.
+    """
+    if len(daily) <= min_history:
+        return []
+    # Baseline hanya dari hari sebelumnya, agar lonjakan hari ini tidak meredam z-nya sendiri
+    sums = daily[["n", "score_sum", "score_sumsq"]].ewm(span=span, min_periods=min_history).mean().shift(1)
+    baseline_mean = sums["score_sum"] / sums["n"]
+    baseline_var = (sums["score_sumsq"] / sums["n"] - baseline_mean ** 2).clip(lower=0)
+    stderr = np.sqrt(baseline_var / daily["n"] + EVENT_STD_FLOOR ** 2)
+    z = (daily["average_score"] - baseline_mean) / stderr
+    flagged = (z.abs() > threshold) & (daily["n"] >= min_articles)
+    return daily.index[flagged.fillna(False)].tolist()
+
+
+def rollup_sentiment_trend(topic_query, days=TREND_DAYS, db_path=None):
+    """
+    Pengganti `sentiment_trend_df` & `sentiment_events` dari processed_data berbasis rollup.
+    Mengembalikan (trend_df berindeks `date` dengan kolom `average_score` & `n`, list tanggal event).
+    """
+    daily = load_daily_sentiment(topic_query, days=days, db_path=db_path)
+    return daily[["average_score", "n"]], detect_sentiment_events(daily)
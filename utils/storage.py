@@ -0,0 +1,499 @@
+# utils/storage.py
+"""
+Lapisan penyimpanan SQLite (news_intelligence.db) untuk artikel dan hasil analisis.
+
+Hasil sentimen/NER/ringkasan disimpan per URL bersama `model_version`
+(fingerprint model AI yang dipakai), sehingga artikel yang sudah pernah
+dianalisis dengan model yang sama tidak perlu diinferensi ulang.
+
+Penulisan artikel lewat thread penulis tunggal dan pembacaan lewat pool koneksi
+read-only (lihat utils/db.py); skema dipastikan sekali per file DB (`ensure_db`).
+"""
+import os
+import json
+import threading
+from contextlib import closing
+from email.utils import parsedate_to_datetime
+from datetime import timezone
+
+from utils.db import DB_PATH, get_connection, read_connection, run_write
+
+# Kolom tambahan di atas skema asli tabel `articles`
+_EXTRA_ARTICLE_COLUMNS = {
+    "entities_json": "TEXT",
+    "model_version": "TEXT",
+    "summary_key": "TEXT", # (model peringkas, max_length, min_length) yang menghasilkan `summary`
+    "published_ts": "TEXT", # published_date dalam format ISO UTC (bisa diurutkan/difilter)
+    "duplicate_of": "TEXT", # URL artikel perwakilan bila artikel ini salinan sindikasi (utils/dedup.py)
+}
+
+# Kolom `articles` yang diindeks FTS5 (urutan ini dipakai bobot BM25 di utils/archive_search.py)
+SEARCH_COLUMNS = ("title", "description", "clean_text", "topic_query")
+
+# Kolom `articles` yang memengaruhi rollup harian `sentiment_daily` (query-nya dari `article_queries`)
+ROLLUP_COLUMNS = ("published_ts", "sentiment_label", "sentiment_score", "duplicate_of")
+
+# Artikel yang dihitung di rollup; salinan sindikasi tidak dihitung agar satu cerita tidak dihitung berkali-kali
+_ROLLUP_QUALIFIES = ("{row}.published_ts IS NOT NULL AND {row}.sentiment_label IS NOT NULL "
+                     "AND {row}.duplicate_of IS NULL")
+
+
+# Indeks untuk filter yang sering dipakai (arsip per topik/tanggal, sinkronisasi indeks vektor, aspek per artikel)
+_INDEXES = {
+    "idx_articles_topic_published": "articles (topic_query, published_ts)",
+    "idx_articles_published": "articles (published_ts)",
+    "idx_articles_fetched": "articles (fetched_at)",
+    "idx_article_aspects_article": "article_aspects (article_id)",
+    "idx_article_queries_query": "article_queries (topic_query, article_id)",
+    "idx_pipeline_runs_query": "pipeline_runs (topic_query, period, started_at)",
+}
+
+_ready_paths = set()
+_ready_lock = threading.Lock()
+
+
+def init_db(conn):
+    """Membuat tabel bila belum ada dan menambahkan kolom cache analisis yang belum tersedia."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS articles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT,
+            url TEXT UNIQUE,
+            description TEXT,
+            clean_text TEXT,
+            published_date TIMESTAMP,
+            publisher TEXT,
+            sentiment_label TEXT,
+            sentiment_score REAL,
+            summary TEXT,
+            topic_query TEXT,
+            fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS article_aspects (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            article_id INTEGER,
+            aspect TEXT,
+            related_text TEXT,
+            sentiment_label TEXT,
+            sentiment_score REAL,
+            FOREIGN KEY(article_id) REFERENCES articles(id)
+        )
+    """)
+    # Keanggotaan artikel per query pemantauan: query yang tumpang tindih bisa memuat artikel yang sama,
+    # dan artikel dihitung di rollup setiap query tersebut (articles.topic_query hanya query pertama)
+    has_queries = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'article_queries'"
+    ).fetchone() is not None
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS article_queries (
+            article_id INTEGER NOT NULL,
+            topic_query TEXT NOT NULL,
+            PRIMARY KEY (article_id, topic_query),
+            FOREIGN KEY(article_id) REFERENCES articles(id)
+        ) WITHOUT ROWID
+    """)
+    if not has_queries:
+        conn.execute(
+            "INSERT OR IGNORE INTO article_queries (article_id, topic_query) "
+            "SELECT id, topic_query FROM articles WHERE topic_query IS NOT NULL"
+        )
+    # Cache teks lengkap (utils/fulltext.py); dibuat di sini agar arsip dapat membacanya lewat join
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS article_fulltext (
+            url TEXT PRIMARY KEY,
+            html BLOB,
+            text TEXT,
+            error TEXT,
+            fetched_at REAL NOT NULL
+        )
+    """)
+    # Cache embedding dokumen (utils/embedding_store.py)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS document_embeddings (
+            content_hash TEXT NOT NULL,
+            model_name TEXT NOT NULL,
+            dim INTEGER NOT NULL,
+            vector BLOB NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (content_hash, model_name)
+        )
+    """)
+    # Riwayat eksekusi & laporan tersimpan worker headless (utils/report_store.py)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS pipeline_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            topic_query TEXT NOT NULL,
+            period TEXT,
+            started_at REAL NOT NULL,
+            finished_at REAL,
+            status TEXT,
+            n_articles INTEGER,
+            duration_s REAL,
+            stage_timings TEXT,
+            error TEXT
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS stored_reports (
+            topic_query TEXT NOT NULL,
+            period TEXT NOT NULL,
+            run_id INTEGER,
+            created_at REAL NOT NULL,
+            n_articles INTEGER,
+            payload BLOB NOT NULL,
+            PRIMARY KEY (topic_query, period)
+        )
+    """)
+    existing = {row["name"] for row in conn.execute("PRAGMA table_info(articles)")}
+    for column, column_type in _EXTRA_ARTICLE_COLUMNS.items():
+        if column not in existing:
+            conn.execute(f"ALTER TABLE articles ADD COLUMN {column} {column_type}")
+    if "published_ts" not in existing:
+        _backfill_published_ts(conn)
+    for name, target in _INDEXES.items():
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+    init_search_index(conn)
+    init_rollup_tables(conn)
+    conn.commit()
+
+
+def ensure_db(db_path=None):
+    """Menjalankan `init_db` sekali per file DB per proses (sebelum memakai pool baca / thread penulis)."""
+    key = os.path.abspath(db_path or DB_PATH)
+    if key in _ready_paths:
+        return
+    with _ready_lock:
+        if key not in _ready_paths:
+            with closing(get_connection(key)) as conn:
+                init_db(conn)
+            _ready_paths.add(key)
+
+
+def to_published_ts(published_date):
+    """Tanggal RFC-2822 dari GNews ("Fri, 06 Jun 2025 05:03:43 GMT") -> "2025-06-06 05:03:43" (UTC)."""
+    if not published_date:
+        return None
+    try:
+        parsed = parsedate_to_datetime(published_date)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _backfill_published_ts(conn):
+    rows = conn.execute("SELECT id, published_date FROM articles WHERE published_ts IS NULL").fetchall()
+    conn.executemany(
+        "UPDATE articles SET published_ts = ? WHERE id = ?",
+        [(to_published_ts(row["published_date"]), row["id"]) for row in rows],
+    )
+
+
+def init_search_index(conn):
+    """
+    Indeks FTS5 (external content) atas `articles`, dijaga tetap sinkron oleh trigger
+    INSERT/UPDATE/DELETE. Saat pertama kali dibuat, artikel yang sudah ada ikut diindeks.
+    """
+    is_new = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'"
+    ).fetchone() is None
+    columns = ", ".join(SEARCH_COLUMNS)
+    new_values = ", ".join(f"new.{c}" for c in SEARCH_COLUMNS)
+    old_values = ", ".join(f"old.{c}" for c in SEARCH_COLUMNS)
+    conn.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+            {columns}, content='articles', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+            INSERT INTO articles_fts(rowid, {columns}) VALUES (new.id, {new_values});
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+            INSERT INTO articles_fts(articles_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+        END
+    """)
+    # UPSERT artikel menulis ulang semua kolom; FTS hanya disentuh bila nilai kolom yang diindeks
+    # benar-benar berubah (bukan setiap kali artikel disimpan ulang)
+    changed = " OR ".join(f"old.{c} IS NOT new.{c}" for c in SEARCH_COLUMNS)
+    _ensure_trigger(conn, "articles_fts_update", f"""CREATE TRIGGER articles_fts_update AFTER UPDATE OF {columns} ON articles
+        WHEN {changed} BEGIN
+            INSERT INTO articles_fts(articles_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+            INSERT INTO articles_fts(rowid, {columns}) VALUES (new.id, {new_values});
+        END""")
+    if is_new:
+        conn.execute("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')")
+
+
+def _ensure_trigger(conn, name, sql):
+    """Membuat trigger `name`, atau membuatnya ulang bila definisi tersimpannya (DB lama) berbeda dari `sql`."""
+    existing = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?", [name]).fetchone()
+    if existing is not None and existing["sql"] == sql:
+        return False
+    conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+    conn.execute(sql)
+    return True
+
+
+def _rollup_values(row):
+    # Nilai satu artikel di rollup: skor bertanda (sama seperti analysis_engine.signed_sentiment_score)
+    label = f"lower({row}.sentiment_label)"
+    signed = f"(CASE {label} WHEN 'negatif' THEN -{row}.sentiment_score WHEN 'netral' THEN 0.0 ELSE {row}.sentiment_score END)"
+    return signed, f"({label} = 'positif')", f"({label} = 'netral')", f"({label} = 'negatif')"
+
+
+def _rollup_delta(sign, topic, row, source):
+    """
+    Upsert yang menambah (sign=1) atau mengurangi (sign=-1) kontribusi artikel `row` ke rollup `topic`
+    untuk setiap baris `source` (klausa FROM ... WHERE) yang artikelnya memenuhi syarat.
+    """
+    signed, positive, neutral, negative = _rollup_values(row)
+    return f"""
+        INSERT INTO sentiment_daily (topic_query, day, n, score_sum, score_sumsq, n_positive, n_neutral, n_negative)
+        SELECT {topic}, substr({row}.published_ts, 1, 10), {sign}, {sign} * {signed}, {sign} * {signed} * {signed},
+               {sign} * {positive}, {sign} * {neutral}, {sign} * {negative}
+        {source} AND {_ROLLUP_QUALIFIES.format(row=row)}
+        ON CONFLICT(topic_query, day) DO UPDATE SET
+            n = n + excluded.n, score_sum = score_sum + excluded.score_sum, score_sumsq = score_sumsq + excluded.score_sumsq,
+            n_positive = n_positive + excluded.n_positive, n_neutral = n_neutral + excluded.n_neutral,
+            n_negative = n_negative + excluded.n_negative;
+    """
+
+
+def init_rollup_tables(conn):
+    """
+    Rollup harian sentimen per (topic_query, hari UTC): jumlah artikel, jumlah & jumlah kuadrat skor
+    bertanda, dan jumlah per label. Query artikel diambil dari `article_queries`, sehingga artikel yang
+    muncul di beberapa query pemantauan dihitung di masing-masing query. Dijaga trigger pada
+    `article_queries` (keanggotaan) dan `articles` (nilai sentimen), sehingga tren & deteksi event
+    jangka panjang (utils/sentiment_rollups.py) tidak perlu memindai artikel.
+    Trigger yang definisinya berubah (DB lama) dibuat ulang dan rollup dihitung ulang.
+    """
+    rebuild = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sentiment_daily'"
+    ).fetchone() is None
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS sentiment_daily (
+            topic_query TEXT NOT NULL,
+            day TEXT NOT NULL,
+            n INTEGER NOT NULL DEFAULT 0,
+            score_sum REAL NOT NULL DEFAULT 0,
+            score_sumsq REAL NOT NULL DEFAULT 0,
+            n_positive INTEGER NOT NULL DEFAULT 0,
+            n_neutral INTEGER NOT NULL DEFAULT 0,
+            n_negative INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (topic_query, day)
+        )
+    """)
+    # UPSERT artikel menulis ulang semua kolom; rollup hanya disentuh bila nilainya benar-benar berubah
+    changed = " OR ".join(f"old.{c} IS NOT new.{c}" for c in ROLLUP_COLUMNS)
+    columns = ", ".join(ROLLUP_COLUMNS)
+    memberships = "FROM article_queries q WHERE q.article_id = {row}.id"
+    triggers = {
+        "sentiment_daily_query_insert": f"""CREATE TRIGGER sentiment_daily_query_insert AFTER INSERT ON article_queries
+        BEGIN {_rollup_delta(1, "new.topic_query", "a", "FROM articles a WHERE a.id = new.article_id")} END""",
+        "sentiment_daily_query_delete": f"""CREATE TRIGGER sentiment_daily_query_delete AFTER DELETE ON article_queries
+        BEGIN {_rollup_delta(-1, "old.topic_query", "a", "FROM articles a WHERE a.id = old.article_id")} END""",
+        # Keanggotaan dihapus sebelum artikelnya, selagi nilainya masih bisa dibaca trigger di atas
+        "sentiment_daily_article_delete": """CREATE TRIGGER sentiment_daily_article_delete BEFORE DELETE ON articles
+        BEGIN DELETE FROM article_queries WHERE article_id = old.id; END""",
+        "sentiment_daily_update_old": f"""CREATE TRIGGER sentiment_daily_update_old AFTER UPDATE OF {columns} ON articles
+        WHEN {changed} BEGIN {_rollup_delta(-1, "q.topic_query", "old", memberships.format(row="old"))} END""",
+        "sentiment_daily_update_new": f"""CREATE TRIGGER sentiment_daily_update_new AFTER UPDATE OF {columns} ON articles
+        WHEN {changed} BEGIN {_rollup_delta(1, "q.topic_query", "new", memberships.format(row="new"))} END""",
+    }
+    existing = {row["name"] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'sentiment_daily_%'"
+    )}
+    for name in existing - triggers.keys():
+        conn.execute(f"DROP TRIGGER {name}") # Trigger skema lama (rollup per articles.topic_query)
+        rebuild = True
+    for name, sql in triggers.items():
+        rebuild = _ensure_trigger(conn, name, sql) or rebuild
+    if rebuild:
+        rebuild_rollups(conn)
+
+
+def rebuild_rollups(conn):
+    """Menghitung ulang seluruh `sentiment_daily` dari `article_queries` & `articles` (mis. untuk membuang drift float)."""
+    signed, positive, neutral, negative = _rollup_values("a")
+    conn.execute("DELETE FROM sentiment_daily")
+    conn.execute(f"""
+        INSERT INTO sentiment_daily (topic_query, day, n, score_sum, score_sumsq, n_positive, n_neutral, n_negative)
+        SELECT q.topic_query, substr(a.published_ts, 1, 10), COUNT(*), SUM({signed}), SUM({signed} * {signed}),
+               SUM({positive}), SUM({neutral}), SUM({negative})
+        FROM article_queries q
+        JOIN articles a ON a.id = q.article_id
+        WHERE {_ROLLUP_QUALIFIES.format(row="a")}
+        GROUP BY q.topic_query, substr(a.published_ts, 1, 10)
+    """)
+
+
+def load_cached_analysis(urls, model_version, db_path=None):
+    """
+    Mengambil hasil analisis tersimpan untuk daftar URL yang dianalisis dengan `model_version`.
+    Mengembalikan dict url -> sqlite3.Row.
+    """
+    urls = [u for u in urls if u]
+    if not urls:
+        return {}
+    cached = {}
+    ensure_db(db_path)
+    with read_connection(db_path) as conn:
+        # Batasi jumlah parameter per query (SQLite default 999)
+        for i in range(0, len(urls), 500):
+            chunk = urls[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT * FROM articles WHERE model_version = ? AND url IN ({placeholders})",
+                [model_version, *chunk],
+            ).fetchall()
+            cached.update({row["url"]: row for row in rows})
+    return cached
+
+
+def hydrate_cached_results(news_items, model_version, db_path=None, summary_key=None):
+    """
+    Mengisi `sentiment`, `entities` (dan `summary` bila dibuat dengan `summary_key` yang sama)
+    pada artikel yang sudah tersimpan dengan model dan teks yang sama.
+    Mengembalikan jumlah artikel yang terisi dari cache.
+    """
+    cached = load_cached_analysis([a.get('url') for a in news_items], model_version, db_path)
+    hits = 0
+    for article in news_items:
+        row = cached.get(article.get('url'))
+        if row is None or row["entities_json"] is None or row["clean_text"] != article.get('clean_text'):
+            continue
+        article['sentiment'] = {'label': row["sentiment_label"], 'score': row["sentiment_score"]}
+        article['entities'] = json.loads(row["entities_json"])
+        if row["summary"] and row["summary_key"] == summary_key:
+            article['summary'] = row["summary"]
+            article['summary_key'] = row["summary_key"]
+        hits += 1
+    return hits
+
+
+def _article_row(article, topic_query, model_version):
+    sentiment = article.get('sentiment') or {}
+    publisher = article.get('publisher') or {}
+    return (
+        article.get('title'),
+        article.get('url'),
+        article.get('description'),
+        article.get('clean_text'),
+        article.get('published date'),
+        publisher.get('title') if isinstance(publisher, dict) else publisher,
+        sentiment.get('label'),
+        float(sentiment['score']) if sentiment.get('score') is not None else None,
+        article.get('summary'),
+        topic_query,
+        json.dumps(article.get('entities', []), default=float),
+        model_version,
+        article.get('summary_key') if article.get('summary') else None,
+        to_published_ts(article.get('published date')),
+        article.get('duplicate_of'),
+    )
+
+
+# Upsert per URL; ringkasan lama dipertahankan selama clean_text tidak berubah, dan topic_query
+# (query pertama yang menyimpan artikel, untuk tampilan & FTS) tidak ditimpa query lain
+_UPSERT_ARTICLE_SQL = """
+    INSERT INTO articles (
+        title, url, description, clean_text, published_date, publisher,
+        sentiment_label, sentiment_score, summary, topic_query, entities_json, model_version,
+        summary_key, published_ts, duplicate_of
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(url) DO UPDATE SET
+        title = excluded.title,
+        description = excluded.description,
+        clean_text = excluded.clean_text,
+        published_date = excluded.published_date,
+        published_ts = excluded.published_ts,
+        publisher = excluded.publisher,
+        sentiment_label = excluded.sentiment_label,
+        sentiment_score = excluded.sentiment_score,
+        summary = CASE
+            WHEN excluded.summary IS NULL AND excluded.clean_text = articles.clean_text
+            THEN articles.summary
+            ELSE excluded.summary
+        END,
+        summary_key = CASE
+            WHEN excluded.summary IS NULL AND excluded.clean_text = articles.clean_text
+            THEN articles.summary_key
+            ELSE excluded.summary_key
+        END,
+        topic_query = COALESCE(articles.topic_query, excluded.topic_query),
+        entities_json = excluded.entities_json,
+        model_version = excluded.model_version,
+        duplicate_of = excluded.duplicate_of,
+        fetched_at = CURRENT_TIMESTAMP
+"""
+
+_ADD_MEMBERSHIP_SQL = """
+    INSERT OR IGNORE INTO article_queries (article_id, topic_query)
+    SELECT id, ? FROM articles WHERE url = ?
+"""
+
+
+def save_analysis_results(news_items, topic_query, model_version, db_path=None):
+    """
+    Upsert artikel beserta hasil sentimen/NER/ringkasan ke tabel `articles` (kunci: URL).
+    Ringkasan lama (beserta summary_key-nya) dipertahankan selama clean_text tidak berubah.
+    Artikel dicatat sebagai anggota `topic_query` di `article_queries` (tanpa melepas query lain);
+    dengan `topic_query=None` (mis. hasil pencarian arsip) keanggotaan tidak berubah.
+    """
+    rows = [_article_row(a, topic_query, model_version) for a in news_items if a.get('url') and 'sentiment' in a]
+    if not rows:
+        return 0
+
+    def write(conn):
+        conn.executemany(_UPSERT_ARTICLE_SQL, rows)
+        if topic_query is not None:
+            conn.executemany(_ADD_MEMBERSHIP_SQL, [(topic_query, row[1]) for row in rows])
+
+    ensure_db(db_path)
+    run_write(write, db_path)
+    return len(rows)
+
+
+def load_cached_summaries(articles, summary_key, db_path=None):
+    """
+    Mengambil ringkasan tersimpan yang dibuat dengan `summary_key` untuk artikel yang
+    clean_text-nya masih sama. Mengembalikan dict url -> ringkasan.
+    """
+    text_by_url = {a['url']: a.get('clean_text') for a in articles if a.get('url')}
+    urls = list(text_by_url)
+    summaries = {}
+    if not urls:
+        return summaries
+    ensure_db(db_path)
+    with read_connection(db_path) as conn:
+        for i in range(0, len(urls), 500):
+            chunk = urls[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT url, clean_text, summary FROM articles "
+                f"WHERE summary_key = ? AND summary IS NOT NULL AND url IN ({placeholders})",
+                [summary_key, *chunk],
+            ).fetchall()
+            summaries.update({row["url"]: row["summary"] for row in rows if row["clean_text"] == text_by_url[row["url"]]})
+    return summaries
+
+
+def save_summaries(summaries_by_url, summary_key, db_path=None):
+    """Menyimpan ringkasan (dict url -> ringkasan) ke kolom `articles.summary` artikel yang sudah ada."""
+    rows = [(summary, summary_key, url) for url, summary in summaries_by_url.items() if summary]
+    if not rows:
+        return 0
+    ensure_db(db_path)
+    run_write(
+        lambda conn: conn.executemany("UPDATE articles SET summary = ?, summary_key = ? WHERE url = ?", rows).rowcount,
+        db_path,
+    )
+    return len(rows)
@@ -0,0 +1,75 @@
+# utils/summaries.py
+"""
+Ringkasan artikel yang dibuat sekali secara batch di latar belakang.
+
+Ringkasan di-memo per (URL, model peringkas, max_length, min_length): kombinasi model dan
+parameter disimpan sebagai `summary_key` bersama ringkasan di kolom `articles.summary`,
+sehingga tampilan detail cukup membaca `article['summary']` tanpa memanggil T5 saat rerun.
+"""
+import os
+
+from utils.inference import run_summarization
+from utils.storage import load_cached_summaries, save_summaries
+from utils.dedup import propagate_cluster_results
+
+SUMMARY_MAX_LENGTH = 150
+SUMMARY_MIN_LENGTH = 30
+# Generasi T5 jauh lebih berat dari klasifikasi, jadi batch-nya lebih kecil
+SUMMARY_BATCH_SIZE = int(os.getenv("NEWS_INTEL_SUMMARY_BATCH_SIZE", "4"))
+
+
+def summary_cache_key(max_length=SUMMARY_MAX_LENGTH, min_length=SUMMARY_MIN_LENGTH):
+    """Kunci memo ringkasan: model peringkas + parameter panjang ringkasan."""
+    from models.loader import SUMMARIZER_MODEL_ID
+    return f"{SUMMARIZER_MODEL_ID}|{max_length}|{min_length}"
+
+
+def summarize_articles(news_items, summarizer, batch_size=SUMMARY_BATCH_SIZE, max_length=SUMMARY_MAX_LENGTH,
+                       min_length=SUMMARY_MIN_LENGTH, progress=None, db_path=None):
+    """
+    Mengisi `summary` pada artikel yang belum memiliki ringkasan dengan kunci yang sama:
+    pertama dari news_intelligence.db, sisanya diringkas per batch lalu disimpan.
+    Salinan hampir-duplikat (`duplicate_of`) tidak diringkas ulang; ringkasan perwakilannya disalin.
+    `progress(done, total)` dipanggil setiap satu batch selesai. Mengembalikan jumlah ringkasan baru.
+    """
+    key = summary_cache_key(max_length, min_length)
+    pending = [
+        a for a in news_items
+        if not a.get('duplicate_of') and not (a.get('summary') and a.get('summary_key') == key)
+    ]
+    if not pending:
+        propagate_cluster_results(news_items)
+        return 0
+
+    stored = load_cached_summaries(pending, key, db_path)
+    for article in pending:
+        if article.get('url') in stored:
+            article['summary'] = stored[article['url']]
+            article['summary_key'] = key
+    pending = [a for a in pending if a.get('summary_key') != key]
+    if not pending:
+        propagate_cluster_results(news_items)
+        return 0
+
+    summaries = run_summarization(
+        summarizer, [a['clean_text'] for a in pending],
+        batch_size=batch_size, max_length=max_length, min_length=min_length, progress=progress,
+    )
+    new_summaries = {}
+    for article, summary in zip(pending, summaries):
+        if summary is None:
+            article['summary_error'] = True # Tidak disimpan, dicoba lagi pada pass berikutnya
+            continue
+        article['summary'] = summary
+        article['summary_key'] = key
+        article.pop('summary_error', None)
+        if article.get('url'):
+            new_summaries[article['url']] = summary
+    generated = len(new_summaries)
+    propagate_cluster_results(news_items)
+    # Salinan ikut disimpan agar laporan berikutnya langsung mendapat ringkasannya dari DB
+    for article in news_items:
+        if article.get('duplicate_of') and article.get('url') and article.get('summary_key') == key:
+            new_summaries.setdefault(article['url'], article['summary'])
+    save_summaries(new_summaries, key, db_path)
+    return generated
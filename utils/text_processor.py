@@ -1,5 +1,6 @@
 # utils/text_processor.py
 import re
+from bisect import bisect_right
 
 def clean_text_for_analysis(title, description):
     """
@@ -8,6 +9,13 @@ def clean_text_for_analysis(title, description):
     full_text = f"{title}. {re.sub('<[^<]+?>', '', description or '')}"
     return ' '.join(full_text.split()).strip() # Menghapus spasi berlebih
 
+def article_body(article):
+    """
+    Badan teks artikel untuk analisis: teks lengkap hasil utils/fulltext.py bila ada,
+    jika tidak deskripsi dari feed.
+    """
+    return article.get('full_text') or article.get('description', '')
+
 def visualize_ner(text, entities):
     """
     Menyorot entitas yang ditemukan dalam teks dengan warna berbeda.
@@ -40,4 +48,35 @@ def visualize_ner(text, entities):
         
     # Add any remaining text after the last entity
     highlighted_text += text[last_idx:]
-    return highlighted_text
\ No newline at end of file
+    return highlighted_text
+
+def split_sentences_with_offsets(text):
+    """
+    Memecah teks menjadi kalimat dalam satu kali jalan.
+    Mengembalikan list tuple (start, end) offset karakter setiap kalimat (tanpa spasi di tepi).
+    """
+    spans = []
+    for match in re.finditer(r'[^.!?]+', text):
+        start, end = match.start(), match.end()
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        if start < end:
+            spans.append((start, end))
+    return spans
+
+
+def assign_entities_to_sentences(sentence_spans, entities):
+    """
+    Menempatkan setiap entitas NER ke kalimat yang memuatnya berdasarkan offset start/end.
+    Menggunakan bisect atas offset awal kalimat (O(E log S)), bukan pencarian substring.
+    Entitas yang melewati batas kalimat diabaikan. Mengembalikan list entitas per kalimat.
+    """
+    sentence_starts = [start for start, _ in sentence_spans]
+    buckets = [[] for _ in sentence_spans]
+    for entity in sorted(entities, key=lambda x: x['start']):
+        idx = bisect_right(sentence_starts, entity['start']) - 1
+        if idx >= 0 and entity['end'] <= sentence_spans[idx][1]:
+            buckets[idx].append(entity)
+    return buckets
@@ -0,0 +1,255 @@
+# utils/topic_service.py
+"""
+Layanan topic modeling yang aman dipakai banyak sesi sekaligus.
+
+Sebelumnya satu objek BERTopic di-cache dan di-`fit_transform` ulang oleh setiap
+sesi, sehingga sesi yang berjalan bersamaan bisa saling menimpa topik. Sekarang:
+- embedding model (sentence-transformer) tetap satu dan dipakai bersama (read-only);
+- setiap permintaan membuat instance BERTopic ringan sendiri (UMAP/HDBSCAN/vectorizer);
+- jumlah fit yang berjalan bersamaan dibatasi semaphore (NEWS_INTEL_MAX_TOPIC_FITS),
+  sisanya menunggu giliran.
+Hasil dikembalikan sebagai data biasa, bukan objek model yang dibagi.
+
+Mode inkremental (NEWS_INTEL_TOPIC_MODE=incremental): setiap query yang dipantau
+memiliki model topik online persisten (data/topic_models/). Artikel baru ditambahkan
+lewat `partial_fit`, lalu artikel laporan hanya di-`transform` ke topik yang sudah ada,
+sehingga ID topik stabil dari hari ke hari dan laporan harian tidak melatih ulang model.
+Dashboard dan worker headless bisa memperbarui model query yang sama: langkah
+muat-latih-simpan dijaga kunci file per query dan model dibaca ulang dari disk bila
+file-nya berubah, sehingga pelatihan dari proses lain tidak tertimpa.
+"""
+import os
+import pickle
+import hashlib
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.file_lock import file_lock
+
+MAX_CONCURRENT_FITS = int(os.getenv("NEWS_INTEL_MAX_TOPIC_FITS", "2"))
+_fit_slots = threading.BoundedSemaphore(MAX_CONCURRENT_FITS)
+
+BATCH_TOPIC_MODE, INCREMENTAL_TOPIC_MODE = "batch", "incremental"
+TOPIC_MODE = os.getenv("NEWS_INTEL_TOPIC_MODE", BATCH_TOPIC_MODE)
+ONLINE_MODEL_DIR = Path(os.getenv("NEWS_INTEL_TOPIC_MODEL_DIR", "data/topic_models"))
+
+# Model online per query yang sudah dimuat di proses ini: slug -> (tanda file, entri);
+# tanda file (mtime, ukuran) menentukan kapan entri harus dibaca ulang dari disk
+_online_entries = {}
+_online_locks = {}
+_online_lock = threading.Lock()
+
+
+def run_topic_modeling(documents, embeddings=None, model_factory=None, n_keywords=5):
+    """
+    Melatih model topik baru (milik permintaan ini saja) pada `documents`.
+    `model_factory()` harus mengembalikan instance baru ber-API BERTopic; default
+    `models.loader.create_topic_model`.
+    Mengembalikan dict:
+    - 'topics': list topic_id per dokumen
+    - 'topic_names': dict topic_id -> nama topik
+    - 'topic_info_df': DataFrame info topik (tanpa outlier -1), kolom Topik_Utama & Jumlah_Artikel
+    - 'topic_keywords': DataFrame kata kunci utama per topik
+    """
+    if model_factory is None:
+        from models.loader import create_topic_model
+        model_factory = create_topic_model
+
+    with _fit_slots:
+        topic_model = model_factory()
+        topics, probabilities = topic_model.fit_transform(documents, embeddings=embeddings)
+        topic_info = topic_model.get_topic_info()
+        keywords = _topic_keywords(topic_model, topic_info['Topic'], n_keywords)
+    return _topic_result(topics, topic_info, keywords)
+
+
+def _topic_keywords(topic_model, topic_ids, n_keywords):
+    return {
+        topic_id: [word for word, score in (topic_model.get_topic(topic_id) or [])][:n_keywords]
+        for topic_id in topic_ids if topic_id != -1
+    }
+
+
+def _topic_result(topics, topic_info, keywords):
+    topic_names = dict(zip(topic_info['Topic'], topic_info['Name']))
+    topic_info = topic_info[topic_info['Topic'] != -1].copy() # Filter topic -1 (outliers)
+    topic_info.rename(columns={'Name': 'Topik_Utama', 'Count': 'Jumlah_Artikel'}, inplace=True)
+    topic_keywords = pd.DataFrame(
+        [{'Topic': topic_id, 'Keywords': ", ".join(words)} for topic_id, words in keywords.items()]
+    )
+    return {
+        'topics': list(topics),
+        'topic_names': topic_names,
+        'topic_info_df': topic_info,
+        'topic_keywords': topic_keywords,
+    }
+
+
+# --- Mode inkremental: model topik online per query ---
+
+def _query_slug(query):
+    """Nama file model untuk query (tidak peka huruf besar/kecil & spasi di tepi)."""
+    return hashlib.sha1(query.strip().lower().encode("utf-8")).hexdigest()[:16]
+
+
+def _query_lock(slug):
+    with _online_lock:
+        return _online_locks.setdefault(slug, threading.Lock())
+
+
+def _model_path(slug):
+    return ONLINE_MODEL_DIR / f"{slug}.pkl"
+
+
+def _file_signature(path):
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _load_online_entry(slug, model_factory=None):
+    """
+    Entri model online: {'model', 'fitted', 'seen' (hash dokumen yang sudah dilatih),
+    'pending_docs', 'pending_embeddings'}. Dibaca dari disk bila file berubah sejak dimuat
+    (mis. dilatih proses lain); jika belum ada, dibuat baru dengan `model_factory` (None: tidak dibuat).
+    """
+    path = _model_path(slug)
+    signature = _file_signature(path)
+    cached = _online_entries.get(slug)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    entry = None
+    if signature is not None:
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        except Exception:
+            entry = None # File rusak/versi library berbeda: mulai ulang model untuk query ini
+    if entry is None:
+        if model_factory is None:
+            return None
+        entry = {'model': model_factory(), 'fitted': False, 'seen': set(),
+                 'pending_docs': [], 'pending_embeddings': []}
+    _online_entries[slug] = (signature, entry)
+    return entry
+
+
+def _save_online_entry(slug, entry):
+    ONLINE_MODEL_DIR.mkdir(parents=True, exist_ok=True)
+    path = _model_path(slug)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path) # Atomik: pembaca tidak pernah melihat file setengah jadi
+    _online_entries[slug] = (_file_signature(path), entry)
+
+
+def _min_partial_batch():
+    """IncrementalPCA & MiniBatchKMeans butuh minimal sebanyak komponen/cluster dokumen per batch."""
+    from models.loader import ONLINE_TOPIC_COUNT, ONLINE_TOPIC_DIMENSIONS
+    return max(ONLINE_TOPIC_COUNT, ONLINE_TOPIC_DIMENSIONS)
+
+
+def _ensure_embeddings(documents, embeddings):
+    if embeddings is not None:
+        return np.asarray(embeddings, dtype=np.float32)
+    from models.loader import get_model
+    return get_model("embedding").encode(documents, convert_to_numpy=True, show_progress_bar=False).astype(np.float32)
+
+
+def update_online_topic_model(query, documents, embeddings=None, model_factory=None):
+    """
+    Menambahkan dokumen yang belum pernah dilihat ke model topik online milik `query`
+    lewat `partial_fit`. Dokumen ditampung dulu sampai cukup satu batch minimum.
+    Mengembalikan jumlah dokumen yang benar-benar dilatih pada pemanggilan ini.
+    """
+    from utils.embedding_store import content_hash
+    if model_factory is None:
+        from models.loader import create_online_topic_model
+        model_factory = create_online_topic_model
+
+    slug = _query_slug(query)
+    # Kunci thread (proses ini) lalu kunci file (proses lain); entri dibaca ulang di dalam kunci
+    with _query_lock(slug), file_lock(ONLINE_MODEL_DIR / f"{slug}.lock"):
+        entry = _load_online_entry(slug, model_factory)
+        queued = set(content_hash(doc) for doc in entry['pending_docs'])
+        new_idx = []
+        for idx, doc in enumerate(documents):
+            h = content_hash(doc)
+            if h not in entry['seen'] and h not in queued:
+                queued.add(h)
+                new_idx.append(idx)
+        if not new_idx and not entry['pending_docs']:
+            return 0
+
+        if new_idx:
+            vectors = _ensure_embeddings(documents, embeddings)
+            entry['pending_docs'].extend(documents[i] for i in new_idx)
+            entry['pending_embeddings'].extend(vectors[i] for i in new_idx)
+
+        trained = 0
+        if len(entry['pending_docs']) >= _min_partial_batch():
+            batch_docs = entry['pending_docs']
+            with _fit_slots:
+                entry['model'].partial_fit(batch_docs, embeddings=np.vstack(entry['pending_embeddings']))
+            entry['seen'].update(content_hash(doc) for doc in batch_docs)
+            entry['fitted'] = True
+            entry['pending_docs'], entry['pending_embeddings'] = [], []
+            trained = len(batch_docs)
+        _save_online_entry(slug, entry)
+        return trained
+
+
+def assign_online_topics(query, documents, embeddings=None, n_keywords=5):
+    """
+    Menempatkan `documents` ke topik yang sudah ada di model online `query` (hanya `transform`).
+    Mengembalikan dict berbentuk sama dengan `run_topic_modeling`, dengan Jumlah_Artikel
+    dihitung dari dokumen laporan ini; None jika model query belum pernah dilatih.
+    """
+    slug = _query_slug(query)
+    with _query_lock(slug):
+        # File model diganti secara atomik, jadi membaca tidak perlu kunci file
+        entry = _load_online_entry(slug)
+        if entry is None or not entry['fitted']:
+            return None
+        topic_model = entry['model']
+        topics, _ = topic_model.transform(documents, embeddings=_ensure_embeddings(documents, embeddings))
+        topics = [int(t) for t in topics]
+        topic_info = topic_model.get_topic_info()
+        keywords = _topic_keywords(topic_model, sorted(set(topics)), n_keywords)
+
+    # Hanya topik yang muncul di laporan ini, dengan jumlah artikel laporan (bukan total historis)
+    counts = pd.Series(topics).value_counts()
+    topic_info = topic_info[topic_info['Topic'].isin(counts.index)].copy()
+    topic_info['Count'] = topic_info['Topic'].map(counts).astype(int)
+    topic_info = topic_info.sort_values('Count', ascending=False)
+    return _topic_result(topics, topic_info, keywords)
+
+
+def run_online_topic_modeling(query, documents, embeddings=None, model_factory=None, n_keywords=5):
+    """
+    Mode inkremental untuk satu laporan: perbarui model online `query` dengan dokumen baru,
+    lalu tempatkan semua dokumen laporan ke topik yang ada. Selama model query belum
+    terlatih (dokumen belum cukup satu batch), laporan memakai `run_topic_modeling` biasa.
+    """
+    embeddings = _ensure_embeddings(documents, embeddings)
+    update_online_topic_model(query, documents, embeddings)
+    result = assign_online_topics(query, documents, embeddings, n_keywords=n_keywords)
+    if result is None:
+        return run_topic_modeling(documents, embeddings=embeddings, model_factory=model_factory, n_keywords=n_keywords)
+    return result
+
+
+def reset_online_topic_model(query):
+    """Menghapus model topik online `query` (memori & disk); laporan berikutnya mulai dari nol."""
+    slug = _query_slug(query)
+    with _query_lock(slug), file_lock(ONLINE_MODEL_DIR / f"{slug}.lock"):
+        _online_entries.pop(slug, None)
+        path = _model_path(slug)
+        if path.exists():
+            path.unlink()
@@ -0,0 +1,327 @@
+# utils/vector_index.py
+"""
+Indeks vektor persisten untuk pencarian semantik atas arsip artikel.
+
+Setiap artikel di news_intelligence.db di-embed satu kali dengan sentence-transformer yang
+juga dipakai BERTopic (lewat cache di utils/embedding_store.py). Vektor ternormalisasi
+disimpan dalam matriks float32 memory-mapped (data/vector_index/vectors.npy) dengan baris ke-i
+= articles.id i, sehingga pencarian cukup satu perkalian matriks-vektor + argpartition top-k.
+
+Untuk arsip besar (>= NEWS_INTEL_IVF_MIN_ROWS baris) dipakai indeks IVF sederhana:
+vektor dikelompokkan ke sejumlah centroid (k-means sferis) dan query hanya memindai
+`NEWS_INTEL_IVF_NPROBE` kelompok terdekat.
+
+Dashboard dan worker headless sama-sama menyinkronkan indeks: sinkronisasi dijaga kunci
+file (data/vector_index/index.lock) selain lock thread, dan meta dibaca ulang dari disk di
+dalam kunci. Pencarian tidak mengunci; file diganti secara atomik (os.replace).
+"""
+import os
+import json
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from utils.storage import ensure_db, read_connection, DB_PATH
+from utils.file_lock import file_lock
+
+INDEX_DIR = Path(os.getenv("NEWS_INTEL_VECTOR_INDEX_DIR", "data/vector_index"))
+IVF_MIN_ROWS = int(os.getenv("NEWS_INTEL_IVF_MIN_ROWS", "50000"))
+IVF_NPROBE = int(os.getenv("NEWS_INTEL_IVF_NPROBE", "8"))
+SYNC_BATCH_SIZE = 256
+
+_index_lock = threading.Lock()
+
+
+def _paths():
+    return {
+        'meta': INDEX_DIR / "meta.json",
+        'vectors': INDEX_DIR / "vectors.npy",
+        'present': INDEX_DIR / "present.npy",
+        'hashes': INDEX_DIR / "hashes.npy", # hash clean_text per baris, untuk mendeteksi artikel yang berubah
+        'centroids': INDEX_DIR / "ivf_centroids.npy",
+        'lists': INDEX_DIR / "ivf_lists.npy",
+        'lock': INDEX_DIR / "index.lock",
+    }
+
+
+def _text_hash(text):
+    from utils.embedding_store import content_hash
+    return np.uint64(int(content_hash(text or "")[:16], 16))
+
+
+def _load_meta(db_path, model_name):
+    path = _paths()['meta']
+    if path.exists():
+        meta = json.loads(path.read_text())
+        if meta.get('db_path') == db_path and meta.get('model') == model_name:
+            return meta
+    # Indeks belum ada, atau dibuat untuk database/model lain: mulai dari awal
+    for name, p in _paths().items():
+        if name != 'lock' and p.exists():
+            p.unlink()
+    return {'db_path': db_path, 'model': model_name, 'dim': None, 'capacity': 0,
+            'synced_at': None, 'rows': 0, 'ivf_rows': 0}
+
+
+def _save_meta(meta):
+    INDEX_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = _paths()['meta'].with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(meta))
+    os.replace(tmp_path, _paths()['meta'])
+
+
+def _ensure_capacity(meta, max_id, dim):
+    """Memperbesar matriks memmap (x2) bila articles.id terbesar melewati kapasitasnya."""
+    needed = max_id + 1
+    if meta['capacity'] >= needed:
+        return
+    capacity = max(needed, meta['capacity'] * 2, 1024)
+    paths = _paths()
+    INDEX_DIR.mkdir(parents=True, exist_ok=True)
+    for name, dtype, shape in (('vectors', np.float32, (capacity, dim)), ('present', np.bool_, (capacity,)),
+                               ('hashes', np.uint64, (capacity,))):
+        tmp_path = paths[name].with_suffix(".grow.npy")
+        grown = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=dtype, shape=shape)
+        if meta['capacity']:
+            old = np.load(paths[name], mmap_mode='r')
+            grown[:len(old)] = old
+            del old
+        grown.flush()
+        del grown
+        os.replace(tmp_path, paths[name])
+    meta['capacity'], meta['dim'] = capacity, dim
+
+
+def _normalize(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+
+def sync_vector_index(db_path=None, progress=None):
+    """
+    Menambahkan/memperbarui vektor artikel yang baru atau berubah sejak sinkronisasi terakhir
+    (berdasarkan `fetched_at` dan hash clean_text). Mengembalikan jumlah baris yang di-embed.
+    """
+    from models.loader import get_model, EMBEDDING_MODEL_ID
+    from utils.embedding_store import get_or_compute_embeddings
+
+    db_path = os.path.abspath(db_path or DB_PATH)
+    # Lock thread untuk proses ini, kunci file untuk proses lain (worker/dashboard)
+    with _index_lock, file_lock(_paths()['lock']):
+        meta = _load_meta(db_path, EMBEDDING_MODEL_ID)
+        ensure_db(db_path)
+        with read_connection(db_path) as conn:
+            sync_started = conn.execute("SELECT CURRENT_TIMESTAMP").fetchone()[0]
+            if meta['synced_at']:
+                rows = conn.execute(
+                    "SELECT id, clean_text FROM articles WHERE fetched_at >= ? AND clean_text IS NOT NULL",
+                    [meta['synced_at']],
+                ).fetchall()
+            else:
+                rows = conn.execute("SELECT id, clean_text FROM articles WHERE clean_text IS NOT NULL").fetchall()
+
+        changed = _changed_rows(meta, rows)
+        for start in range(0, len(changed), SYNC_BATCH_SIZE):
+            batch = changed[start:start + SYNC_BATCH_SIZE]
+            ids = np.array([article_id for article_id, _ in batch])
+            texts = [text for _, text in batch]
+            vectors = _normalize(get_or_compute_embeddings(texts, get_model("embedding"), EMBEDDING_MODEL_ID))
+            _ensure_capacity(meta, int(ids.max()), vectors.shape[1])
+            matrix = np.load(_paths()['vectors'], mmap_mode='r+')
+            present = np.load(_paths()['present'], mmap_mode='r+')
+            hashes = np.load(_paths()['hashes'], mmap_mode='r+')
+            matrix[ids] = vectors
+            present[ids] = True
+            hashes[ids] = [_text_hash(text) for text in texts]
+            for array in (matrix, present, hashes):
+                array.flush()
+            meta['rows'] = int(present.sum())
+            del matrix, present, hashes
+            if meta.get('ivf_rows'):
+                _assign_to_lists(ids, vectors)
+            if progress:
+                progress(min(start + SYNC_BATCH_SIZE, len(changed)), len(changed))
+
+        meta['synced_at'] = sync_started
+        if meta['rows'] >= IVF_MIN_ROWS and meta['rows'] >= 2 * meta.get('ivf_rows', 0):
+            # IVF dibangun ulang setiap ukuran arsip berlipat dua agar centroid tetap representatif
+            meta['ivf_rows'] = build_ivf_index(meta)
+        _save_meta(meta)
+        return len(changed)
+
+
+def _changed_rows(meta, rows):
+    """Baris (id, clean_text) yang belum ada di indeks atau teksnya berubah."""
+    if not meta['capacity']:
+        return [(row["id"], row["clean_text"]) for row in rows]
+    present = np.load(_paths()['present'], mmap_mode='r')
+    hashes = np.load(_paths()['hashes'], mmap_mode='r')
+    changed = []
+    for row in rows:
+        article_id = row["id"]
+        if article_id >= meta['capacity'] or not present[article_id] or hashes[article_id] != _text_hash(row["clean_text"]):
+            changed.append((article_id, row["clean_text"]))
+    return changed
+
+
+def build_ivf_index(meta, n_lists=None, iterations=10, sample_size=100000, seed=0):
+    """
+    Membangun indeks IVF: k-means sferis (sampel vektor) lalu setiap baris ditempatkan ke
+    centroid terdekat. Mengembalikan jumlah baris yang diindeks.
+    """
+    paths = _paths()
+    matrix = np.load(paths['vectors'], mmap_mode='r')
+    present_ids = np.flatnonzero(np.load(paths['present'], mmap_mode='r'))
+    n_lists = n_lists or max(1, int(np.sqrt(len(present_ids))))
+    rng = np.random.default_rng(seed)
+    sample = matrix[np.sort(rng.choice(present_ids, size=min(sample_size, len(present_ids)), replace=False))]
+    centroids = sample[rng.choice(len(sample), size=min(n_lists, len(sample)), replace=False)].copy()
+    for _ in range(iterations):
+        assignment = np.argmax(sample @ centroids.T, axis=1)
+        for list_id in range(len(centroids)):
+            members = sample[assignment == list_id]
+            if len(members):
+                centroids[list_id] = members.mean(axis=0)
+        centroids = _normalize(centroids)
+    np.save(paths['centroids'], centroids)
+
+    lists = np.lib.format.open_memmap(paths['lists'], mode='w+', dtype=np.int32, shape=(meta['capacity'],))
+    lists[:] = -1
+    for start in range(0, len(present_ids), 50000):
+        ids = present_ids[start:start + 50000]
+        lists[ids] = np.argmax(matrix[ids] @ centroids.T, axis=1)
+    lists.flush()
+    return len(present_ids)
+
+
+def _assign_to_lists(ids, vectors):
+    paths = _paths()
+    centroids = np.load(paths['centroids'])
+    lists = np.load(paths['lists'], mmap_mode='r+')
+    if len(lists) <= ids.max():
+        # Matriks sudah membesar sejak IVF dibangun: perbesar juga daftar IVF
+        grown = np.full(len(np.load(paths['present'], mmap_mode='r')), -1, dtype=np.int32)
+        grown[:len(lists)] = lists
+        del lists
+        np.save(paths['lists'], grown)
+        lists = np.load(paths['lists'], mmap_mode='r+')
+    lists[ids] = np.argmax(vectors @ centroids.T, axis=1)
+    lists.flush()
+
+
+def _top_k(scores, candidate_ids, k):
+    if len(candidate_ids) > k:
+        top = np.argpartition(-scores, k)[:k]
+    else:
+        top = np.arange(len(candidate_ids))
+    top = top[np.argsort(-scores[top])]
+    return candidate_ids[top], scores[top]
+
+
+def _candidate_ids(query_vector, allowed_ids=None):
+    """ID baris yang dipindai: semua baris terisi, atau hanya kelompok IVF terdekat bila tersedia."""
+    paths = _paths()
+    present = np.load(paths['present'], mmap_mode='r')
+    if paths['lists'].exists() and paths['centroids'].exists():
+        centroids = np.load(paths['centroids'])
+        probes = np.argsort(-(centroids @ query_vector))[:IVF_NPROBE]
+        lists = np.load(paths['lists'], mmap_mode='r')
+        candidates = np.flatnonzero(np.isin(lists, probes))
+    else:
+        candidates = np.flatnonzero(present)
+    if allowed_ids is not None:
+        candidates = np.intersect1d(candidates, allowed_ids, assume_unique=True)
+    return candidates
+
+
+def _allowed_ids(conn, start_ts, end_ts):
+    sql, params = "SELECT id FROM articles WHERE 1 = 1", []
+    if start_ts:
+        sql += " AND published_ts >= ?"
+        params.append(start_ts)
+    if end_ts:
+        sql += " AND published_ts < ?"
+        params.append(end_ts)
+    return np.array(sorted(row["id"] for row in conn.execute(sql, params)), dtype=np.int64)
+
+
+def semantic_search(text=None, article_id=None, k=20, start_date=None, end_date=None, db_path=None):
+    """
+    Mencari artikel arsip yang paling mirip (cosine) dengan pertanyaan `text` atau dengan
+    artikel `article_id` (artikel itu sendiri tidak ikut dikembalikan).
+    `start_date`/`end_date` (inklusif) memfilter tanggal publikasi sebelum top-k.
+    Mengembalikan list artikel berformat GNews dengan tambahan 'similarity' dan 'archive_id'.
+    Indeks tidak disinkronkan per query (pipeline laporan menyinkronkannya setelah setiap penyimpanan);
+    hanya arsip yang belum pernah diindeks dibangun sekali di sini.
+    """
+    from models.loader import get_model
+    from utils.archive_search import _date_bound
+
+    paths = _paths()
+    if not paths['meta'].exists():
+        sync_vector_index(db_path)
+    if not paths['present'].exists():
+        return []
+    matrix = np.load(paths['vectors'], mmap_mode='r')
+
+    if article_id is not None:
+        if article_id >= len(matrix):
+            return []
+        query_vector = np.array(matrix[article_id])
+    elif text:
+        encoded = get_model("embedding").encode([text], convert_to_numpy=True, show_progress_bar=False)
+        query_vector = _normalize(encoded.astype(np.float32))[0]
+    else:
+        return []
+
+    db_path = db_path or DB_PATH
+    ensure_db(db_path)
+    with read_connection(db_path) as conn:
+        allowed = None
+        if start_date or end_date:
+            allowed = _allowed_ids(conn, _date_bound(start_date), _date_bound(end_date, end=True))
+        candidates = _candidate_ids(query_vector, allowed)
+        # present/lists bisa lebih baru (lebih besar) dari matriks yang sudah dibuka bila proses lain baru saja menyinkronkan
+        candidates = candidates[candidates < len(matrix)]
+        if article_id is not None:
+            candidates = candidates[candidates != article_id]
+        if not len(candidates):
+            return []
+        # Skor diproses per blok agar memmap tidak dimuat sekaligus ke memori
+        scores = np.concatenate([
+            matrix[candidates[i:i + 50000]] @ query_vector for i in range(0, len(candidates), 50000)
+        ])
+        top_ids, top_scores = _top_k(scores, candidates, k)
+
+        placeholders = ",".join("?" * len(top_ids))
+        rows = conn.execute(
+            f"SELECT a.id, a.title, a.url, a.description, a.published_date, a.publisher, f.text AS full_text "
+            f"FROM articles a LEFT JOIN article_fulltext f ON f.url = a.url WHERE a.id IN ({placeholders})",
+            [int(i) for i in top_ids],
+        ).fetchall()
+    by_id = {row["id"]: row for row in rows}
+    return [
+        {
+            'title': by_id[i]["title"],
+            'description': by_id[i]["description"],
+            'full_text': by_id[i]["full_text"], # Teks lengkap tersimpan (lihat utils/archive_search.py)
+            'published date': by_id[i]["published_date"],
+            'url': by_id[i]["url"],
+            'publisher': {'title': by_id[i]["publisher"]},
+            'similarity': float(score),
+            'archive_id': int(i),
+        }
+        for i, score in zip(top_ids, top_scores) if int(i) in by_id # Artikel yang sudah dihapus dilewati
+    ]
+
+
+def similar_articles(url, k=5, db_path=None):
+    """Artikel arsip yang paling mirip dengan artikel ber-URL `url` ("temukan artikel seperti ini")."""
+    ensure_db(db_path)
+    with read_connection(db_path) as conn:
+        row = conn.execute("SELECT id FROM articles WHERE url = ?", [url]).fetchone()
+    if row is None:
+        return []
+    return semantic_search(article_id=row["id"], k=k, db_path=db_path)
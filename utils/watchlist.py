@@ -0,0 +1,148 @@
+# utils/watchlist.py
+"""
+Watchlist query pemantauan untuk worker headless (worker.py).
+
+Format watchlist.json (NEWS_INTEL_WATCHLIST), list string sederhana juga diterima:
+
+    {
+      "defaults": {"period": "1d", "max_articles": 30, "interval_minutes": 60},
+      "queries": [
+        "Mobil Listrik",
+        {"query": "Haji", "period": "7d", "at": ["06:00"]},
+        {"query": "Indonesia Emas 2045", "interval_minutes": 180}
+      ]
+    }
+
+Entri dengan `at` dijalankan sekali setiap hari pada jam tersebut (waktu lokal); selain itu
+setiap `interval_minutes`. Setiap eksekusi menjalankan pipeline laporan lengkap
+(fetch -> dedup -> analisis -> simpan), dicatat di `pipeline_runs`, dan laporannya disimpan
+di `stored_reports` agar bisa langsung dibuka dari dashboard.
+"""
+import os
+import json
+import time
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.pipeline import run_report_pipeline
+from utils.summaries import summarize_articles
+from utils.profiling import PROFILE_MODE, RunProfiler, check_profile_mode
+from utils.report_store import start_run, finish_run, save_report, last_run_times, RUN_OK, RUN_EMPTY, RUN_ERROR
+
+WATCHLIST_PATH = os.getenv("NEWS_INTEL_WATCHLIST", "watchlist.json")
+WORKER_THREADS = int(os.getenv("NEWS_INTEL_WORKER_THREADS", "2"))
+DEFAULT_ENTRY = {"period": "1d", "max_articles": 30, "interval_minutes": 60, "at": [], "summaries": True}
+
+
+def _parse_daily_times(value):
+    times = [value] if isinstance(value, str) else list(value or [])
+    for text in times:
+        datetime.strptime(text, "%H:%M") # ValueError bila format salah
+    return times
+
+
+def load_watchlist(path=None):
+    """Membaca & menormalkan watchlist. Mengembalikan list entri dict (query, period, max_articles, ...)."""
+    with open(path or WATCHLIST_PATH, encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        data = {"queries": data}
+    defaults = {**DEFAULT_ENTRY, **data.get("defaults", {})}
+
+    entries = []
+    for item in data.get("queries", []):
+        entry = {**defaults, **({"query": item} if isinstance(item, str) else item)}
+        entry["query"] = (entry.get("query") or "").strip()
+        if not entry["query"]:
+            raise ValueError(f"Entri watchlist tanpa query: {item!r}")
+        entry["max_articles"] = int(entry["max_articles"])
+        entry["interval_minutes"] = float(entry["interval_minutes"])
+        entry["at"] = _parse_daily_times(entry.get("at"))
+        entries.append(entry)
+    return entries
+
+
+def is_due(entry, last_started, now=None):
+    """Apakah entri perlu dijalankan sekarang, berdasarkan waktu mulai eksekusi terakhirnya (epoch detik)."""
+    if last_started is None:
+        return True
+    now = now or time.time()
+    if entry["at"]:
+        current = datetime.fromtimestamp(now)
+        # Jadwal harian terakhir yang sudah lewat (hari ini, atau kemarin jika belum sampai jamnya)
+        slots = []
+        for text in entry["at"]:
+            hour, minute = map(int, text.split(":"))
+            slot = current.replace(hour=hour, minute=minute, second=0, microsecond=0)
+            slots.append(slot if slot <= current else slot - timedelta(days=1))
+        return last_started < max(slots).timestamp()
+    return now - last_started >= entry["interval_minutes"] * 60
+
+
+def run_watch_entry(entry, models, db_path=None, profile=PROFILE_MODE):
+    """
+    Menjalankan satu entri watchlist dan mencatat hasilnya beserta metrik per tahap
+    (utils/profiling.py; `profile` menambahkan profil cProfile/pyinstrument).
+    `models` berisi sentiment, ner, summarizer, topic_model_factory, dan model_version.
+    Mengembalikan dict {query, period, status, n_articles, seconds, error}.
+    """
+    query, period = entry["query"], entry["period"]
+    # Profiler dibuat sebelum start_run: mode profiling yang salah gagal tanpa meninggalkan baris run terbuka
+    profiler = RunProfiler("watchlist", meta={"query": query, "period": period}, profile=profile)
+    run_id = start_run(query, period, db_path=db_path)
+    profiler.meta["run_id"] = run_id
+    profiler.start()
+    status, n_articles, error, processed_data = RUN_ERROR, 0, None, None
+    try:
+        result = run_report_pipeline(
+            query, period, entry["max_articles"],
+            models["sentiment"], models["ner"], models["topic_model_factory"], models["model_version"],
+            profiler=profiler,
+        )
+        news_items, processed_data = result["news_items"], result["processed_data"]
+        n_articles = len(news_items)
+        if not news_items:
+            status = RUN_EMPTY
+        else:
+            if entry["summaries"]:
+                with profiler.stage("summary", items=n_articles):
+                    summarize_articles(news_items, models["summarizer"])
+            status = RUN_OK
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    metrics = profiler.finish(error=error)
+    if status == RUN_OK:
+        # Laporan disimpan setelah profiler ditutup agar metrik lengkapnya ikut terbuka di dashboard
+        processed_data["metrics"] = metrics
+        try:
+            save_report(query, period, news_items, processed_data, run_id=run_id, db_path=db_path)
+        except Exception as e:
+            status, error = RUN_ERROR, f"{type(e).__name__}: {e}"
+    finish_run(run_id, status, n_articles, profiler.stage_timings(), error, db_path=db_path)
+    return {"query": query, "period": period, "status": status, "n_articles": n_articles,
+            "seconds": metrics["wall_s"], "error": error}
+
+
+def due_entries(entries, now=None, db_path=None):
+    """Entri watchlist yang jadwalnya sudah tiba."""
+    last_runs = last_run_times(db_path)
+    return [e for e in entries if is_due(e, last_runs.get((e["query"], e["period"])), now)]
+
+
+def run_entries(entries, models, max_workers=WORKER_THREADS, on_result=None, db_path=None, profile=PROFILE_MODE):
+    """
+    Menjalankan `entries` dengan paling banyak `max_workers` laporan sekaligus (model dipakai bersama).
+    `on_result(result)` dipanggil setiap satu entri selesai. Mengembalikan list hasil sesuai urutan entri.
+    Mode `profile` yang tidak dikenal ditolak (ValueError) sebelum entri mana pun dijalankan.
+    """
+    check_profile_mode(profile)
+    def run(entry):
+        result = run_watch_entry(entry, models, db_path=db_path, profile=profile)
+        if on_result:
+            on_result(result)
+        return result
+
+    if not entries:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(entries))), thread_name_prefix="watchlist") as executor:
+        return list(executor.map(run, entries))
@@ -0,0 +1,84 @@
+# worker.py
+"""
+Worker headless: menjalankan laporan untuk query di watchlist sesuai jadwal, tanpa Streamlit.
+
+    python worker.py                      # jalankan entri yang jatuh tempo, lalu selesai (cron/Task Scheduler)
+    python worker.py --loop               # terus berjalan, cek jadwal setiap --poll detik
+    python worker.py --force --workers 4  # jalankan semua entri sekarang, 4 laporan sekaligus
+    python worker.py --force --profile cprofile  # sertakan profil cProfile per laporan (NEWS_INTEL_PROFILE_DIR)
+
+Hasil analisis masuk ke news_intelligence.db (cache artikel, riwayat `pipeline_runs`, dan
+laporan siap-buka `stored_reports` yang bisa dibuka dari sidebar dashboard). Metrik per tahap
+ditulis sebagai JSON ke NEWS_INTEL_METRICS_LOG bila diset.
+"""
+import sys
+import time
+import argparse
+
+from models.loader import get_model, get_model_fingerprint, create_topic_model
+from utils.parallel import shutdown_process_pool
+from utils.profiling import PROFILE_MODE, PROFILE_MODES, check_profile_mode
+from utils.watchlist import WATCHLIST_PATH, WORKER_THREADS, load_watchlist, due_entries, run_entries
+
+
+def _load_models():
+    return {
+        "sentiment": get_model("sentiment"),
+        "ner": get_model("ner"),
+        "summarizer": get_model("summarizer"),
+        "topic_model_factory": create_topic_model,
+        "model_version": get_model_fingerprint(),
+    }
+
+
+def _print_result(result):
+    line = f"[{result['status'].upper()}] {result['query']} ({result['period']}): {result['n_articles']} artikel, {result['seconds']:.1f} detik"
+    if result["error"]:
+        line += f" | {result['error']}"
+    print(line, flush=True)
+
+
+def run_once(watchlist_path, workers, force=False, profile=None):
+    entries = load_watchlist(watchlist_path)
+    entries = entries if force else due_entries(entries)
+    if not entries:
+        print("[INFO] Tidak ada query watchlist yang jatuh tempo.", flush=True)
+        return []
+    print(f"[INFO] Menjalankan {len(entries)} query watchlist ({workers} sekaligus)...", flush=True)
+    started = time.perf_counter()
+    results = run_entries(entries, _load_models(), max_workers=workers, on_result=_print_result, profile=profile)
+    failed = sum(1 for r in results if r["error"])
+    print(f"[SELESAI] {len(results)} query dalam {time.perf_counter() - started:.1f} detik, {failed} gagal.", flush=True)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Worker headless watchlist laporan intelijen berita.")
+    parser.add_argument("--watchlist", default=WATCHLIST_PATH, help="Path file watchlist JSON.")
+    parser.add_argument("--workers", type=int, default=WORKER_THREADS, help="Jumlah laporan yang dijalankan bersamaan.")
+    parser.add_argument("--force", action="store_true", help="Jalankan semua query tanpa melihat jadwal.")
+    parser.add_argument("--loop", action="store_true", help="Terus berjalan dan cek jadwal secara berkala.")
+    parser.add_argument("--profile", choices=PROFILE_MODES, default=PROFILE_MODE,
+                        help="Simpan profil cProfile/pyinstrument setiap laporan.")
+    parser.add_argument("--poll", type=float, default=60, help="Jeda pengecekan jadwal dalam mode --loop (detik).")
+    args = parser.parse_args(argv)
+    try:
+        check_profile_mode(args.profile) # `choices` tidak memeriksa default dari NEWS_INTEL_PROFILE
+    except ValueError as e:
+        parser.error(str(e))
+
+    try:
+        results = run_once(args.watchlist, args.workers, force=args.force, profile=args.profile)
+        while args.loop:
+            time.sleep(args.poll)
+            results = run_once(args.watchlist, args.workers, profile=args.profile)
+    except KeyboardInterrupt:
+        print("[INFO] Worker dihentikan.", flush=True)
+        return 0
+    finally:
+        shutdown_process_pool()
+    return 1 if any(r["error"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())